@@ -0,0 +1,8 @@
+"""
+Benchmarks for the Megaverse client and scripts.
+
+Each benchmark is a runnable module that prints a summary and writes its
+results as JSON under `benchmarks/results/`, so runs can be compared over time:
+
+    python -m benchmarks.e2e
+"""
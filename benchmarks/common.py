@@ -0,0 +1,64 @@
+"""Helpers shared by the benchmark modules."""
+
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import List, Optional, Sequence
+
+RESULTS_DIRECTORY = os.path.join(os.path.dirname(__file__), "results")
+
+def percentile(samples: Sequence[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of `samples`, e.g. fraction=0.95 for p95."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1))
+    return ordered[index]
+
+def latency_summary(samples: Sequence[float]) -> dict:
+    """p50/p95/p99 and mean of per-call latencies, in milliseconds."""
+    def ms(value):
+        return None if value is None else round(value * 1000, 3)
+    return {
+        "calls": len(samples),
+        "mean_ms": ms(sum(samples) / len(samples)) if samples else None,
+        "p50_ms": ms(percentile(samples, 0.50)),
+        "p95_ms": ms(percentile(samples, 0.95)),
+        "p99_ms": ms(percentile(samples, 0.99)),
+    }
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def write_results(name: str, results: List[dict], output: Optional[str] = None, **config) -> str:
+    """
+    Write benchmark results as JSON and return the path.
+
+    The file records the configuration, git revision and interpreter next to
+    the results, so runs from different commits or machines stay comparable.
+    """
+    timestamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    if output is None:
+        os.makedirs(RESULTS_DIRECTORY, exist_ok=True)
+        output = os.path.join(RESULTS_DIRECTORY, f"{name}_{timestamp}.json")
+    document = {
+        "benchmark": name,
+        "timestamp": timestamp,
+        "revision": _git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "config": config,
+        "results": results,
+    }
+    with open(output, "w") as f:
+        json.dump(document, f, indent=2)
+    return output
@@ -0,0 +1,165 @@
+"""
+End-to-end build and cleanup throughput against the local fake server.
+
+For every combination of workload (cross, logo), execution mode (sync,
+threaded, async), injected latency and injected 429 rate, the benchmark
+builds the workload on a fresh fake server, then cleans it up again, and
+records for each phase:
+
+- wall time and objects/sec
+- p50/p95/p99 per-call latency from the client's request events, so retries
+  and rate-limiter waits are included
+- failed calls, client retries and the server's response counts by status
+
+    python -m benchmarks.e2e --latency 0 0.02 --throttle-rate 0 0.05
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from glob import glob
+from typing import List, Optional, Sequence
+from megaverse.api import MegaverseAPI
+from megaverse.async_api import AsyncMegaverseAPI
+from megaverse.executor import run_ordered
+from megaverse.fake_server import FakeMegaverseServer, cross_goal
+from megaverse.grid import Grid
+from megaverse.metrics import RequestEvent
+from megaverse.ratelimit import TokenBucket
+from megaverse.retry import RetryPolicy
+from .common import latency_summary, write_results
+
+MODES = ("sync", "threaded", "async")
+WORKLOADS = ("cross", "logo")
+
+class LatencyRecorder:
+    """Request observer keeping every call's duration for exact percentiles."""
+
+    def __init__(self):
+        self.latencies: List[float] = []
+        self.retries = 0
+        self._lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.latencies.append(event.duration)
+            self.retries += event.retries
+
+def logo_goal(path: Optional[str] = None) -> List[List[str]]:
+    """The logo goal from `path` or the newest saved snapshot in output/."""
+    if path is None:
+        snapshots = sorted(glob("output/*_*.json"))
+        if not snapshots:
+            raise FileNotFoundError("No saved goal map in output/; pass --logo-goal")
+        path = snapshots[-1]
+    with open(path) as f:
+        saved = json.load(f)
+    return saved.get("goal") or saved["classified"]
+
+def run_phase(api: MegaverseAPI, mode: str, workers: int, call: str, objects: Sequence) -> int:
+    """Create or delete `objects` in the given mode; return the number of failures."""
+    if mode == "async":
+        async def run():
+            async with AsyncMegaverseAPI(api=api, concurrency=workers) as client:
+                return await getattr(client, f"{call}_many")(objects)
+        results = asyncio.run(run())
+        return sum(1 for result in results if result is not None)
+
+    func = getattr(api, f"{call}_astral_object")
+    outcomes = run_ordered(func, objects, workers if mode == "threaded" else 1)
+    return sum(1 for _, error in outcomes if error is not None)
+
+def run_scenario(
+    workload: str,
+    goal: List[List[str]],
+    mode: str,
+    workers: int,
+    latency: float,
+    throttle_rate: float,
+    client_rate: float,
+    retry_after: float = 0.05,
+    seed: int = 0,
+) -> List[dict]:
+    """Build and clean up one workload on a fresh fake server; one result per phase."""
+    objects = Grid.from_goal_map({"goal": goal}).to_objects()
+    results = []
+    with FakeMegaverseServer(goal=goal, latency=latency, throttle_rate=throttle_rate, retry_after=retry_after, seed=seed) as server:
+        for phase, call in (("build", "create"), ("cleanup", "delete")):
+            server.stats.clear()
+            recorder = LatencyRecorder()
+            api = MegaverseAPI(
+                candidate_id="benchmark",
+                base_url=server.base_url,
+                pool_size=max(workers, MegaverseAPI.DEFAULT_POOL_SIZE),
+                rate_limiter=TokenBucket(rate=client_rate, capacity=client_rate, min_rate=client_rate / 10, max_rate=client_rate),
+                retry_policy=RetryPolicy(max_attempts=8, base_delay=0.01, max_delay=0.5),
+                observers=[recorder],
+            )
+            start = time.perf_counter()
+            failed = run_phase(api, mode, workers, call, objects)
+            wall = time.perf_counter() - start
+            api.close()
+            results.append({
+                "workload": workload,
+                "phase": phase,
+                "mode": mode,
+                "workers": 1 if mode == "sync" else workers,
+                "latency_s": latency,
+                "throttle_rate": throttle_rate,
+                "objects": len(objects),
+                "failed": failed,
+                "wall_s": round(wall, 4),
+                "objects_per_s": round(len(objects) / wall, 2) if wall else None,
+                "retries": recorder.retries,
+                "latency": latency_summary(recorder.latencies),
+                "server_statuses": {str(status): count for status, count in sorted(server.stats.items())},
+            })
+    return results
+
+def _print_result(result: dict) -> None:
+    latency = result["latency"]
+    print(
+        f"{result['workload']:<6} {result['phase']:<8} {result['mode']:<9} "
+        f"lat={result['latency_s']:<5g} 429={result['throttle_rate']:<5g} "
+        f"{result['objects']:>5} objs {result['wall_s']:>8.3f}s {result['objects_per_s']:>8} obj/s "
+        f"p50={latency['p50_ms']}ms p95={latency['p95_ms']}ms p99={latency['p99_ms']}ms "
+        f"failed={result['failed']}"
+    )
+
+def main(argv: Optional[Sequence[str]] = None) -> List[dict]:
+    parser = argparse.ArgumentParser(description="End-to-end build and cleanup benchmark")
+    parser.add_argument('--workloads', nargs='+', choices=WORKLOADS, default=list(WORKLOADS))
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=list(MODES))
+    parser.add_argument('--workers', type=int, default=8, help='Threads or async concurrency for the parallel modes')
+    parser.add_argument('--latency', nargs='+', type=float, default=[0.0, 0.02], help='Injected server latencies in seconds')
+    parser.add_argument('--throttle-rate', nargs='+', type=float, default=[0.0, 0.05], help='Injected 429 rates')
+    parser.add_argument('--client-rate', type=float, default=500.0, help='Client token bucket rate in requests per second')
+    parser.add_argument('--logo-goal', help='Goal map JSON for the logo workload (default: newest in output/)')
+    parser.add_argument('--output', help='Path of the JSON results file')
+    args = parser.parse_args(argv)
+
+    goals = {}
+    if "cross" in args.workloads:
+        goals["cross"] = cross_goal()
+    if "logo" in args.workloads:
+        goals["logo"] = logo_goal(args.logo_goal)
+
+    results = []
+    for workload, goal in goals.items():
+        for latency in args.latency:
+            for throttle_rate in args.throttle_rate:
+                for mode in args.modes:
+                    for result in run_scenario(workload, goal, mode, args.workers, latency, throttle_rate, args.client_rate):
+                        _print_result(result)
+                        results.append(result)
+
+    path = write_results("e2e", results, args.output, **{
+        key: value for key, value in vars(args).items() if key != "output"
+    })
+    print(f"Results written to {path}")
+    return results
+
+if __name__ == "__main__":
+    main()
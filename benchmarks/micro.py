@@ -0,0 +1,217 @@
+"""
+Micro-benchmarks for goal parsing, grid operations and pattern generation.
+
+Synthetic square goal maps are generated at each size (30x30 up to
+10,000x10,000 by default) with a fixed density of randomly chosen objects.
+Every stage is timed (best of `--repeat` runs) and then run once more under
+tracemalloc to record its peak memory.
+
+Stages that build one Python object per cell or per object are the ones that
+stop scaling first. Two guards keep a run from exhausting the machine:
+
+- `--max-python-cells`: stages that need the goal as nested lists of strings
+  are skipped above this many cells
+- `--budget`: once a stage takes longer than this many seconds, it is skipped
+  at every larger size
+
+Stages that work on uint8 grids have a memory budget in bytes per cell
+(`MEMORY_BUDGETS`); a result whose peak exceeds it is flagged, which catches a
+per-cell Python or string intermediate creeping into an array path.
+
+    python -m benchmarks.micro --sizes 30 100 1000 10000
+"""
+
+import argparse
+import gc
+import io
+import json
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Optional, Sequence
+import numpy as np
+from challenge2_goal_parser import iter_goal_objects, iter_goal_objects_from_stream, parse_goal_map
+from megaverse import snapshot
+from megaverse.grid import Grid, TOKENS
+from megaverse.patterns import Pattern, PatternGenerator, border_mask, x_mask
+from megaverse.reconcile import plan_grid_reconciliation
+from .common import write_results
+
+SIZES = (30, 100, 300, 1000, 3000, 10000)
+
+def synthetic_codes(size: int, density: float = 0.1, seed: int = 0) -> np.ndarray:
+    """A size x size code array with about `density` of the cells holding a random object."""
+    rng = np.random.default_rng(seed)
+    codes = rng.integers(1, len(TOKENS), size=(size, size), dtype=np.uint8)
+    codes[rng.random((size, size)) >= density] = 0
+    return codes
+
+class Inputs:
+    """The inputs of one size, built lazily and shared by every stage."""
+
+    def __init__(self, size: int, density: float, seed: int = 0):
+        self.size = size
+        self.cells = size * size
+        self._density = density
+        self._seed = seed
+        self._cache: Dict[str, object] = {}
+
+    def _get(self, name: str, build: Callable[[], object]):
+        if name not in self._cache:
+            self._cache[name] = build()
+        return self._cache[name]
+
+    @property
+    def codes(self) -> np.ndarray:
+        return self._get("codes", lambda: synthetic_codes(self.size, self._density, self._seed))
+
+    @property
+    def goal_map(self) -> dict:
+        tokens = np.array(TOKENS, dtype=object)
+        return self._get("goal_map", lambda: {"goal": tokens[self.codes].tolist()})
+
+    @property
+    def goal_json(self) -> bytes:
+        return self._get("goal_json", lambda: json.dumps(self.goal_map).encode())
+
+    @property
+    def grid(self) -> Grid:
+        return self._get("grid", lambda: Grid(self.codes))
+
+    @property
+    def snapshot(self) -> bytes:
+        return self._get("snapshot", lambda: snapshot.encode(snapshot.from_grid(self.grid)))
+
+    @property
+    def current(self) -> Grid:
+        # A partially built map: a different random layout at half the density
+        return self._get("current", lambda: Grid(synthetic_codes(self.size, self._density / 2, self._seed + 1)))
+
+def _pattern(size: int) -> Pattern:
+    """A bordered full-size X, the kind of pattern generated for large grids."""
+    shape = (size, size)
+    return Pattern(size, size).add(border_mask(shape), "BLUE_SOLOON").add(x_mask(shape), "POLYANET")
+
+# name -> (needs the nested-list goal map, function of the inputs)
+STAGES = {
+    "parse_goal_map": (True, lambda inputs: parse_goal_map(inputs.goal_map)),
+    "iter_goal_objects": (True, lambda inputs: sum(1 for _ in iter_goal_objects(inputs.goal_map))),
+    "stream_parse": (True, lambda inputs: sum(1 for _ in iter_goal_objects_from_stream(io.BytesIO(inputs.goal_json)))),
+    "grid_from_tokens": (True, lambda inputs: Grid.from_goal_map(inputs.goal_map)),
+    "grid_to_objects": (False, lambda inputs: inputs.grid.to_objects()),
+    "grid_diff": (False, lambda inputs: inputs.grid.diff(inputs.current)),
+    "plan_reconciliation": (False, lambda inputs: plan_grid_reconciliation(inputs.grid, inputs.current)),
+    "snapshot_encode": (False, lambda inputs: snapshot.encode(snapshot.from_grid(inputs.grid))),
+    "snapshot_decode": (False, lambda inputs: snapshot.decode(inputs.snapshot).to_grid()),
+    "grid_validate": (False, lambda inputs: inputs.grid.validate()),
+    "generate_cross": (False, lambda inputs: PatternGenerator.generate_cross(inputs.size | 1)),
+    "generate_logo": (True, lambda inputs: PatternGenerator.generate_logo(inputs.goal_map)),
+    "pattern_grid": (False, lambda inputs: _pattern(inputs.size).to_grid()),
+}
+
+# Peak traced memory allowed per cell, on top of MEMORY_SLACK bytes of fixed
+# overhead; roughly twice what each stage needs
+MEMORY_BUDGETS = {
+    "grid_from_tokens": 2,
+    "grid_validate": 2,
+    "snapshot_decode": 6,
+    "pattern_grid": 8,
+    "grid_diff": 20,
+}
+MEMORY_SLACK = 256 * 1024
+
+def over_memory_budget(stage: str, cells: int, peak_bytes: int) -> bool:
+    """Whether a stage's peak memory exceeds its budget (stages without one never do)."""
+    budget = MEMORY_BUDGETS.get(stage)
+    return budget is not None and peak_bytes > budget * cells + MEMORY_SLACK
+
+def _prepare(inputs: Inputs, needs_goal: bool) -> None:
+    # Build inputs outside the measured region
+    inputs.codes, inputs.grid, inputs.current, inputs.snapshot
+    if needs_goal:
+        inputs.goal_map
+
+def measure(func: Callable[[], object], repeat: int) -> dict:
+    """Best wall time over `repeat` runs, then peak traced memory of one more run."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+        del result
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del result
+    return {"seconds": round(min(times), 6), "peak_bytes": peak}
+
+def run(
+    sizes: Sequence[int] = SIZES,
+    stages: Optional[Sequence[str]] = None,
+    density: float = 0.1,
+    repeat: int = 3,
+    budget: float = 30.0,
+    max_python_cells: int = 10_000_000,
+    report: Callable[[dict], None] = lambda result: None,
+) -> List[dict]:
+    """Run the selected stages at every size; one result per (stage, size)."""
+    stages = list(stages or STAGES)
+    over_budget: Dict[str, int] = {}
+    results = []
+    for size in sorted(sizes):
+        inputs = Inputs(size, density)
+        for name in stages:
+            needs_goal, func = STAGES[name]
+            result = {"stage": name, "size": size, "cells": inputs.cells}
+            if name in over_budget:
+                result["skipped"] = f"took over {budget:g}s at {over_budget[name]}x{over_budget[name]}"
+            elif needs_goal and inputs.cells > max_python_cells:
+                result["skipped"] = f"over --max-python-cells ({max_python_cells})"
+            else:
+                _prepare(inputs, needs_goal)
+                result.update(measure(lambda: func(inputs), repeat))
+                result["cells_per_s"] = round(inputs.cells / result["seconds"]) if result["seconds"] else None
+                result["over_memory_budget"] = over_memory_budget(name, inputs.cells, result["peak_bytes"])
+                if result["seconds"] > budget:
+                    over_budget[name] = size
+            report(result)
+            results.append(result)
+        del inputs
+        gc.collect()
+    return results
+
+def _print_result(result: dict) -> None:
+    label = f"{result['stage']:<20} {result['size']:>6}x{result['size']:<6}"
+    if "skipped" in result:
+        print(f"{label} skipped: {result['skipped']}")
+    else:
+        line = f"{label} {result['seconds']:>10.4f}s {result['peak_bytes'] / 2**20:>10.1f} MiB peak"
+        if result["over_memory_budget"]:
+            line += f" OVER BUDGET ({MEMORY_BUDGETS[result['stage']]} bytes/cell)"
+        print(line)
+
+def main(argv: Optional[Sequence[str]] = None) -> List[dict]:
+    parser = argparse.ArgumentParser(description="Goal parsing and grid micro-benchmarks")
+    parser.add_argument('--sizes', nargs='+', type=int, default=list(SIZES), help='Side lengths of the synthetic goal maps')
+    parser.add_argument('--stages', nargs='+', choices=list(STAGES), help='Stages to run (default: all)')
+    parser.add_argument('--density', type=float, default=0.1, help='Fraction of cells holding an object')
+    parser.add_argument('--repeat', type=int, default=3, help='Timed runs per stage; the best is reported')
+    parser.add_argument('--budget', type=float, default=30.0, help='Skip a stage at larger sizes once it takes this long')
+    parser.add_argument('--max-python-cells', type=int, default=10_000_000,
+                        help='Largest map to materialize as nested lists of strings')
+    parser.add_argument('--output', help='Path of the JSON results file')
+    args = parser.parse_args(argv)
+
+    results = run(args.sizes, args.stages, args.density, args.repeat, args.budget, args.max_python_cells, _print_result)
+    path = write_results("micro", results, args.output, **{
+        key: value for key, value in vars(args).items() if key != "output"
+    })
+    print(f"Results written to {path}")
+    return results
+
+if __name__ == "__main__":
+    main()
@@ -1,39 +1,51 @@
 import os
-import time
+import sys
+import argparse
+from typing import Sequence
 from dotenv import load_dotenv
 from megaverse.api import MegaverseAPI
+from megaverse.executor import pool_size_for, run_ordered
 from megaverse.patterns import PatternGenerator
 from megaverse.models import Position
 
-def create_cross_pattern(api: MegaverseAPI) -> None:
-    """Create the cross pattern for Challenge 1."""
+def create_cross_pattern(api: MegaverseAPI, workers: int = 1) -> None:
+    """
+    Create the cross pattern for Challenge 1.
+
+    With `workers` > 1 the POLYanets are created from a thread pool sharing
+    the client's session and rate limiter; progress is still printed in order.
+    """
     print("Creating cross pattern...")
     objects = PatternGenerator.generate_cross()
     
     print(f"Creating {len(objects)} POLYanets...")
-    for i, obj in enumerate(objects, 1):
-        try:
-            api.create_astral_object(obj)
+    for i, (obj, error) in enumerate(run_ordered(api.create_astral_object, objects, workers), 1):
+        if error is None:
             print(f"Created POLYanet {i}/{len(objects)} at position ({obj.position.row}, {obj.position.column})")
-            time.sleep(0.5)
-        except Exception as e:
-            print(f"Error creating POLYanet at position ({obj.position.row}, {obj.position.column}): {str(e)}")
+        else:
+            print(f"Error creating POLYanet at position ({obj.position.row}, {obj.position.column}): {str(error)}")
+
+def main(argv: Sequence[str] = ()):
+    parser = argparse.ArgumentParser(description="Crossmint Challenge 1: Cross Pattern")
+    parser.add_argument('--workers', type=int, default=1, help='Number of API calls to keep in flight at once')
+    args = parser.parse_args(argv)
 
-def main():
     # Load environment variables
     load_dotenv()
     
     # Initialize API client
-    api = MegaverseAPI()
+    api = MegaverseAPI(pool_size=pool_size_for(args.workers))
     
     try:
-        create_cross_pattern(api)
+        create_cross_pattern(api, workers=args.workers)
         print("Cross pattern creation completed!")
     except Exception as e:
         print(f"An error occurred: {str(e)}")
         return 1
+    finally:
+        api.close()
     
     return 0
 
 if __name__ == "__main__":
-    exit(main()) 
\ No newline at end of file
+    exit(main(sys.argv[1:]))
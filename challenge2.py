@@ -15,84 +15,218 @@ The script supports three types of objects:
 """
 
 import os
-import time
 import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from itertools import groupby
 from dotenv import load_dotenv
 from megaverse.api import MegaverseAPI
-from challenge2_goal_parser import parse_goal_map
-from megaverse.models import Position, PolyanetObject, SoloonObject, ComethObject
+from megaverse.cache import GoalMapCache
+from megaverse.executor import pool_size_for, run_ordered
+from challenge2_goal_parser import iter_goal_objects, iter_goal_objects_from_stream
+from megaverse.models import SoloonObject, ComethObject, object_from_dict
+from megaverse.grid import Grid
+from megaverse.journal import Journal, new_plan_id
+from megaverse.metrics import MetricsCollector
+from megaverse.planner import plan_batches
+from megaverse import snapshot
+from megaverse.reconcile import CREATE, DELETE, Operation, apply_operation, plan_grid_reconciliation
 
-def log_created_object(obj):
+def describe_object(obj):
     """
-    Log a successfully created object to the log file.
-    Each object is logged as a JSON line for easy parsing during cleanup.
+    Return a human-readable label for an object, e.g. "RED SOLOON".
     
     Args:
-        obj (dict): Object information including type, position, and any additional properties
+        obj (AstralObject): Model object to describe
     """
-    with open('challenge2_created.log', 'a') as f:
-        f.write(json.dumps(obj) + '\n')
+    if isinstance(obj, SoloonObject):
+        return f"{obj.color.value.upper()} SOLOON"
+    if isinstance(obj, ComethObject):
+        return f"{obj.direction.value.upper()} COMETH"
+    return obj.type
 
-def create_objects_from_goal(api: MegaverseAPI, dry_run: bool = False) -> None:
+def execute_operations(api: MegaverseAPI, operations, dry_run: bool = False, total=None, journal: Journal = None, plan_id: str = None, workers: int = 1) -> None:
     """
-    Create objects in the Megaverse based on the parsed goal map.
+    Execute planned operations, printing progress in plan order as they complete.
     
     Args:
-        api: CrossmintAPI instance for making API calls
-        objects: List of objects to create, each containing:
-            - row: Row position
-            - column: Column position
-            - type: Object type (POLYANET, SOLOON, COMETH)
-            - color: Color for SOLOON (optional)
-            - direction: Direction for COMETH (optional)
-        dry_run: If True, only print what would be created without making API calls
+        api: MegaverseAPI instance for making API calls
+        operations: Iterable of reconcile.Operation; may be a lazy generator
+        dry_run: If True, only print what would be done without making API calls
+        total: Number of operations, when known, for "i/total" progress output
+        journal: Optional Journal; each call is recorded as intended before it
+            is sent and as done once it succeeds
+        plan_id: Identifier stored with the journal records of this run
+        workers: Number of calls in flight at once, sharing the client's
+            session and rate limiter
     
-    The function handles rate limiting by adding delays between API calls
-    and provides progress feedback through logging.
+    Consecutive operations with the same action run concurrently; a switch
+    from deletes to creates waits for the deletes to finish, so a cell is
+    always cleared before its replacement is created.
     """
-    print("Fetching goal map...")
-    try:
-        goal_map = api.get_goal_map()
-    except Exception as e:
-        print(f"Error fetching goal map: {e}")
+    if dry_run:
+        for operation in operations:
+            # Print detailed information about what would be done
+            position = operation.position
+            print(f"Would {operation.action} {describe_object(operation.object)} at position ({position.row}, {position.column})")
         return
+    groups = (group for _, group in groupby(operations, key=lambda operation: operation.action))
+    _execute_groups(api, groups, total, journal, plan_id, workers)
+
+def _execute_groups(api, groups, total, journal, plan_id, workers):
+    """Run each group of operations concurrently, waiting for it to finish before the next."""
+    def run(operation):
+        record = operation.object.to_dict()
+        if journal is not None:
+            # The intent must reach the OS before the call goes out, so a
+            # crash mid-call still leaves the object visible to cleanup
+            journal.intend(operation.action, record, plan_id)
+            journal.flush()
+        apply_operation(api, operation)
+        if journal is not None:
+            journal.complete(operation.action, record, plan_id)
     
-    print("Parsing goal map...")
-    objects = parse_goal_map(goal_map)
+    i = 0
+    with ThreadPoolExecutor(max_workers=workers) if workers > 1 else nullcontext() as executor:
+        for group in groups:
+            for operation, error in run_ordered(run, group, workers, executor):
+                i += 1
+                obj = operation.object
+                position = operation.position
+                progress = f"{i}/{total}" if total is not None else f"#{i}"
+                if error is None:
+                    verb = "Created" if operation.action == CREATE else "Deleted"
+                    print(f"{verb} {describe_object(obj)} {progress} at position ({position.row}, {position.column})")
+                else:
+                    verb = "creating" if operation.action == CREATE else "deleting"
+                    print(f"Error {verb} {obj.type} at position ({position.row}, {position.column}): {str(error)}")
+
+def create_objects_from_goal(api: MegaverseAPI, dry_run: bool = False, reconcile: bool = False, goal_file: str = None, journal: Journal = None, workers: int = 1) -> bool:
+    """
+    Create objects in the Megaverse based on the parsed goal map.
     
-    print(f"Found {len(objects)} objects to create")
+    Args:
+        api: CrossmintAPI instance for making API calls
+        dry_run: If True, only print what would be done without making API calls
+        reconcile: If True, fetch the current map and only issue the calls
+            needed to turn it into the goal (creates for missing cells, deletes
+            for extraneous ones, delete + create for wrong colors or directions)
+        goal_file: Optional path to a saved goal map (JSON or a `.mvs` binary
+            snapshot) to use instead of fetching it from the API
+        journal: Journal to record the calls in; defaults to the journal at
+            Journal.DEFAULT_PATH, which `challenge2_cleanup.py` reads
+        workers: Number of API calls in flight at once (see `execute_operations`)
+    
+    Returns:
+        bool: False if the goal or current map could not be fetched, in which
+        case nothing was executed; True otherwise
+    
+    Operations go through the planner (`megaverse.planner`), which dedupes
+    them, puts deletes first and groups them by endpoint in batches of
+    `workers`. A goal file without `reconcile` is the exception: its objects
+    are streamed from the parser straight into execution, so the first calls
+    go out before a very large map is fully parsed.
+    Rate limiting is handled by the API client's shared token bucket, and
+    progress feedback is provided through logging.
+    """
+    owns_journal = journal is None and not dry_run
+    if owns_journal:
+        journal = Journal()
+    try:
+        return _create_objects_from_goal(api, dry_run, reconcile, goal_file, journal, workers)
+    finally:
+        if owns_journal:
+            journal.close()
+
+def _create_objects_from_goal(api, dry_run, reconcile, goal_file, journal, workers):
+    plan_id = new_plan_id()
+    if goal_file is not None and goal_file.endswith(snapshot.SUFFIX):
+        print(f"Loading goal snapshot from {goal_file}...")
+        saved = snapshot.load(goal_file)
+        if not reconcile:
+            objects = saved.to_grid().iter_objects()
+            execute_operations(api, (Operation(CREATE, obj) for obj in objects), dry_run, journal=journal, plan_id=plan_id, workers=workers)
+            return True
+        goal_map = saved.to_json()
+    elif goal_file is not None and not reconcile:
+        print(f"Streaming goal map from {goal_file}...")
+        with open(goal_file, 'rb') as f:
+            objects = iter_goal_objects_from_stream(f)
+            execute_operations(api, (Operation(CREATE, obj) for obj in objects), dry_run, journal=journal, plan_id=plan_id, workers=workers)
+        return True
+    elif goal_file is not None:
+        print(f"Loading goal map from {goal_file}...")
+        with open(goal_file) as f:
+            goal_map = json.load(f)
+    else:
+        print("Fetching goal map...")
+        try:
+            goal_map = api.get_goal_map()
+        except Exception as e:
+            print(f"Error fetching goal map: {e}")
+            return False
     
-    for i, obj in enumerate(objects, 1):
-        position = Position(obj["row"], obj["column"])
-        
-        if dry_run:
-            # Print detailed information about what would be created
-            if obj["type"] == "POLYANET":
-                print(f"Would create POLYANET at position ({position.row}, {position.column})")
-            elif obj["type"] == "SOLOON":
-                print(f"Would create {obj['color'].upper()} SOLOON at position ({position.row}, {position.column})")
-            elif obj["type"] == "COMETH":
-                print(f"Would create {obj['direction'].upper()} COMETH at position ({position.row}, {position.column})")
-            continue
-            
+    if reconcile:
+        print("Fetching current map...")
         try:
-            # Create the appropriate type of object with its properties
-            if obj["type"] == "POLYANET":
-                api.create_polyanet(position)
-                print(f"Created POLYANET {i}/{len(objects)} at position ({position.row}, {position.column})")
-            elif obj["type"] == "SOLOON":
-                api.create_soloon(position, obj["color"])
-                print(f"Created {obj['color'].upper()} SOLOON {i}/{len(objects)} at position ({position.row}, {position.column})")
-            elif obj["type"] == "COMETH":
-                api.create_cometh(position, obj["direction"])
-                print(f"Created {obj['direction'].upper()} COMETH {i}/{len(objects)} at position ({position.row}, {position.column})")
-                
-            # Log successful creation for potential cleanup
-            log_created_object(obj)
-            time.sleep(0.5)  # Rate limiting to avoid overwhelming the API
+            current = Grid.from_current_map(api.get_current_map())
         except Exception as e:
-            print(f"Error creating {obj['type']} at position ({position.row}, {position.column}): {str(e)}")
+            print(f"Error fetching current map: {e}")
+            return False
+        goal = Grid.from_goal_map(goal_map)
+        batches = plan_batches(plan_grid_reconciliation(goal, current), workers)
+        print(f"Found {goal.count()} objects in goal")
+    else:
+        batches = plan_batches((Operation(CREATE, obj) for obj in iter_goal_objects(goal_map)), workers)
+    execute_batches(api, batches, dry_run, journal=journal, plan_id=plan_id, workers=workers)
+    return True
+
+def execute_batches(api: MegaverseAPI, batches, dry_run: bool = False, journal: Journal = None, plan_id: str = None, workers: int = 1) -> None:
+    """
+    Execute a plan from `megaverse.planner.plan_batches`, reporting its shape first.
+    
+    Batches run one at a time: the calls of a batch are in flight together,
+    and the next batch starts once they have all finished. With batches sized
+    to `workers` every batch fills the pool; see `execute_operations` for the
+    other arguments.
+    """
+    total = sum(len(batch) for batch in batches)
+    deletes = sum(len(batch) for batch in batches if batch.action == DELETE)
+    print(f"Planned {total} operations in {len(batches)} batches: {total - deletes} to create, {deletes} to delete")
+    if dry_run:
+        execute_operations(api, (operation for batch in batches for operation in batch.operations), dry_run=True)
+        return
+    _execute_groups(api, (batch.operations for batch in batches), total, journal, plan_id, workers)
+
+def resume_from_journal(api: MegaverseAPI, journal_path: str = Journal.DEFAULT_PATH, dry_run: bool = False, workers: int = 1) -> None:
+    """
+    Finish the operations an interrupted run left unconfirmed.
+    
+    The journal is replayed and every operation of the last run that was
+    recorded as intended but never completed is sent again. Creates are
+    retried safely because creating an object on a cell is a set operation.
+    
+    Args:
+        api: MegaverseAPI instance for making API calls
+        journal_path: Path of the journal written by the interrupted run
+        dry_run: If True, only print what would be done without making API calls
+        workers: Number of API calls in flight at once
+    """
+    state = Journal.replay(journal_path)
+    if state.corrupt:
+        print(f"Skipped {state.corrupt} corrupted journal records")
+    pending = state.pending_for_plan(state.last_plan)
+    if not pending:
+        print("Nothing to resume.")
+        return
+    print(f"Resuming {len(pending)} unconfirmed operations...")
+    batches = plan_batches((Operation(record["op"], object_from_dict(record)) for record in pending), workers)
+    if dry_run:
+        execute_batches(api, batches, dry_run=True)
+        return
+    with Journal(journal_path) as journal:
+        execute_batches(api, batches, journal=journal, plan_id=state.last_plan, workers=workers)
 
 def main():
     """
@@ -108,9 +242,30 @@ def main():
     load_dotenv()
     parser = argparse.ArgumentParser(description="Crossmint Challenge 2: Logo Pattern Creator")
     parser.add_argument('--dry-run', action='store_true', help='Print actions without making API calls')
+    parser.add_argument('--reconcile', action='store_true', help='Only issue calls for cells that differ from the goal')
+    parser.add_argument('--goal-file', help='Read the goal map from a saved JSON file instead of the API')
+    parser.add_argument('--offline', action='store_true', help='Use the newest cached goal map without contacting the API')
+    parser.add_argument('--resume', action='store_true', help='Re-send the operations an interrupted run left unconfirmed in the journal')
+    parser.add_argument('--workers', type=int, default=1, help='Number of API calls to keep in flight at once')
+    parser.add_argument('--metrics', help='Write request metrics to this file (Prometheus text for *.prom, JSON otherwise)')
+    parser.add_argument('--cache-ttl', type=float, default=GoalMapCache.DEFAULT_TTL,
+                        help='Seconds a cached goal map is used before it is revalidated')
+    parser.add_argument('--binary-snapshots', action='store_true', help='Archive goal maps as compact .mvs snapshots instead of JSON')
     args = parser.parse_args()
-    api = MegaverseAPI()
-    create_objects_from_goal(api, dry_run=args.dry_run)
+    goal_cache = GoalMapCache(ttl=args.cache_ttl, offline=args.offline, binary=args.binary_snapshots)
+    pool_size = pool_size_for(args.workers)
+    metrics = MetricsCollector()
+    with MegaverseAPI(goal_cache=goal_cache, pool_size=pool_size, observers=[metrics]) as api:
+        try:
+            if args.resume:
+                resume_from_journal(api, dry_run=args.dry_run, workers=args.workers)
+            else:
+                create_objects_from_goal(api, dry_run=args.dry_run, reconcile=args.reconcile, goal_file=args.goal_file, workers=args.workers)
+        finally:
+            summary = metrics.snapshot()
+            print(f"{summary['requests']} API calls, {summary['retries']} retries, {summary['errors']} errors")
+            if args.metrics:
+                metrics.write(args.metrics)
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
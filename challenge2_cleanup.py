@@ -2,110 +2,170 @@
 Crossmint Challenge 2: Cleanup Utility
 
 This script provides functionality to clean up objects created during Challenge 2.
-It reads a log file of created objects and deletes them from the Megaverse.
+It replays the execution journal written by challenge2.py and deletes every
+object that may exist on the map, including creates that were sent but never
+confirmed because the run was interrupted. Alternatively, it can diff the live
+map against an empty one and delete whatever is actually there.
 
 Features:
-- Reads object creation log
-- Deletes objects in reverse order
-- Handles rate limiting with retries
+- Replays the crash-safe execution journal
+- Deletes objects in reverse order through a bounded pool of worker threads
+- Handles rate limiting through the API client's retry policy
+- Checkpoints every deletion, so an interrupted cleanup resumes where it stopped
 - Maintains a log of failed deletions for retry
 - Provides progress feedback
 """
 
 import os
-import json
-import time
-import logging
+import argparse
 from typing import List, Dict, Any
 from dotenv import load_dotenv
 from megaverse.api import MegaverseAPI
-from megaverse.models import Position
+from megaverse.executor import pool_size_for, run_ordered
+from megaverse.grid import Grid
+from megaverse.journal import Journal
+from megaverse.models import object_from_dict
 
-def cleanup_from_log(api: MegaverseAPI, log_file: str = 'challenge2_created.log', max_retries: int = 3, retry_delay: float = 1.0):
+DEFAULT_WORKERS = 4
+
+def delete_object(api: MegaverseAPI, obj: Dict[str, Any]) -> None:
     """
-    Clean up objects from the Megaverse based on the log file.
-    
-    This function:
-    1. Reads the log file containing objects to delete
-    2. Attempts to delete each object with retry logic for rate limits
-    3. Updates the log file to only contain failed deletions for retry
-    
+    Delete one logged object.
+
+    Throttled and transient failures are retried by the client's
+    RetryPolicy, so an error raised here is final for this run.
+
     Args:
         api (MegaverseAPI): API client for interacting with the Megaverse
-        log_file (str): Path to the log file containing objects to delete
-        max_retries (int): Maximum number of retry attempts for each deletion
-        retry_delay (float): Delay in seconds between retry attempts
+        obj (dict): Object in the `parse_goal_map` format
+
+    Raises ValueError for a type missing from the cell vocabulary.
     """
-    try:
-        with open(log_file, 'r') as f:
-            lines = f.readlines()
-    except FileNotFoundError:
-        print(f"Log file '{log_file}' not found. Nothing to clean up.")
-        return
-    
-    print(f"Found {len(lines)} objects to clean up.")
+    api.delete_astral_object(object_from_dict(obj))
+
+def delete_objects(
+    api: MegaverseAPI,
+    objects: List[Dict[str, Any]],
+    journal: Journal,
+    workers: int = DEFAULT_WORKERS,
+) -> List[Dict[str, Any]]:
+    """
+    Delete objects concurrently, checkpointing each deletion in the journal.
+
+    Up to `workers` deletions are in flight at once, all sharing the client's
+    pooled session and rate limiter. Results are reported in input order.
+
+    Returns:
+        The objects that could not be deleted
+    """
+    def delete_and_checkpoint(obj):
+        delete_object(api, obj)
+        journal.complete("delete", obj)
+
     failed_deletions = []  # Track objects that failed to delete
-    
-    for i, line in enumerate(lines, 1):
-        obj = json.loads(line)
-        position = Position(obj["row"], obj["column"])
-        
-        # Try deletion with retry logic
-        success = False
-        for attempt in range(max_retries):
-            try:
-                # Delete the appropriate type of object
-                if obj["type"] == "POLYANET":
-                    api.delete_polyanet(position)
-                elif obj["type"] == "SOLOON":
-                    api.delete_soloon(position)
-                elif obj["type"] == "COMETH":
-                    api.delete_cometh(position)
-                print(f"Deleted {obj['type']} {i}/{len(lines)} at position ({position.row}, {position.column})")
-                success = True
-                break
-                
-            except Exception as e:
-                # Handle rate limit errors specifically
-                if "429" in str(e):  # Too Many Requests
-                    if attempt < max_retries - 1:
-                        print(f"Rate limit hit, waiting {retry_delay} seconds before retry...")
-                        time.sleep(retry_delay)
-                        continue
-                print(f"Error deleting {obj['type']} at position ({position.row}, {position.column}): {str(e)}")
-                break
-        
-        # If deletion failed after all retries, add to failed_deletions
-        if not success:
+    outcomes = run_ordered(delete_and_checkpoint, objects, workers)
+    for i, (obj, error) in enumerate(outcomes, 1):
+        if error is None:
+            print(f"Deleted {obj['type']} {i}/{len(objects)} at position ({obj['row']}, {obj['column']})")
+        else:
+            print(f"Error deleting {obj['type']} at position ({obj['row']}, {obj['column']}): {str(error)}")
             failed_deletions.append(obj)
-        
-        time.sleep(0.2)  # Rate limiting between different objects
-    
+    return failed_deletions
+
+def _finish(log_file: str, failed_deletions: List[Dict[str, Any]]) -> None:
     # Update log file based on deletion results
     if failed_deletions:
         print(f"\nFailed to delete {len(failed_deletions)} objects. Updating log file for retry...")
-        # Write only failed deletions back to the log file
-        with open(log_file, 'w') as f:
-            for obj in failed_deletions:
-                f.write(json.dumps(obj) + '\n')
+        # Atomically rewrite the journal so it only holds failed deletions
+        Journal.compact(log_file, failed_deletions)
         print(f"Log file updated. Run cleanup again to retry failed deletions.")
     else:
         print("\nAll objects successfully deleted. Clearing log file.")
-        open(log_file, 'w').close()
+        Journal.compact(log_file, [])
+
+def cleanup_from_log(api: MegaverseAPI, log_file: str = 'challenge2_created.log', workers: int = DEFAULT_WORKERS):
+    """
+    Clean up objects from the Megaverse based on the log file.
+
+    This function:
+    1. Replays the journal to find the objects that may still exist
+    2. Deletes them in reverse order of creation, `workers` at a time
+    3. Records each successful deletion in the journal as it happens, so a
+       cleanup that is interrupted picks up where it stopped
+    4. Updates the log file to only contain failed deletions for retry
+
+    Args:
+        api (MegaverseAPI): API client for interacting with the Megaverse
+        log_file (str): Path of the execution journal (older plain JSON-line
+            logs are read as well)
+        workers (int): Number of deletions in flight at once
+
+    Pacing between calls and the wait after a rate limit are handled by the
+    API client's shared token bucket, which honors the server's Retry-After,
+    and throttled deletions are retried by the client's RetryPolicy.
+    """
+    if not os.path.exists(log_file):
+        print(f"Log file '{log_file}' not found. Nothing to clean up.")
+        return
+
+    state = Journal.replay(log_file)
+    if state.corrupt:
+        print(f"Skipped {state.corrupt} corrupted journal records")
+    objects = state.cleanup_targets()[::-1]
+    print(f"Found {len(objects)} objects to clean up.")
+
+    with Journal(log_file) as journal:
+        failed_deletions = delete_objects(api, objects, journal, workers)
+    _finish(log_file, failed_deletions)
+
+def cleanup_from_map(api: MegaverseAPI, log_file: str = 'challenge2_created.log', workers: int = DEFAULT_WORKERS):
+    """
+    Clean up by diffing the live map against an empty one.
+
+    Unlike `cleanup_from_log`, this also removes objects the journal never
+    saw, e.g. ones created by another tool or from a lost log. Deletions are
+    still checkpointed in the journal at `log_file`.
+
+    Args:
+        api (MegaverseAPI): API client for interacting with the Megaverse
+        log_file (str): Path of the execution journal to checkpoint into
+        workers (int): Number of deletions in flight at once
+    """
+    print("Fetching current map...")
+    try:
+        current = Grid.from_current_map(api.get_current_map())
+    except Exception as e:
+        print(f"Error fetching current map: {e}")
+        return
+
+    objects = [obj.to_dict() for obj in current.iter_objects()][::-1]
+    print(f"Found {len(objects)} objects on the map.")
+
+    with Journal(log_file) as journal:
+        failed_deletions = delete_objects(api, objects, journal, workers)
+    _finish(log_file, failed_deletions)
 
 def main():
     """
     Main function to execute the cleanup process.
-    
+
     The function:
     1. Initializes the API client
-    2. Reads the log of created objects
+    2. Reads the log of created objects, or the live map with --from-map
     3. Deletes the objects
     4. Handles any errors that occur during the process
     """
     load_dotenv()
-    api = MegaverseAPI()
-    cleanup_from_log(api)
+    parser = argparse.ArgumentParser(description="Crossmint Challenge 2: Cleanup Utility")
+    parser.add_argument('--from-map', action='store_true', help='Delete every object on the live map instead of those in the log')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='Number of deletions to keep in flight at once')
+    args = parser.parse_args()
+    pool_size = pool_size_for(args.workers)
+    with MegaverseAPI(pool_size=pool_size) as api:
+        if args.from_map:
+            cleanup_from_map(api, workers=args.workers)
+        else:
+            cleanup_from_log(api, workers=args.workers)
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
@@ -11,6 +11,9 @@ The goal map represents a grid where each cell can contain:
 - SPACE: Empty cell
 - None: Invalid or empty cell
 
+Tokens are looked up in the cell vocabulary (`megaverse.vocabulary`), so
+types registered there are parsed too.
+
 Example goal map format:
 {
     "goal": [
@@ -19,12 +22,214 @@ Example goal map format:
         ["SPACE", "POLYANET", "SPACE"]
     ]
 }
+
+Large maps can be parsed incrementally from a file or byte stream with
+`iter_goal_objects_from_stream`, which yields objects while the document is
+still being read so execution can start before parsing finishes.
 """
 
+import codecs
+import json
+import re
+from json.decoder import scanstring
+from megaverse.models import Position
+from megaverse.vocabulary import VOCABULARY
+
+# Keys holding the grid: "goal" in API responses, "classified" in saved snapshots
+GOAL_KEYS = ("goal", "classified")
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Token -> (model class, constructor arguments), shared with the registry
+# (`megaverse.vocabulary`). SPACE, null and unknown tokens are not in it, so
+# they are skipped.
+CONSTRUCTORS = VOCABULARY.token_constructors
+
+def _make_object(cell, row_idx, col_idx):
+    try:
+        constructor = CONSTRUCTORS.get(cell)
+    except TypeError:
+        # Arrays and objects are not cells
+        return None
+    if constructor is None:
+        return None
+    cls, args = constructor
+    return cls(Position(row_idx, col_idx), *args)
+
+def iter_goal_objects(goal_map):
+    """
+    Yield a typed astral object for every non-empty cell of the goal map.
+    
+    Args:
+        goal_map (dict): The goal map from the API containing a 2D grid of objects
+        
+    Yields:
+        PolyanetObject, SoloonObject or ComethObject in row-major order.
+        Empty, None and invalid cells are skipped.
+    """
+    rows = goal_map.get("goal")
+    if rows is None:
+        rows = goal_map.get("classified", [])
+    for row_idx, row in enumerate(rows):
+        for col_idx, cell in enumerate(row):
+            obj = _make_object(cell, row_idx, col_idx)
+            if obj is not None:
+                yield obj
+
+_WHITESPACE = " \t\r\n"
+_LITERAL = re.compile(r"-?[0-9][0-9.eE+-]*|true|false|null")
+
+def _read_text(stream, chunk_size):
+    """Yield decoded text chunks from a text or binary stream."""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        if isinstance(chunk, bytes):
+            chunk = decoder.decode(chunk)
+        if chunk:
+            yield chunk
+
+def _iter_json_tokens(stream, chunk_size):
+    """
+    Tokenize a JSON document read chunk by chunk.
+    
+    Yields (kind, value) pairs where kind is one of "{", "}", "[", "]", ":",
+    ",", "string" or "literal". Only the current chunk (plus any token split
+    across the chunk boundary) is held in memory.
+    """
+    chunks = _read_text(stream, chunk_size)
+    buffer = ""
+    pos = 0
+    while True:
+        while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+            pos += 1
+        if pos >= len(buffer):
+            more = next(chunks, None)
+            if more is None:
+                return
+            buffer, pos = more, 0
+            continue
+        char = buffer[pos]
+        if char in "{}[]:,":
+            yield char, char
+            pos += 1
+        elif char == '"':
+            try:
+                value, end = scanstring(buffer, pos + 1)
+            except json.JSONDecodeError:
+                # The string continues in the next chunk
+                more = next(chunks, None)
+                if more is None:
+                    raise ValueError("Unterminated string in goal map")
+                buffer, pos = buffer[pos:] + more, 0
+                continue
+            yield "string", value
+            pos = end
+        else:
+            match = _LITERAL.match(buffer, pos)
+            at_end = match.end() == len(buffer) if match else len(buffer) - pos < len("false")
+            if at_end:
+                # The literal may continue in the next chunk
+                more = next(chunks, None)
+                if more is not None:
+                    buffer, pos = buffer[pos:] + more, 0
+                    continue
+            if match is None:
+                raise ValueError(f"Unexpected character {char!r} in goal map")
+            yield "literal", json.loads(match.group())
+            pos = match.end()
+
+def _skip_value(kind, tokens):
+    """Consume the rest of a JSON value whose first token was `kind`."""
+    if kind not in "{[":
+        return
+    depth = 1
+    for kind, _ in tokens:
+        if kind in ("{", "["):
+            depth += 1
+        elif kind in ("}", "]"):
+            depth -= 1
+            if depth == 0:
+                return
+
+def _iter_grid(tokens):
+    """Yield (row, column, cell) for the 2D array the token stream is positioned at."""
+    kind, _ = next(tokens, (None, None))
+    if kind != "[":
+        raise ValueError("Goal map grid must be an array of rows")
+    row_idx = 0
+    for kind, _ in tokens:
+        if kind == "]":
+            return
+        if kind == ",":
+            continue
+        if kind != "[":
+            raise ValueError("Goal map rows must be arrays")
+        col_idx = 0
+        for kind, value in tokens:
+            if kind == "]":
+                break
+            if kind == ",":
+                continue
+            if kind not in ("string", "literal"):
+                raise ValueError("Goal map cells must be strings or null")
+            yield row_idx, col_idx, value
+            col_idx += 1
+        row_idx += 1
+
+def iter_goal_cells_from_stream(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Yield (row, column, cell) for every cell of a goal map JSON document.
+    
+    Args:
+        stream: Binary or text file object positioned at the start of the JSON
+        chunk_size (int): Number of bytes/characters read per chunk
+    """
+    tokens = _iter_json_tokens(stream, chunk_size)
+    kind, _ = next(tokens, (None, None))
+    if kind != "{":
+        raise ValueError("Goal map must be a JSON object")
+    for kind, key in tokens:
+        if kind == "}":
+            return
+        if kind == ",":
+            continue
+        if kind != "string" or next(tokens, (None, None))[0] != ":":
+            raise ValueError("Malformed goal map object")
+        if key in GOAL_KEYS:
+            yield from _iter_grid(tokens)
+            return
+        _skip_value(next(tokens, (None, None))[0], tokens)
+
+def iter_goal_objects_from_stream(stream, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Incrementally parse a goal map from a file or byte stream.
+    
+    Objects are yielded as soon as their cell has been read, so peak memory
+    stays flat regardless of the map size.
+    
+    Args:
+        stream: Binary or text file object positioned at the start of the JSON
+        chunk_size (int): Number of bytes/characters read per chunk
+        
+    Yields:
+        PolyanetObject, SoloonObject or ComethObject in row-major order.
+    """
+    for row_idx, col_idx, cell in iter_goal_cells_from_stream(stream, chunk_size):
+        obj = _make_object(cell, row_idx, col_idx)
+        if obj is not None:
+            yield obj
+
 def parse_goal_map(goal_map):
     """
     Parse the goal map into a list of objects with their positions and properties.
     
+    Thin wrapper around `iter_goal_objects` for callers that need a list.
+    
     Args:
         goal_map (dict): The goal map from the API containing a 2D grid of objects
         
@@ -52,37 +257,4 @@ def parse_goal_map(goal_map):
         }
     ]
     """
-    objects = []
-    for row_idx, row in enumerate(goal_map.get("goal", [])):
-        for col_idx, cell in enumerate(row):
-            # Skip empty or invalid cells
-            if cell is None or cell == "SPACE":
-                continue
-                
-            # Create base object with position
-            obj = {"row": row_idx, "column": col_idx}
-            
-            # Handle POLYANET objects
-            if cell == "POLYANET":
-                obj["type"] = "POLYANET"
-                objects.append(obj)
-                
-            # Handle SOLOON objects (COLOR_SOLOON format)
-            elif cell.endswith("_SOLOON"):
-                color = cell.split("_")[0].lower()
-                # Validate color
-                if color in ["blue", "red", "purple", "white"]:
-                    obj["type"] = "SOLOON"
-                    obj["color"] = color
-                    objects.append(obj)
-                    
-            # Handle COMETH objects (DIRECTION_COMETH format)
-            elif cell.endswith("_COMETH"):
-                direction = cell.split("_")[0].lower()
-                # Validate direction
-                if direction in ["up", "down", "left", "right"]:
-                    obj["type"] = "COMETH"
-                    obj["direction"] = direction
-                    objects.append(obj)
-                    
-    return objects 
\ No newline at end of file
+    return [obj.to_dict() for obj in iter_goal_objects(goal_map)]
@@ -0,0 +1,258 @@
+"""
+Build the Challenge 2 logo for many candidates at once.
+
+The manifest is a JSON file listing the candidates and where each one's goal
+map comes from:
+
+    {
+        "defaults": {"workers": 4},
+        "candidates": [
+            "first-candidate-id",
+            {"candidate_id": "second-candidate-id", "goal_file": "goals/second.mvs", "workers": 2, "rate": 5},
+            {"candidate_id": "third-candidate-id", "reconcile": true}
+        ]
+    }
+
+Without a `goal_file` the goal is fetched from the API (through the goal
+cache in output/). Each candidate is built in its own process by
+`create_objects_from_goal`, with `workers` calls in flight and at most
+`rate` requests per second for that candidate, while one semaphore shared
+by all processes caps the calls in flight in total (`--max-in-flight`). Every
+candidate gets its own journal and output log under `--log-dir`, and the
+results are aggregated into one report.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import redirect_stdout
+from dataclasses import dataclass, fields, replace
+from typing import Callable, List, Optional, Sequence
+from dotenv import load_dotenv
+from challenge2 import create_objects_from_goal
+from megaverse.api import MegaverseAPI
+from megaverse.cache import GoalMapCache
+from megaverse.executor import pool_size_for
+from megaverse.journal import Journal
+from megaverse.metrics import MetricsCollector
+from megaverse.ratelimit import TokenBucket
+
+DEFAULT_LOG_DIR = "runs"
+DEFAULT_MAX_IN_FLIGHT = 16
+
+@dataclass(frozen=True, slots=True)
+class CandidateJob:
+    """One manifest entry: a candidate and how to build its goal."""
+    candidate_id: str
+    goal_file: Optional[str] = None
+    workers: int = 1
+    reconcile: bool = False
+    offline: bool = False
+    base_url: Optional[str] = None
+    # Requests per second for this candidate (default: the adaptive TokenBucket)
+    rate: Optional[float] = None
+
+JOB_FIELDS = {field.name for field in fields(CandidateJob)}
+
+def load_manifest(path: str) -> List[CandidateJob]:
+    """
+    Read a manifest into jobs, applying its defaults.
+
+    Entries are candidate IDs or objects with CandidateJob fields; relative
+    goal files are resolved against the manifest's directory.
+    """
+    with open(path) as f:
+        manifest = json.load(f)
+    if isinstance(manifest, list):
+        manifest = {"candidates": manifest}
+    defaults = manifest.get("defaults", {})
+    base = os.path.dirname(os.path.abspath(path))
+    jobs, seen = [], set()
+    for entry in manifest.get("candidates", []):
+        if isinstance(entry, str):
+            entry = {"candidate_id": entry}
+        entry = {**defaults, **entry}
+        unknown = set(entry) - JOB_FIELDS
+        if unknown:
+            raise ValueError(f"Unknown manifest fields: {', '.join(sorted(unknown))}")
+        if not entry.get("candidate_id"):
+            raise ValueError(f"Manifest entry without a candidate_id: {entry}")
+        if entry["candidate_id"] in seen:
+            raise ValueError(f"Candidate {entry['candidate_id']} is listed twice")
+        if entry.get("workers", 1) < 1:
+            raise ValueError(f"Candidate {entry['candidate_id']} needs at least one worker")
+        if entry.get("rate") is not None and entry["rate"] <= 0:
+            raise ValueError(f"Candidate {entry['candidate_id']} needs a positive rate")
+        if entry.get("goal_file"):
+            entry["goal_file"] = os.path.join(base, entry["goal_file"])
+        seen.add(entry["candidate_id"])
+        jobs.append(CandidateJob(**entry))
+    return jobs
+
+# Set in every pool process by `_init_worker`
+_in_flight = None
+
+def _init_worker(in_flight) -> None:
+    global _in_flight
+    _in_flight = in_flight
+
+def _rate_limiter(rate: Optional[float]) -> Optional[TokenBucket]:
+    if rate is None:
+        return None
+    # The bucket holds at least one token, so rates below 1/s still send
+    return TokenBucket(rate=rate, capacity=max(1.0, rate), min_rate=rate / 10, max_rate=rate)
+
+def build_candidate(
+    job: CandidateJob,
+    dry_run: bool = False,
+    log_dir: str = DEFAULT_LOG_DIR,
+    cache_dir: str = GoalMapCache.DEFAULT_DIRECTORY,
+) -> dict:
+    """
+    Build one candidate's goal and summarize the run.
+
+    Progress output goes to `<log_dir>/<candidate>.log` and the journal to
+    `<log_dir>/<candidate>.journal`. The status is "ok", "failed" (calls
+    that errored or operations left unconfirmed in the journal) or "error"
+    (the build raised, or its goal or current map could not be fetched).
+    """
+    os.makedirs(log_dir, exist_ok=True)
+    log_path = os.path.join(log_dir, f"{job.candidate_id}.log")
+    journal_path = os.path.join(log_dir, f"{job.candidate_id}.journal")
+    metrics = MetricsCollector()
+    error = None
+    start = time.perf_counter()
+    try:
+        with open(log_path, "w") as out, redirect_stdout(out):
+            api = MegaverseAPI(
+                candidate_id=job.candidate_id,
+                pool_size=pool_size_for(job.workers),
+                goal_cache=GoalMapCache(cache_dir, offline=job.offline),
+                base_url=job.base_url,
+                rate_limiter=_rate_limiter(job.rate),
+                observers=[metrics],
+                in_flight=_in_flight,
+            )
+            with api:
+                journal = None if dry_run else Journal(journal_path)
+                try:
+                    if not create_objects_from_goal(api, dry_run, job.reconcile, job.goal_file, journal, job.workers):
+                        error = f"Could not fetch the goal or current map (see {log_path})"
+                finally:
+                    if journal is not None:
+                        journal.close()
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    seconds = time.perf_counter() - start
+
+    unconfirmed = 0
+    if not dry_run and os.path.exists(journal_path):
+        state = Journal.replay(journal_path)
+        unconfirmed = len(state.pending_for_plan(state.last_plan))
+    summary = metrics.snapshot()
+    if error is not None:
+        status = "error"
+    elif summary["errors"] or unconfirmed:
+        status = "failed"
+    else:
+        status = "ok"
+    return {
+        "candidate_id": job.candidate_id,
+        "status": status,
+        "seconds": round(seconds, 3),
+        "requests": summary["requests"],
+        "retries": summary["retries"],
+        "errors": summary["errors"],
+        "unconfirmed": unconfirmed,
+        "error": error,
+        "log": log_path,
+    }
+
+def run_manifest(
+    jobs: Sequence[CandidateJob],
+    processes: Optional[int] = None,
+    max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+    dry_run: bool = False,
+    log_dir: str = DEFAULT_LOG_DIR,
+    cache_dir: str = GoalMapCache.DEFAULT_DIRECTORY,
+    report: Callable[[dict], None] = lambda result: None,
+) -> List[dict]:
+    """
+    Build every job across a process pool; results are in manifest order.
+
+    No candidate keeps more calls in flight than `max_in_flight`, and the
+    shared semaphore keeps all of them together within it too.
+    """
+    if max_in_flight < 1:
+        raise ValueError("max_in_flight must be at least 1")
+    if not jobs:
+        return []
+    processes = processes or min(len(jobs), os.cpu_count() or 1)
+    context = multiprocessing.get_context("spawn")
+    in_flight = context.BoundedSemaphore(max_in_flight)
+    results = {}
+    with ProcessPoolExecutor(processes, mp_context=context, initializer=_init_worker, initargs=(in_flight,)) as pool:
+        futures = {
+            pool.submit(build_candidate, replace(job, workers=min(job.workers, max_in_flight)), dry_run, log_dir, cache_dir): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                result = future.result()
+            except Exception as e:
+                # The worker process itself died
+                result = {"candidate_id": job.candidate_id, "status": "error", "error": f"{type(e).__name__}: {e}"}
+            report(result)
+            results[job.candidate_id] = result
+    return [results[job.candidate_id] for job in jobs]
+
+def summarize(results: Sequence[dict], seconds: float) -> dict:
+    """Aggregate per-candidate results into one report."""
+    return {
+        "candidates": len(results),
+        **{status: sum(1 for result in results if result["status"] == status) for status in ("ok", "failed", "error")},
+        **{key: sum(result.get(key, 0) for result in results) for key in ("requests", "retries", "errors", "unconfirmed")},
+        "seconds": round(seconds, 3),
+        "results": list(results),
+    }
+
+def _print_result(result: dict) -> None:
+    line = f"{result['candidate_id']}: {result['status']}"
+    if "requests" in result:
+        line += f" ({result['requests']} API calls, {result['errors']} errors, {result['unconfirmed']} unconfirmed in {result['seconds']}s)"
+    if result.get("error"):
+        line += f" - {result['error']}"
+    print(line)
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Build every candidate in a manifest and report; exit non-zero if any failed."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Crossmint Challenge 2 for many candidates")
+    parser.add_argument('manifest', help='JSON manifest of candidates and goal sources')
+    parser.add_argument('--processes', type=int, help='Candidates built at once (default: one per CPU)')
+    parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT, help='API calls in flight across all candidates')
+    parser.add_argument('--dry-run', action='store_true', help='Print actions without making API calls')
+    parser.add_argument('--log-dir', default=DEFAULT_LOG_DIR, help='Directory for per-candidate logs and journals')
+    parser.add_argument('--cache-dir', default=GoalMapCache.DEFAULT_DIRECTORY, help='Directory of the goal map cache')
+    parser.add_argument('--report', help='Write the aggregated report to this JSON file')
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)
+    print(f"Building {len(jobs)} candidates...")
+    start = time.perf_counter()
+    results = run_manifest(jobs, args.processes, args.max_in_flight, args.dry_run, args.log_dir, args.cache_dir, _print_result)
+    report = summarize(results, time.perf_counter() - start)
+    print(f"{report['ok']} ok, {report['failed']} failed, {report['error']} errors; "
+          f"{report['requests']} API calls in {report['seconds']}s")
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0 if report["ok"] == report["candidates"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
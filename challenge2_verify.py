@@ -0,0 +1,140 @@
+"""
+Check that the megaverse matches the goal, and optionally repair it.
+
+The goal and current maps are compared cell by cell with a vectorized grid
+diff (see `megaverse.drift`). The report lists the differences by object type
+and the most drifted regions, and the script exits with status 1 when
+anything differs. With `--repair` only the differing cells are fixed: the
+drift is planned into deletes and creates, executed like a reconciled build,
+and the map is verified again.
+"""
+
+import argparse
+import json
+import sys
+from typing import Optional, Sequence
+from dotenv import load_dotenv
+from challenge2 import execute_batches
+from megaverse import snapshot
+from megaverse.api import MegaverseAPI
+from megaverse.cache import GoalMapCache
+from megaverse.drift import DEFAULT_REGION_SIZE, DriftReport, drift_report
+from megaverse.executor import pool_size_for
+from megaverse.grid import Grid
+from megaverse.journal import Journal, new_plan_id
+from megaverse.planner import plan_batches
+from megaverse.reconcile import plan_grid_reconciliation
+
+def load_grid(path: str) -> Grid:
+    """Read a saved goal or current map: API JSON or a `.mvs` snapshot."""
+    if path.endswith(snapshot.SUFFIX):
+        return snapshot.load(path).to_grid()
+    with open(path) as f:
+        document = json.load(f)
+    if "map" in document:
+        return Grid.from_current_map(document)
+    return Grid.from_goal_map(document)
+
+def fetch_grids(api: Optional[MegaverseAPI], goal_file: Optional[str] = None, current_file: Optional[str] = None):
+    """The (goal, current) grids, each from its file if given, else from the API."""
+    goal = load_grid(goal_file) if goal_file else Grid.from_goal_map(api.get_goal_map())
+    current = load_grid(current_file) if current_file else Grid.from_current_map(api.get_current_map())
+    return goal, current
+
+def print_report(report: DriftReport, regions: int = 10) -> None:
+    """Print a drift report, listing at most `regions` regions."""
+    rows, columns = report.shape
+    print(f"Goal: {report.goal_objects} objects, current: {report.current_objects} objects on a {rows}x{columns} map")
+    if report.is_clean:
+        print("The current map matches the goal")
+        return
+    print(f"{report.total} cells differ from the goal")
+    for kind in ("missing", "extraneous", "changed"):
+        counts = getattr(report, kind)
+        if counts:
+            print(f"  {kind}: " + ", ".join(f"{token} x{count}" for token, count in sorted(counts.items())))
+    print("Most drifted regions:")
+    for region in report.regions[:regions]:
+        print(
+            f"  rows {region['top']}-{region['bottom'] - 1}, columns {region['left']}-{region['right'] - 1}: "
+            f"{region['missing']} missing, {region['extraneous']} extraneous, {region['changed']} changed"
+        )
+    if len(report.regions) > regions:
+        print(f"  ... and {len(report.regions) - regions} more")
+
+def repair(api: MegaverseAPI, goal: Grid, current: Grid, dry_run: bool = False, journal: Journal = None, workers: int = 1) -> None:
+    """Fix only the differing cells: wrong or extraneous objects are deleted, then missing ones created."""
+    owns_journal = journal is None and not dry_run
+    if owns_journal:
+        journal = Journal()
+    try:
+        batches = plan_batches(plan_grid_reconciliation(goal, current), workers)
+        execute_batches(api, batches, dry_run, journal=journal, plan_id=new_plan_id(), workers=workers)
+    finally:
+        if owns_journal:
+            journal.close()
+
+def verify(
+    api: Optional[MegaverseAPI],
+    goal_file: Optional[str] = None,
+    current_file: Optional[str] = None,
+    region_size: int = DEFAULT_REGION_SIZE,
+    repair_drift: bool = False,
+    dry_run: bool = False,
+    workers: int = 1,
+) -> DriftReport:
+    """
+    Compare the current map with the goal and return the drift.
+
+    With `repair_drift`, the drift is repaired and the map verified again; the
+    returned report is then what is left afterwards (unchanged for a dry run).
+    """
+    goal, current = fetch_grids(api, goal_file, current_file)
+    report = drift_report(goal, current, region_size)
+    print_report(report)
+    if not repair_drift or report.is_clean:
+        return report
+    if current_file:
+        raise ValueError("Cannot repair a map read from a file")
+
+    print(f"Repairing {report.total} cells...")
+    repair(api, goal, current, dry_run, workers=workers)
+    if dry_run:
+        return report
+    report = drift_report(goal, Grid.from_current_map(api.get_current_map()), region_size)
+    print("After repair:")
+    print_report(report)
+    return report
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Verify the map; exit 0 if it matches the goal, 1 on drift, 2 if it cannot be compared."""
+    load_dotenv()
+    parser = argparse.ArgumentParser(description="Crossmint Challenge 2: verify the map against the goal")
+    parser.add_argument('--goal-file', help='Read the goal from a saved map (JSON or .mvs) instead of the API')
+    parser.add_argument('--current-file', help='Read the current map from a saved map instead of the API')
+    parser.add_argument('--offline', action='store_true', help='Use the newest cached goal map without contacting the API')
+    parser.add_argument('--region-size', type=int, default=DEFAULT_REGION_SIZE, help='Side of the square regions drift is reported by')
+    parser.add_argument('--repair', action='store_true', help='Fix the differing cells, then verify again')
+    parser.add_argument('--dry-run', action='store_true', help='With --repair, print the repair plan without making API calls')
+    parser.add_argument('--workers', type=int, default=1, help='Number of repair calls to keep in flight at once')
+    parser.add_argument('--report', help='Write the drift report to this JSON file')
+    args = parser.parse_args(argv)
+
+    api = None
+    if not (args.goal_file and args.current_file):
+        api = MegaverseAPI(goal_cache=GoalMapCache(offline=args.offline), pool_size=pool_size_for(args.workers))
+    try:
+        report = verify(api, args.goal_file, args.current_file, args.region_size, args.repair, args.dry_run, args.workers)
+    except Exception as e:
+        print(f"Error verifying map: {e}")
+        return 2
+    finally:
+        if api is not None:
+            api.close()
+    if args.report:
+        with open(args.report, "w") as f:
+            json.dump(report.to_dict(), f, indent=2)
+    return 0 if report.is_clean else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
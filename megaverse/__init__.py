@@ -3,12 +3,17 @@ Crossmint Megaverse Creator package.
 """
 
 from .api import MegaverseAPI
-from .models import Position, PolyanetObject, SoloonObject, ComethObject
+from .async_api import AsyncMegaverseAPI
+from .models import Position, Color, Direction, AstralObject, PolyanetObject, SoloonObject, ComethObject
 from .patterns import PatternGenerator
 
 __all__ = [
     'MegaverseAPI',
+    'AsyncMegaverseAPI',
     'Position',
+    'Color',
+    'Direction',
+    'AstralObject',
     'PolyanetObject',
     'SoloonObject',
     'ComethObject',
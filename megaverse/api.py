@@ -1,77 +1,275 @@
 import os
+import json
+import time
 import requests
-from typing import Optional, List
+from dataclasses import dataclass
+from functools import partial
+from requests.adapters import HTTPAdapter
+from typing import Callable, Dict, Iterable, Optional, List
+from .cache import GoalMapCache
+from .metrics import RequestEvent, RequestObserver
 from .models import AstralObject, Position, PolyanetObject, SoloonObject, ComethObject
+from .ratelimit import TokenBucket, parse_retry_after
+from .retry import RetryPolicy, IDEMPOTENT_METHODS
+from .vocabulary import VOCABULARY
+
+CREATE = "create"
+DELETE = "delete"
+
+# Model type -> API endpoint, from the cell vocabulary. Every create is a POST
+# and every delete a DELETE.
+ENDPOINTS = VOCABULARY.endpoints
+
+def _cell_payload(position: Position, candidate_id: str) -> dict:
+    """Payload identifying a cell, as sent by every delete."""
+    return {"row": position.row, "column": position.column, "candidateId": candidate_id}
+
+def _sent_size(response: Optional[requests.Response], data: Optional[dict], body: Optional[bytes]) -> int:
+    """Size of the request body, as sent when known, else as encoded here."""
+    sent = getattr(getattr(response, "request", None), "body", None)
+    if isinstance(sent, (bytes, str)):
+        return len(sent)
+    if body is not None:
+        return len(body)
+    return len(json.dumps(data).encode()) if data is not None else 0
+
+def _received_size(response: Optional[requests.Response]) -> int:
+    """Size of the response body, from Content-Length when the server sent it."""
+    if not isinstance(response, requests.Response):
+        return 0
+    length = response.headers.get("Content-Length")
+    if length is not None and length.isdigit():
+        return int(length)
+    return len(response.content or b"")
+
+class InFlightLimitAdapter(HTTPAdapter):
+    """
+    HTTPAdapter that holds a slot of a shared semaphore while a request is sent.
+
+    With a `multiprocessing` semaphore the cap holds across every client in
+    every process that shares it.
+    """
+
+    def __init__(self, slots, **kwargs):
+        self.slots = slots
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        with self.slots:
+            return super().send(request, **kwargs)
+
+@dataclass(frozen=True, slots=True)
+class Route:
+    """Dispatch entry for one model type, with payload builders bound to a candidate."""
+    endpoint: str
+    create_payload: Callable[[AstralObject], dict]
+    delete_payload: Callable[[Position], dict]
+
+@dataclass(frozen=True, slots=True)
+class PreparedRequest:
+    """A request whose JSON body has been encoded ahead of time."""
+    method: str
+    endpoint: str
+    body: bytes
+    idempotent: bool
 
 class MegaverseAPI:
     BASE_URL = "https://challenge.crossmint.io/api"
+    DEFAULT_TIMEOUT = 10.0
+    DEFAULT_POOL_SIZE = 10
 
-    def __init__(self, candidate_id: Optional[str] = None):
+    def __init__(
+        self,
+        candidate_id: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        pool_size: int = DEFAULT_POOL_SIZE,
+        session: Optional[requests.Session] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        goal_cache: Optional[GoalMapCache] = None,
+        base_url: Optional[str] = None,
+        observers: Iterable[RequestObserver] = (),
+        in_flight=None,
+    ):
         self.candidate_id = candidate_id or os.getenv("CANDIDATE_ID")
         if not self.candidate_id:
             raise ValueError("Candidate ID must be provided either through constructor or CANDIDATE_ID environment variable")
+        # Point the client at another server, e.g. `megaverse.fake_server`
+        base_url = base_url or os.getenv("MEGAVERSE_BASE_URL")
+        if base_url:
+            self.BASE_URL = base_url.rstrip("/")
+        self.timeout = timeout
+        # `in_flight` is a semaphore shared with other clients to cap the calls
+        # they have in flight together
+        self.session = session or self._build_session(pool_size, in_flight)
+        self.rate_limiter = rate_limiter or TokenBucket()
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.goal_cache = goal_cache
+        self.observers = list(observers)
+        self._routes = self._build_routes(self.candidate_id)
+
+    @staticmethod
+    def _build_session(pool_size: int, in_flight=None) -> requests.Session:
+        """Create a keep-alive session whose connection pool holds `pool_size` sockets per host."""
+        session = requests.Session()
+        if in_flight is None:
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        else:
+            adapter = InFlightLimitAdapter(in_flight, pool_connections=pool_size, pool_maxsize=pool_size)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        session.headers.update({"Connection": "keep-alive"})
+        return session
+
+    @staticmethod
+    def _build_routes(candidate_id: str) -> Dict[type, Route]:
+        """
+        Build the type -> Route dispatch table once per client.
+
+        Creates use the model's own `to_api_payload` and deletes only identify
+        the cell. Both builders have `candidateId` pre-bound, so the hot path
+        does no per-call setup or isinstance checks.
+        """
+        delete_payload = partial(_cell_payload, candidate_id=candidate_id)
+        return {
+            model: Route(endpoint, partial(model.to_api_payload, candidate_id=candidate_id), delete_payload)
+            for model, endpoint in ENDPOINTS.items()
+        }
+
+    def add_observer(self, observer: RequestObserver) -> None:
+        """Register an object whose `on_request(event)` is called after every call."""
+        self.observers.append(observer)
+
+    def close(self) -> None:
+        """Release the pooled connections held by the session."""
+        self.session.close()
+
+    def __enter__(self) -> "MegaverseAPI":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def _make_request(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[dict] = None,
+        timeout: Optional[float] = None,
+        idempotent: Optional[bool] = None,
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+    ) -> requests.Response:
+        """
+        Send a request through the rate limiter, retrying transient failures.
+
+        The JSON body is given either as `data` or already encoded as `body`.
+        `idempotent` defaults to the HTTP semantics of `method`; see
+        `RetryPolicy` for which failures are retried in each case. Every
+        call, successful or not, is reported once to the observers.
+        """
+        if idempotent is None:
+            idempotent = method in IDEMPOTENT_METHODS
+        if not self.observers:
+            return self.retry_policy.call(lambda: self._send(method, endpoint, data, timeout, body, headers), idempotent)
+
+        attempts = 0
 
-    def _make_request(self, method: str, endpoint: str, data: Optional[dict] = None) -> requests.Response:
+        def attempt():
+            nonlocal attempts
+            attempts += 1
+            return self._send(method, endpoint, data, timeout, body, headers)
+
+        response = error = None
+        start = time.perf_counter()
+        try:
+            response = self.retry_policy.call(attempt, idempotent)
+            return response
+        except Exception as e:
+            error = e
+            response = getattr(e, "response", None)
+            raise
+        finally:
+            self._notify(RequestEvent(
+                method=method,
+                endpoint=endpoint.replace(self.candidate_id, "{candidate}"),
+                status=getattr(response, "status_code", None),
+                duration=time.perf_counter() - start,
+                attempts=attempts,
+                bytes_sent=_sent_size(response, data, body),
+                bytes_received=_received_size(response),
+                error=type(error).__name__ if error is not None else None,
+            ))
+
+    def _notify(self, event: RequestEvent) -> None:
+        for observer in self.observers:
+            observer.on_request(event)
+
+    def _send(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[dict],
+        timeout: Optional[float],
+        body: Optional[bytes] = None,
+        headers: Optional[dict] = None,
+    ) -> requests.Response:
         url = f"{self.BASE_URL}/{endpoint}"
-        response = requests.request(method, url, json=data)
+        timeout = self.timeout if timeout is None else timeout
+        self.rate_limiter.acquire()
+        if body is not None:
+            headers = {**(headers or {}), "Content-Type": "application/json"}
+            response = self.session.request(method, url, data=body, headers=headers, timeout=timeout)
+        else:
+            response = self.session.request(method, url, json=data, headers=headers, timeout=timeout)
+        if response.status_code == 429:
+            self.rate_limiter.on_throttle(parse_retry_after(response.headers.get("Retry-After")))
+        elif response.status_code < 400:
+            self.rate_limiter.on_success()
         response.raise_for_status()
         return response
 
+    def _route(self, model: type, action: str) -> Route:
+        try:
+            return self._routes[model]
+        except KeyError:
+            verb = "Creation" if action == CREATE else "Deletion"
+            raise NotImplementedError(f"{verb} of {model.__name__} not implemented yet") from None
+
+    # Creating an object on a cell is a set operation: repeating the POST
+    # leaves the map unchanged, so creates are retried like idempotent calls.
+
+    def _create(self, obj: AstralObject) -> None:
+        route = self._route(type(obj), CREATE)
+        self._make_request("POST", route.endpoint, route.create_payload(obj), idempotent=True)
+
+    def _delete(self, model: type, position: Position) -> None:
+        route = self._route(model, DELETE)
+        self._make_request("DELETE", route.endpoint, route.delete_payload(position))
+
     def create_polyanet(self, position: Position) -> None:
         """Create a POLYanet at the specified position."""
-        data = {
-            "row": position.row,
-            "column": position.column,
-            "candidateId": self.candidate_id
-        }
-        self._make_request("POST", "polyanets", data)
+        self._create(PolyanetObject(position))
 
     def delete_polyanet(self, position: Position) -> None:
         """Delete a POLYanet at the specified position."""
-        data = {
-            "row": position.row,
-            "column": position.column,
-            "candidateId": self.candidate_id
-        }
-        self._make_request("DELETE", "polyanets", data)
+        self._delete(PolyanetObject, position)
 
     def create_soloon(self, position: Position, color: str) -> None:
         """Create a SOLoon at the specified position with the given color."""
-        data = {
-            "row": position.row,
-            "column": position.column,
-            "color": color,
-            "candidateId": self.candidate_id
-        }
-        self._make_request("POST", "soloons", data)
+        self._create(SoloonObject(position, color))
 
     def delete_soloon(self, position: Position) -> None:
         """Delete a SOLoon at the specified position."""
-        data = {
-            "row": position.row,
-            "column": position.column,
-            "candidateId": self.candidate_id
-        }
-        self._make_request("DELETE", "soloons", data)
+        self._delete(SoloonObject, position)
 
     def create_cometh(self, position: Position, direction: str) -> None:
         """Create a ComETH at the specified position with the given direction."""
-        data = {
-            "row": position.row,
-            "column": position.column,
-            "direction": direction,
-            "candidateId": self.candidate_id
-        }
-        self._make_request("POST", "comeths", data)
+        self._create(ComethObject(position, direction))
 
     def delete_cometh(self, position: Position) -> None:
         """Delete a ComETH at the specified position."""
-        data = {
-            "row": position.row,
-            "column": position.column,
-            "candidateId": self.candidate_id
-        }
-        self._make_request("DELETE", "comeths", data)
+        self._delete(ComethObject, position)
 
     def cleanup_polyanets(self, positions: List[Position]) -> None:
         """Delete multiple POLYanets at the specified positions."""
@@ -83,17 +281,72 @@ class MegaverseAPI:
                 print(f"Error deleting POLYanet at position ({position.row}, {position.column}): {str(e)}")
 
     def get_goal_map(self) -> dict:
-        """Get the goal map for the current challenge phase."""
-        response = self._make_request("GET", f"map/{self.candidate_id}/goal")
+        """
+        Get the goal map for the current challenge phase.
+
+        With a `goal_cache`, a fresh snapshot is served from disk, a stale one
+        is revalidated with a conditional GET, and offline caches never touch
+        the network.
+        """
+        cache = self.goal_cache
+        if cache is None:
+            return self._make_request("GET", f"map/{self.candidate_id}/goal").json()
+
+        cached = cache.load(self.candidate_id)
+        if cache.offline:
+            if cached is None:
+                raise FileNotFoundError(f"No cached goal map for candidate {self.candidate_id}")
+            return cached.goal_map
+        if cached is not None and cache.is_fresh(cached):
+            return cached.goal_map
+
+        headers = cache.conditional_headers(cached) if cached is not None else None
+        response = self._make_request("GET", f"map/{self.candidate_id}/goal", headers=headers)
+        if response.status_code == 304 and cached is not None:
+            return cache.touch(self.candidate_id, cached).goal_map
+        goal_map = response.json()
+        cache.store(
+            self.candidate_id,
+            goal_map,
+            etag=response.headers.get("ETag"),
+            last_modified=response.headers.get("Last-Modified"),
+        )
+        return goal_map
+
+    def get_current_map(self) -> dict:
+        """Get the current state of the candidate's megaverse."""
+        response = self._make_request("GET", f"map/{self.candidate_id}")
         return response.json()
 
     def create_astral_object(self, obj: AstralObject) -> None:
         """Create any type of astral object."""
-        if isinstance(obj, PolyanetObject):
-            self.create_polyanet(obj.position)
-        elif isinstance(obj, SoloonObject):
-            self.create_soloon(obj.position, obj.color)
-        elif isinstance(obj, ComethObject):
-            self.create_cometh(obj.position, obj.direction)
+        self._create(obj)
+
+    def delete_astral_object(self, obj: AstralObject) -> None:
+        """Delete any type of astral object."""
+        self._delete(type(obj), obj.position)
+
+    def prepare_request(self, action: str, obj: AstralObject) -> PreparedRequest:
+        """Encode the request that creates or deletes `obj` without sending it."""
+        route = self._route(type(obj), action)
+        if action == CREATE:
+            method, payload = "POST", route.create_payload(obj)
+        elif action == DELETE:
+            method, payload = "DELETE", route.delete_payload(obj.position)
         else:
-            raise NotImplementedError(f"Creation of {type(obj).__name__} not implemented yet") 
\ No newline at end of file
+            raise ValueError(f"Unknown action: {action}")
+        body = json.dumps(payload, separators=(",", ":")).encode()
+        return PreparedRequest(method, route.endpoint, body, idempotent=True)
+
+    def prepare_plan(self, operations: Iterable) -> List[PreparedRequest]:
+        """
+        Pre-encode the JSON bodies of a whole plan ahead of execution.
+
+        `operations` are objects with `action` and `object` attributes, such
+        as `megaverse.reconcile.Operation`.
+        """
+        return [self.prepare_request(op.action, op.object) for op in operations]
+
+    def send_prepared(self, request: PreparedRequest) -> requests.Response:
+        """Send a request built by `prepare_request`."""
+        return self._make_request(request.method, request.endpoint, idempotent=request.idempotent, body=request.body)
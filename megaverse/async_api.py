@@ -0,0 +1,117 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Union
+from .api import MegaverseAPI
+from .models import AstralObject, Position
+
+class AsyncMegaverseAPI:
+    """
+    Asyncio client for the Megaverse API.
+
+    Each call runs the blocking request of an underlying `MegaverseAPI` on a
+    dedicated thread pool, so the pooled keep-alive session is shared and at
+    most `concurrency` requests are in flight at any time.
+    """
+
+    DEFAULT_CONCURRENCY = 8
+
+    def __init__(
+        self,
+        candidate_id: Optional[str] = None,
+        concurrency: int = DEFAULT_CONCURRENCY,
+        api: Optional[MegaverseAPI] = None,
+        **api_kwargs,
+    ):
+        if concurrency < 1:
+            raise ValueError("Concurrency must be at least 1")
+        # An injected client belongs to the caller, who closes it
+        self._owns_api = api is None
+        self.api = api or MegaverseAPI(candidate_id, pool_size=concurrency, **api_kwargs)
+        self.concurrency = concurrency
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="megaverse")
+
+    @property
+    def candidate_id(self) -> str:
+        return self.api.candidate_id
+
+    async def _call(self, func, *args):
+        async with self._semaphore:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+
+    async def close(self) -> None:
+        """
+        Wait for in-flight calls and release the thread pool.
+
+        The session is closed too, unless the `MegaverseAPI` was passed in.
+        """
+        # Waiting for the pool blocks, so it happens off the event loop
+        await asyncio.to_thread(self._executor.shutdown, wait=True)
+        if self._owns_api:
+            self.api.close()
+
+    async def __aenter__(self) -> "AsyncMegaverseAPI":
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback) -> None:
+        await self.close()
+
+    async def create_polyanet(self, position: Position) -> None:
+        """Create a POLYanet at the specified position."""
+        await self._call(self.api.create_polyanet, position)
+
+    async def delete_polyanet(self, position: Position) -> None:
+        """Delete a POLYanet at the specified position."""
+        await self._call(self.api.delete_polyanet, position)
+
+    async def create_soloon(self, position: Position, color: str) -> None:
+        """Create a SOLoon at the specified position with the given color."""
+        await self._call(self.api.create_soloon, position, color)
+
+    async def delete_soloon(self, position: Position) -> None:
+        """Delete a SOLoon at the specified position."""
+        await self._call(self.api.delete_soloon, position)
+
+    async def create_cometh(self, position: Position, direction: str) -> None:
+        """Create a ComETH at the specified position with the given direction."""
+        await self._call(self.api.create_cometh, position, direction)
+
+    async def delete_cometh(self, position: Position) -> None:
+        """Delete a ComETH at the specified position."""
+        await self._call(self.api.delete_cometh, position)
+
+    async def get_goal_map(self) -> dict:
+        """Get the goal map for the current challenge phase."""
+        return await self._call(self.api.get_goal_map)
+
+    async def get_current_map(self) -> dict:
+        """Get the current state of the candidate's megaverse."""
+        return await self._call(self.api.get_current_map)
+
+    async def create_astral_object(self, obj: AstralObject) -> None:
+        """Create any type of astral object."""
+        await self._call(self.api.create_astral_object, obj)
+
+    async def delete_astral_object(self, obj: AstralObject) -> None:
+        """Delete any type of astral object."""
+        await self._call(self.api.delete_astral_object, obj)
+
+    async def create_many(self, objects: Iterable[AstralObject]) -> List[Union[None, Exception]]:
+        """
+        Create all objects with up to `concurrency` requests in flight.
+
+        Returns one entry per object, in input order: None on success or the
+        exception raised for that object. A failure never cancels the others.
+        """
+        return await asyncio.gather(
+            *(self.create_astral_object(obj) for obj in objects),
+            return_exceptions=True,
+        )
+
+    async def delete_many(self, objects: Iterable[AstralObject]) -> List[Union[None, Exception]]:
+        """Delete all objects concurrently; see `create_many` for the result format."""
+        return await asyncio.gather(
+            *(self.delete_astral_object(obj) for obj in objects),
+            return_exceptions=True,
+        )
@@ -0,0 +1,157 @@
+"""
+On-disk cache of goal maps keyed by candidate ID.
+
+Snapshots are stored in the same layout the scripts already use for saved
+goal maps, `<directory>/<candidate>_<UTC timestamp>.json` (or `.mvs` binary
+snapshots with `binary=True`, see `megaverse.snapshot`), and a small
+`<candidate>.meta.json` index records the validators returned by the server
+(ETag / Last-Modified) and when the newest snapshot was last confirmed.
+"""
+
+import json
+import os
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from glob import glob
+from typing import Callable, Optional
+from . import snapshot
+
+TIMESTAMP_FORMAT = "%Y%m%dT%H%M%SZ"
+
+@dataclass
+class CachedGoalMap:
+    goal_map: dict
+    path: str
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    fetched_at: Optional[float] = None
+
+class GoalMapCache:
+    """
+    Goal map cache with TTL, conditional revalidation and an offline mode.
+
+    - Within `ttl` seconds of the last fetch or revalidation, the cached map
+      is served without touching the network.
+    - After that, the map is revalidated with If-None-Match/If-Modified-Since
+      and a 304 response refreshes the entry without re-downloading it.
+    - With `offline=True` the newest snapshot on disk is always served, and a
+      missing snapshot raises FileNotFoundError.
+    - With `binary=True` new snapshots are written in the compact binary
+      format; JSON and binary snapshots are both read.
+    """
+
+    DEFAULT_DIRECTORY = "output"
+    DEFAULT_TTL = 3600.0
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_DIRECTORY,
+        ttl: float = DEFAULT_TTL,
+        offline: bool = False,
+        clock: Callable[[], float] = time.time,
+        binary: bool = False,
+    ):
+        self.directory = directory
+        self.ttl = ttl
+        self.offline = offline
+        self._clock = clock
+        self.binary = binary
+
+    def _meta_path(self, candidate_id: str) -> str:
+        return os.path.join(self.directory, f"{candidate_id}.meta.json")
+
+    def _read_meta(self, candidate_id: str) -> dict:
+        try:
+            with open(self._meta_path(candidate_id)) as f:
+                return json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def _write_json(self, path: str, data: dict, indent: Optional[int] = None) -> None:
+        # Write to a temporary file first so a crash never leaves a torn entry
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(data, f, indent=indent)
+        os.replace(tmp_path, path)
+
+    def snapshots(self, candidate_id: str) -> list:
+        """Paths of all snapshots for a candidate, oldest first."""
+        paths = glob(os.path.join(self.directory, f"{candidate_id}_*.json"))
+        paths += glob(os.path.join(self.directory, f"{candidate_id}_*{snapshot.SUFFIX}"))
+        return sorted(paths)
+
+    def load(self, candidate_id: str) -> Optional[CachedGoalMap]:
+        """Return the newest snapshot for a candidate, or None if there is none."""
+        meta = self._read_meta(candidate_id)
+        path = meta.get("snapshot")
+        if not path or not os.path.exists(path):
+            snapshots = self.snapshots(candidate_id)
+            if not snapshots:
+                return None
+            path, meta = snapshots[-1], {}
+        if path.endswith(snapshot.SUFFIX):
+            goal_map = snapshot.load(path).to_json()
+        else:
+            with open(path) as f:
+                goal_map = json.load(f)
+        # Older saved snapshots store the grid under "classified"
+        if "goal" not in goal_map and "classified" in goal_map:
+            goal_map = {"goal": goal_map["classified"]}
+        return CachedGoalMap(
+            goal_map=goal_map,
+            path=path,
+            etag=meta.get("etag"),
+            last_modified=meta.get("last_modified"),
+            fetched_at=meta.get("fetched_at"),
+        )
+
+    def is_fresh(self, entry: CachedGoalMap) -> bool:
+        """Whether an entry was fetched or revalidated less than `ttl` seconds ago."""
+        return entry.fetched_at is not None and self._clock() - entry.fetched_at < self.ttl
+
+    @staticmethod
+    def conditional_headers(entry: CachedGoalMap) -> dict:
+        """Request headers that let the server answer 304 Not Modified."""
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def store(
+        self,
+        candidate_id: str,
+        goal_map: dict,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> CachedGoalMap:
+        """Save a freshly downloaded goal map as the candidate's newest snapshot."""
+        now = self._clock()
+        timestamp = datetime.fromtimestamp(now, timezone.utc).strftime(TIMESTAMP_FORMAT)
+        if self.binary:
+            path = os.path.join(self.directory, f"{candidate_id}_{timestamp}{snapshot.SUFFIX}")
+            os.makedirs(self.directory, exist_ok=True)
+            snapshot.dump(snapshot.from_json(goal_map), path)
+        else:
+            path = os.path.join(self.directory, f"{candidate_id}_{timestamp}.json")
+            self._write_json(path, goal_map, indent=2)
+        entry = CachedGoalMap(goal_map, path, etag, last_modified, now)
+        self._save_meta(candidate_id, entry)
+        return entry
+
+    def touch(self, candidate_id: str, entry: CachedGoalMap) -> CachedGoalMap:
+        """Mark an entry as revalidated after a 304 response."""
+        entry.fetched_at = self._clock()
+        self._save_meta(candidate_id, entry)
+        return entry
+
+    def _save_meta(self, candidate_id: str, entry: CachedGoalMap) -> None:
+        self._write_json(self._meta_path(candidate_id), {
+            "snapshot": entry.path,
+            "etag": entry.etag,
+            "last_modified": entry.last_modified,
+            "fetched_at": entry.fetched_at,
+        })
@@ -0,0 +1,115 @@
+"""
+Summaries of how far the current map has drifted from the goal.
+
+`drift_report` runs one `Grid.diff` and aggregates the differing cells with
+NumPy: by object type (what is missing, what should not be there, and what
+was built with the wrong type, color or direction) and by square region, so
+a report on a huge map costs a few array passes however much has drifted.
+"""
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Tuple
+import numpy as np
+from .grid import INVALID, TOKENS, Grid
+
+DEFAULT_REGION_SIZE = 10
+
+def _token(code: int) -> str:
+    return TOKENS[code] if code < len(TOKENS) else "INVALID"
+
+def _count_tokens(codes: np.ndarray) -> Dict[str, int]:
+    counts = np.bincount(codes, minlength=INVALID + 1)
+    return {_token(code): int(counts[code]) for code in np.flatnonzero(counts)}
+
+@dataclass
+class DriftReport:
+    """
+    Differences between a goal and a current map.
+
+    `missing` and `extraneous` count cells by the token that should be or is
+    there; `changed` counts "GOAL->CURRENT" token pairs. `regions` lists
+    every region with a difference, most drifted first.
+    """
+    shape: Tuple[int, int]
+    goal_objects: int
+    current_objects: int
+    missing: Dict[str, int] = field(default_factory=dict)
+    extraneous: Dict[str, int] = field(default_factory=dict)
+    changed: Dict[str, int] = field(default_factory=dict)
+    regions: List[dict] = field(default_factory=list)
+
+    @property
+    def total(self) -> int:
+        return sum(self.missing.values()) + sum(self.extraneous.values()) + sum(self.changed.values())
+
+    @property
+    def is_clean(self) -> bool:
+        return self.total == 0
+
+    def to_dict(self) -> dict:
+        return {
+            "shape": list(self.shape),
+            "goal_objects": self.goal_objects,
+            "current_objects": self.current_objects,
+            "drift": self.total,
+            "missing": self.missing,
+            "extraneous": self.extraneous,
+            "changed": self.changed,
+            "regions": self.regions,
+        }
+
+def _region_counts(positions: np.ndarray, region_size: int, columns: int) -> Dict[int, int]:
+    """Differing cells per region, keyed by the region's row-major index."""
+    if not len(positions):
+        return {}
+    keys = (positions[:, 0] // region_size) * columns + positions[:, 1] // region_size
+    unique, counts = np.unique(keys, return_counts=True)
+    return dict(zip(unique.tolist(), counts.tolist()))
+
+def drift_report(goal: Grid, current: Grid, region_size: int = DEFAULT_REGION_SIZE) -> DriftReport:
+    """Compare `current` against `goal` (same shape) and summarize the differences."""
+    if region_size < 1:
+        raise ValueError("Region size must be at least 1")
+    diff = goal.diff(current)
+    goal_codes = goal._object_codes()
+    current_codes = current._object_codes()
+
+    def codes_at(codes: np.ndarray, positions: np.ndarray) -> np.ndarray:
+        return codes[positions[:, 0], positions[:, 1]] if len(positions) else np.zeros(0, dtype=np.uint8)
+
+    changed_pairs = codes_at(goal_codes, diff.changed).astype(np.uint16) * 256 + codes_at(current_codes, diff.changed)
+    pairs, pair_counts = np.unique(changed_pairs, return_counts=True)
+    changed = {
+        f"{_token(pair // 256)}->{_token(pair % 256)}": count
+        for pair, count in zip(pairs.tolist(), pair_counts.tolist())
+    }
+
+    rows, columns = goal.shape
+    region_columns = -(-columns // region_size)
+    per_kind = {
+        kind: _region_counts(positions, region_size, region_columns)
+        for kind, positions in (("missing", diff.missing), ("extraneous", diff.extraneous), ("changed", diff.changed))
+    }
+    regions = []
+    for key in sorted(set().union(*per_kind.values())):
+        top, left = (key // region_columns) * region_size, (key % region_columns) * region_size
+        counts = {kind: per_kind[kind].get(key, 0) for kind in per_kind}
+        regions.append({
+            "top": top,
+            "left": left,
+            "bottom": min(top + region_size, rows),
+            "right": min(left + region_size, columns),
+            **counts,
+            "total": sum(counts.values()),
+        })
+    regions.sort(key=lambda region: -region["total"])
+
+    return DriftReport(
+        shape=goal.shape,
+        goal_objects=goal.count(),
+        current_objects=current.count(),
+        missing=_count_tokens(codes_at(goal_codes, diff.missing)),
+        extraneous=_count_tokens(codes_at(current_codes, diff.extraneous)),
+        changed=changed,
+        regions=regions,
+    )
@@ -0,0 +1,281 @@
+"""
+Local stand-in for the Crossmint Megaverse API.
+
+The fake speaks the same HTTP interface as the real service, so the clients
+and scripts can be pointed at it through `MegaverseAPI(base_url=...)` or the
+`MEGAVERSE_BASE_URL` environment variable:
+
+- POST/DELETE /api/polyanets, /api/soloons, /api/comeths
+- GET /api/map/{candidate}/goal
+- GET /api/map/{candidate}  (current map, same cell format as the real one)
+
+Latency, injected 429s and 5xx errors, and a server-side rate limit are all
+configurable, which makes it usable for integration tests and benchmarks:
+
+    python -m megaverse.fake_server --port 8000 --latency 0.05 --rate-limit 20
+    MEGAVERSE_BASE_URL=http://127.0.0.1:8000/api python challenge2.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from collections import Counter, deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Sequence, Tuple
+from .patterns import PatternGenerator
+from .vocabulary import VOCABULARY
+
+# Endpoint -> what it accepts (current-map type code, required attribute and
+# its allowed values), from the cell vocabulary
+OBJECT_ENDPOINTS = VOCABULARY.schemas
+
+_MAP_PATH = re.compile(r"^/api/map/([^/]+)(/goal)?/?$")
+_OBJECT_PATH = re.compile(r"^/api/([a-z]+)/?$")
+
+def cross_goal(size: int = 11) -> List[List[str]]:
+    """The Challenge 1 cross as a goal map, used when no goal is given."""
+    goal = [["SPACE"] * size for _ in range(size)]
+    for obj in PatternGenerator.generate_cross(size):
+        goal[obj.position.row][obj.position.column] = "POLYANET"
+    return goal
+
+class _SlidingWindow:
+    """Server-side rate limit: at most `limit` requests in any `window` seconds."""
+
+    def __init__(self, limit: float, window: float = 1.0):
+        self.limit = limit
+        self.window = window
+        self._times = deque()
+        self._lock = threading.Lock()
+
+    def admit(self, now: float) -> Optional[float]:
+        """Record a request; return None if admitted, else seconds until a slot frees up."""
+        with self._lock:
+            while self._times and now - self._times[0] >= self.window:
+                self._times.popleft()
+            if len(self._times) >= self.limit:
+                return self.window - (now - self._times[0])
+            self._times.append(now)
+            return None
+
+class FakeMegaverseHandler(BaseHTTPRequestHandler):
+    server: "FakeMegaverseServer"
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; without this every keep-alive
+    # response stalls on delayed ACKs
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, status: int, payload: dict, headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _read_json(self) -> Optional[dict]:
+        length = int(self.headers.get("Content-Length") or 0)
+        if not length:
+            return None
+        try:
+            body = json.loads(self.rfile.read(length))
+        except json.JSONDecodeError:
+            return None
+        return body if isinstance(body, dict) else None
+
+    def _handle(self) -> None:
+        server = self.server
+        body = self._read_json()
+        if server.latency:
+            time.sleep(server.latency)
+
+        fault = server.inject_fault()
+        if fault is not None:
+            status, headers = fault
+            self._reply(status, {"error": True, "message": "Injected failure"}, headers)
+            return
+
+        status, payload = server.dispatch(self.command, self.path, body)
+        self._reply(status, payload)
+
+    do_GET = do_POST = do_DELETE = _handle
+
+class FakeMegaverseServer(ThreadingHTTPServer):
+    """
+    Threaded fake of the Megaverse API holding one map per candidate.
+
+    - latency: seconds every request is delayed before it is answered
+    - throttle_rate: probability of answering 429 with `Retry-After`
+    - error_rate: probability of answering 500
+    - rate_limit: requests per second admitted before answering 429
+    - goal: goal map rows served by `map/{id}/goal`; the current map has the
+      same dimensions and starts empty
+
+    `stats` counts responses by status code.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        goal: Optional[Sequence[Sequence[str]]] = None,
+        latency: float = 0.0,
+        throttle_rate: float = 0.0,
+        error_rate: float = 0.0,
+        rate_limit: Optional[float] = None,
+        retry_after: float = 1.0,
+        seed: Optional[int] = None,
+    ):
+        super().__init__((host, port), FakeMegaverseHandler)
+        self.goal = [list(row) for row in (goal if goal is not None else cross_goal())]
+        self.latency = latency
+        self.throttle_rate = throttle_rate
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.stats = Counter()
+        self._limiter = _SlidingWindow(rate_limit) if rate_limit else None
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._maps: Dict[str, Dict[Tuple[int, int], dict]] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/api"
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return len(self.goal), len(self.goal[0]) if self.goal else 0
+
+    def start(self) -> "FakeMegaverseServer":
+        """Serve from a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, kwargs={"poll_interval": 0.05}, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        if self._thread is not None:
+            self.shutdown()
+            self._thread.join()
+            self._thread = None
+        self.server_close()
+
+    def __enter__(self) -> "FakeMegaverseServer":
+        return self.start()
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def cells(self, candidate_id: str) -> Dict[Tuple[int, int], dict]:
+        """A copy of the objects on a candidate's map, keyed by (row, column)."""
+        with self._lock:
+            return dict(self._maps.get(candidate_id, {}))
+
+    def inject_fault(self) -> Optional[Tuple[int, Dict[str, str]]]:
+        """Decide whether the current request is throttled or fails."""
+        if self._limiter is not None:
+            wait = self._limiter.admit(time.monotonic())
+            if wait is not None:
+                return self._count(429), {"Retry-After": f"{max(wait, 0.001):.3f}"}
+        with self._lock:
+            roll = self._rng.random()
+        if roll < self.throttle_rate:
+            return self._count(429), {"Retry-After": f"{self.retry_after:g}"}
+        if roll < self.throttle_rate + self.error_rate:
+            return self._count(500), {}
+        return None
+
+    def _count(self, status: int) -> int:
+        with self._lock:
+            self.stats[status] += 1
+        return status
+
+    def dispatch(self, method: str, path: str, body: Optional[dict]) -> Tuple[int, dict]:
+        """Apply a request to the in-memory maps and build the response."""
+        path = path.split("?", 1)[0]
+        match = _MAP_PATH.match(path)
+        if match and method == "GET":
+            candidate_id, goal = match.groups()
+            if goal:
+                return self._count(200), {"goal": self.goal}
+            return self._count(200), self._current_map(candidate_id)
+
+        match = _OBJECT_PATH.match(path)
+        if not match or match.group(1) not in OBJECT_ENDPOINTS or method not in ("POST", "DELETE"):
+            return self._count(404), {"error": True, "message": f"Cannot {method} {path}"}
+        if not body or "candidateId" not in body:
+            return self._count(400), {"error": True, "message": "candidateId is required"}
+
+        rows, columns = self.shape
+        row, column = body.get("row"), body.get("column")
+        if not (isinstance(row, int) and isinstance(column, int) and 0 <= row < rows and 0 <= column < columns):
+            return self._count(400), {"error": True, "message": "Position out of bounds"}
+
+        schema = OBJECT_ENDPOINTS[match.group(1)]
+        attribute = schema.attribute
+        with self._lock:
+            cells = self._maps.setdefault(body["candidateId"], {})
+            if method == "DELETE":
+                cells.pop((row, column), None)
+            else:
+                if attribute is not None and body.get(attribute) not in schema.values:
+                    self.stats[400] += 1
+                    return 400, {"error": True, "message": f"Invalid {attribute}"}
+                cell = {"type": schema.map_type}
+                if attribute is not None:
+                    cell[attribute] = body[attribute]
+                cells[(row, column)] = cell
+        return self._count(200), {}
+
+    def _current_map(self, candidate_id: str) -> dict:
+        rows, columns = self.shape
+        cells = self.cells(candidate_id)
+        content = [[cells.get((row, column)) for column in range(columns)] for row in range(rows)]
+        return {"map": {"_id": candidate_id, "content": content, "candidateId": candidate_id, "phase": 2}}
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake of the Crossmint Megaverse API")
+    parser.add_argument('--host', default="127.0.0.1")
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--goal-file', help='Serve the goal map from a saved JSON file instead of the cross')
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--throttle-rate', type=float, default=0.0, help='Fraction of requests answered with 429')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='Fraction of requests answered with 500')
+    parser.add_argument('--rate-limit', type=float, help='Requests per second admitted before answering 429')
+    args = parser.parse_args()
+
+    goal = None
+    if args.goal_file:
+        with open(args.goal_file) as f:
+            saved = json.load(f)
+        goal = saved.get("goal") or saved.get("classified")
+    server = FakeMegaverseServer(
+        args.host,
+        args.port,
+        goal=goal,
+        latency=args.latency,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        rate_limit=args.rate_limit,
+    )
+    print(f"Serving fake Megaverse API at {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Compact NumPy representation of goal and current maps.
+
+A `Grid` stores one uint8 code per cell instead of a nested list of strings.
+The cell vocabulary (`megaverse.vocabulary`) maps each goal token to a code:
+
+    0 SPACE, 1 POLYANET, 2-5 <COLOR>_SOLOON, 6-9 <DIRECTION>_COMETH
+
+followed by any types registered later.
+
+Tokens outside the vocabulary are stored as INVALID so they can be reported
+by `validate` while being treated as empty everywhere else, matching
+`parse_goal_map` which skips them. Non-empty cells convert to and from the
+model objects in `megaverse.models`.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from .models import AstralObject, Position
+from .vocabulary import INVALID, SPACE, VOCABULARY
+
+# Views of the cell vocabulary (see `megaverse.vocabulary`), shared with the
+# registry so types registered later are included.
+# Index in TOKENS is the cell code; the API uses null for empty cells as well
+# as "SPACE", so TOKEN_CODES maps null (and its string form "None") to SPACE.
+TOKENS = VOCABULARY.tokens
+TOKEN_CODES = VOCABULARY.token_codes
+# (current-map type, color or direction) -> cell code
+CURRENT_MAP_CODES = VOCABULARY.map_codes
+# (model class, extra constructor arguments) for every non-empty code
+OBJECTS = VOCABULARY.code_constructors
+
+def make_object(code: int, row: int, column: int) -> AstralObject:
+    """Build the model object for a non-empty cell code at (row, column)."""
+    cls, args = OBJECTS[code]
+    return cls(Position(row, column), *args)
+
+def code_for_object(obj: AstralObject) -> int:
+    """Return the cell code of a model object."""
+    return VOCABULARY.code_for_object(obj)
+
+@dataclass
+class GridDiff:
+    """
+    Cell positions, as (N, 2) arrays of (row, column), where two grids differ.
+
+    - missing: the goal has an object and the current map is empty
+    - extraneous: the current map has an object the goal does not want
+    - changed: both have an object but of a different type, color or direction
+    """
+    missing: np.ndarray
+    extraneous: np.ndarray
+    changed: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.missing) + len(self.extraneous) + len(self.changed)
+
+    @property
+    def is_empty(self) -> bool:
+        return len(self) == 0
+
+class Grid:
+    """A 2D map of cell codes backed by a uint8 NumPy array."""
+
+    __slots__ = ("codes",)
+
+    def __init__(self, codes: np.ndarray):
+        codes = np.asarray(codes, dtype=np.uint8)
+        if codes.ndim != 2:
+            raise ValueError(f"Grid must be two-dimensional, got shape {codes.shape}")
+        self.codes = codes
+
+    @classmethod
+    def empty(cls, rows: int, columns: int) -> "Grid":
+        return cls(np.zeros((rows, columns), dtype=np.uint8))
+
+    @classmethod
+    def from_tokens(cls, rows: Sequence[Sequence[Optional[str]]]) -> "Grid":
+        """
+        Build a grid from a nested list of goal tokens.
+
+        The tokens are looked up in one pass straight into a preallocated
+        uint8 array, so memory stays at one byte per cell.
+        """
+        n_rows = len(rows)
+        n_cols = len(rows[0]) if n_rows else 0
+        if any(len(row) != n_cols for row in rows):
+            raise ValueError("Goal map rows must all have the same length")
+        get = TOKEN_CODES.get
+        codes = np.fromiter(
+            (get(token, INVALID) for row in rows for token in row),
+            dtype=np.uint8,
+            count=n_rows * n_cols,
+        )
+        return cls(codes.reshape(n_rows, n_cols))
+
+    @classmethod
+    def from_goal_map(cls, goal_map: dict) -> "Grid":
+        """Build a grid from a goal map response (or a saved `classified` snapshot)."""
+        rows = goal_map.get("goal")
+        if rows is None:
+            rows = goal_map.get("classified", [])
+        return cls.from_tokens(rows)
+
+    @classmethod
+    def from_objects(cls, objects: Iterable[AstralObject], shape: Tuple[int, int]) -> "Grid":
+        """Build a grid of `shape` from model objects."""
+        grid = cls.empty(*shape)
+        for obj in objects:
+            grid.codes[obj.position.row, obj.position.column] = code_for_object(obj)
+        return grid
+
+    @classmethod
+    def from_current_map(cls, current_map: dict) -> "Grid":
+        """
+        Build a grid from the response of `MegaverseAPI.get_current_map`.
+
+        Cells are null or {"type": 0|1|2, "color"?: str, "direction"?: str}.
+        """
+        content = current_map.get("map", {}).get("content", [])
+        grid = cls.empty(len(content), len(content[0]) if content else 0)
+        code_for = VOCABULARY.code_for_map_cell
+        for row_idx, row in enumerate(content):
+            for col_idx, cell in enumerate(row):
+                if cell:
+                    grid.codes[row_idx, col_idx] = code_for(cell)
+        return grid
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.codes.shape
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, Grid):
+            return NotImplemented
+        return np.array_equal(self.codes, other.codes)
+
+    def __repr__(self) -> str:
+        return f"Grid(shape={self.shape}, objects={self.count()})"
+
+    def _object_codes(self) -> np.ndarray:
+        """Codes with INVALID cells treated as empty."""
+        return np.where(self.codes == INVALID, SPACE, self.codes)
+
+    def count(self) -> int:
+        """Number of cells holding a valid object."""
+        return int(np.count_nonzero(self._object_codes()))
+
+    def to_tokens(self) -> List[List[str]]:
+        """Convert back to the nested token list used by the API (INVALID becomes SPACE)."""
+        return np.array(TOKENS, dtype=object)[self._object_codes()].tolist()
+
+    def iter_objects(self, origin: Tuple[int, int] = (0, 0)) -> Iterator[AstralObject]:
+        """
+        Yield a model object for every non-empty cell in row-major order.
+
+        `origin` is added to every position, for grids that are a window of a
+        larger map.
+        """
+        codes = self._object_codes()
+        rows, columns = np.nonzero(codes)
+        top, left = origin
+        for row, column, code in zip(rows.tolist(), columns.tolist(), codes[rows, columns].tolist()):
+            yield make_object(code, top + row, left + column)
+
+    def to_objects(self) -> List[AstralObject]:
+        return list(self.iter_objects())
+
+    def validate(self) -> np.ndarray:
+        """Return the (N, 2) positions of cells holding tokens outside the vocabulary."""
+        return np.argwhere(self.codes == INVALID)
+
+    @property
+    def is_valid(self) -> bool:
+        return not np.any(self.codes == INVALID)
+
+    def diff(self, current: "Grid") -> GridDiff:
+        """Compare this goal grid against the `current` grid cell by cell."""
+        if self.shape != current.shape:
+            raise ValueError(f"Cannot diff grids of shape {self.shape} and {current.shape}")
+        goal = self._object_codes()
+        actual = current._object_codes()
+        goal_set = goal != SPACE
+        actual_set = actual != SPACE
+        return GridDiff(
+            missing=np.argwhere(goal_set & ~actual_set),
+            extraneous=np.argwhere(~goal_set & actual_set),
+            changed=np.argwhere(goal_set & actual_set & (goal != actual)),
+        )
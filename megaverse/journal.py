@@ -0,0 +1,229 @@
+"""
+Crash-safe execution journal.
+
+Every planned API call is written to an append-only journal twice: once as
+"intended" before the call is sent and once as "done" after it succeeds. A
+run that is killed between the two leaves an intended record behind, so
+cleanup can still find objects whose creation was never confirmed and a
+resumed run knows exactly which operations are left.
+
+Each record is one JSON line holding the object fields in the same format as
+`parse_goal_map`, plus bookkeeping fields and a CRC32 checksum:
+
+{"row": 1, "column": 0, "type": "SOLOON", "color": "red",
+ "op": "create", "state": "done", "plan": "3f2a...", "seq": 7, "crc": "1c291ca3"}
+
+Lines without a checksum are read as completed creates, which keeps logs
+written by earlier versions of the scripts readable.
+"""
+
+import json
+import os
+import threading
+import time
+import uuid
+import zlib
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Iterable, List, Optional, Tuple
+
+INTENDED = "intended"
+DONE = "done"
+BOOKKEEPING_FIELDS = ("op", "state", "plan", "seq", "crc")
+
+def new_plan_id() -> str:
+    return uuid.uuid4().hex
+
+def _checksum(record: dict) -> str:
+    body = json.dumps(record, sort_keys=True, separators=(",", ":"))
+    return f"{zlib.crc32(body.encode()):08x}"
+
+def encode_record(record: dict) -> str:
+    """Serialize a record as a checksummed JSON line."""
+    record = {key: value for key, value in record.items() if key != "crc"}
+    record["crc"] = _checksum(record)
+    return json.dumps(record) + "\n"
+
+def decode_record(line: str) -> Optional[dict]:
+    """
+    Parse one journal line.
+
+    Returns None for blank, torn or corrupted lines. Legacy lines without a
+    checksum are returned as completed creates.
+    """
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        record = json.loads(line)
+    except json.JSONDecodeError:
+        return None
+    if not isinstance(record, dict):
+        return None
+    if "crc" not in record:
+        record.setdefault("op", "create")
+        record.setdefault("state", DONE)
+        return record
+    crc = record.pop("crc")
+    if crc != _checksum(record):
+        return None
+    return record
+
+def object_fields(record: dict) -> dict:
+    """Strip the bookkeeping fields from a record, leaving the object dict."""
+    return {key: value for key, value in record.items() if key not in BOOKKEEPING_FIELDS}
+
+def _cell(record: dict) -> Tuple[int, int]:
+    return record["row"], record["column"]
+
+@dataclass
+class JournalState:
+    """
+    The outcome of replaying a journal.
+
+    - live: objects whose creation completed and which were not deleted since
+    - pending: operations recorded as intended but never completed, in order
+    - corrupt: number of lines skipped because they were torn or corrupted
+    """
+    live: "OrderedDict[Tuple[int, int], dict]" = field(default_factory=OrderedDict)
+    pending: "OrderedDict[Tuple[str, int, int], dict]" = field(default_factory=OrderedDict)
+    last_plan: Optional[str] = None
+    corrupt: int = 0
+
+    def pending_creates(self) -> List[dict]:
+        return [record for record in self.pending.values() if record["op"] == "create"]
+
+    def pending_for_plan(self, plan_id: Optional[str]) -> List[dict]:
+        return [record for record in self.pending.values() if record.get("plan") == plan_id]
+
+    def cleanup_targets(self) -> List[dict]:
+        """
+        Objects that may exist on the map: completed creates plus creates that
+        were sent but never confirmed.
+        """
+        targets = OrderedDict((cell, object_fields(record)) for cell, record in self.live.items())
+        for record in self.pending_creates():
+            targets.setdefault(_cell(record), object_fields(record))
+        return list(targets.values())
+
+class Journal:
+    """
+    Append-only, buffered journal file.
+
+    Records are written through a large userspace buffer. `flush` hands them
+    to the OS (which survives the process being killed); an fsync (which
+    survives a power loss) is issued every `fsync_every` records or
+    `fsync_interval` seconds, whichever comes first, and on close.
+    """
+
+    DEFAULT_PATH = "challenge2_created.log"
+    BUFFER_SIZE = 64 * 1024
+
+    def __init__(
+        self,
+        path: str = DEFAULT_PATH,
+        fsync_every: int = 100,
+        fsync_interval: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.path = path
+        self.fsync_every = fsync_every
+        self.fsync_interval = fsync_interval
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._file = open(path, "a", buffering=self.BUFFER_SIZE)
+        self._unsynced = 0
+        self._last_sync = clock()
+        self._seq = 0
+
+    def __enter__(self) -> "Journal":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def record(self, op: str, obj: dict, state: str, plan_id: Optional[str] = None) -> None:
+        """Append a record for operation `op` ("create"/"delete") on object dict `obj`."""
+        with self._lock:
+            self._seq += 1
+            record = {**obj, "op": op, "state": state, "plan": plan_id, "seq": self._seq}
+            self._file.write(encode_record(record))
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_every or self._clock() - self._last_sync >= self.fsync_interval:
+                self._sync()
+
+    def intend(self, op: str, obj: dict, plan_id: Optional[str] = None) -> None:
+        self.record(op, obj, INTENDED, plan_id)
+
+    def complete(self, op: str, obj: dict, plan_id: Optional[str] = None) -> None:
+        self.record(op, obj, DONE, plan_id)
+
+    def flush(self) -> None:
+        """Hand buffered records to the OS without forcing them to disk."""
+        with self._lock:
+            self._file.flush()
+
+    def _sync(self) -> None:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = self._clock()
+
+    def sync(self) -> None:
+        """Force all buffered records to disk."""
+        with self._lock:
+            self._sync()
+
+    def close(self) -> None:
+        with self._lock:
+            if not self._file.closed:
+                self._sync()
+                self._file.close()
+
+    @staticmethod
+    def replay(path: str = DEFAULT_PATH) -> JournalState:
+        """Rebuild the state of the megaverse as recorded by a journal file."""
+        state = JournalState()
+        try:
+            f = open(path)
+        except FileNotFoundError:
+            return state
+        with f:
+            for line in f:
+                record = decode_record(line)
+                if record is None:
+                    if line.strip():
+                        state.corrupt += 1
+                    continue
+                op, cell = record.get("op"), _cell(record)
+                if record.get("plan"):
+                    state.last_plan = record["plan"]
+                key = (op, *cell)
+                if record.get("state") == INTENDED:
+                    state.pending[key] = record
+                    continue
+                state.pending.pop(key, None)
+                if op == "create":
+                    state.live.pop(cell, None)
+                    state.live[cell] = record
+                elif op == "delete":
+                    state.live.pop(cell, None)
+                    # Whatever an unconfirmed create left on the cell is gone now
+                    state.pending.pop(("create", *cell), None)
+        return state
+
+    @staticmethod
+    def compact(path: str, objects: Iterable[dict], plan_id: Optional[str] = None) -> None:
+        """
+        Atomically replace the journal with one completed create per object.
+
+        Used once a run no longer needs the history, e.g. after cleanup, so the
+        journal only describes what is still on the map.
+        """
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            for seq, obj in enumerate(objects, 1):
+                f.write(encode_record({**object_fields(obj), "op": "create", "state": DONE, "plan": plan_id, "seq": seq}))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
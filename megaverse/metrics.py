@@ -0,0 +1,181 @@
+"""
+Per-request instrumentation for the Megaverse clients.
+
+`MegaverseAPI` reports every call, after retries, to its observers as a
+`RequestEvent`. An observer is any object with an `on_request(event)` method.
+`MetricsCollector` is the built-in one: it aggregates the events into
+counters and latency histograms and exports them as JSON or in the Prometheus
+text exposition format.
+"""
+
+import json
+import threading
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+# Upper bounds in seconds of the latency histogram buckets
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+@dataclass(frozen=True, slots=True)
+class RequestEvent:
+    """
+    One logical API call as seen by the client.
+
+    `duration` covers every attempt including backoff and rate-limiter
+    waits, and `status` is that of the last attempt (None if no response
+    was received). `error` holds the exception name when the call failed.
+    """
+    method: str
+    endpoint: str
+    status: Optional[int]
+    duration: float
+    attempts: int
+    bytes_sent: int
+    bytes_received: int
+    error: Optional[str] = None
+
+    @property
+    def retries(self) -> int:
+        return max(0, self.attempts - 1)
+
+class RequestObserver(Protocol):
+    def on_request(self, event: RequestEvent) -> None: ...
+
+@dataclass
+class _Series:
+    """Aggregates for one (method, endpoint) pair."""
+    buckets: List[int]
+    count: int = 0
+    errors: int = 0
+    retries: int = 0
+    duration_sum: float = 0.0
+    bytes_sent: int = 0
+    bytes_received: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+
+class MetricsCollector:
+    """Thread-safe in-memory aggregator of request events."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, str], _Series] = {}
+        self._lock = threading.Lock()
+
+    def on_request(self, event: RequestEvent) -> None:
+        key = (event.method, event.endpoint)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # One slot per bucket plus the +Inf overflow
+                series = self._series[key] = _Series(buckets=[0] * (len(self.buckets) + 1))
+            series.count += 1
+            series.buckets[bisect_left(self.buckets, event.duration)] += 1
+            series.duration_sum += event.duration
+            series.retries += event.retries
+            series.bytes_sent += event.bytes_sent
+            series.bytes_received += event.bytes_received
+            if event.error is not None:
+                series.errors += 1
+            status = str(event.status) if event.status is not None else "none"
+            series.statuses[status] = series.statuses.get(status, 0) + 1
+
+    def reset(self) -> None:
+        with self._lock:
+            self._series.clear()
+
+    def _quantile(self, series: _Series, q: float) -> Optional[float]:
+        """Upper bound of the bucket holding the q-quantile (None past the last bucket)."""
+        if not series.count:
+            return None
+        rank = q * series.count
+        seen = 0
+        for bound, count in zip(self.buckets, series.buckets):
+            seen += count
+            if seen >= rank:
+                return bound
+        return None
+
+    def snapshot(self) -> dict:
+        """All aggregates as plain data, keyed by "METHOD endpoint"."""
+        with self._lock:
+            endpoints = {}
+            for (method, endpoint), series in sorted(self._series.items()):
+                endpoints[f"{method} {endpoint}"] = {
+                    "method": method,
+                    "endpoint": endpoint,
+                    "requests": series.count,
+                    "errors": series.errors,
+                    "retries": series.retries,
+                    "statuses": dict(series.statuses),
+                    "bytes_sent": series.bytes_sent,
+                    "bytes_received": series.bytes_received,
+                    "duration_sum": round(series.duration_sum, 6),
+                    "duration_mean": round(series.duration_sum / series.count, 6) if series.count else None,
+                    "duration_p50_le": self._quantile(series, 0.50),
+                    "duration_p95_le": self._quantile(series, 0.95),
+                    "duration_p99_le": self._quantile(series, 0.99),
+                    "histogram": {
+                        **{f"{bound:g}": count for bound, count in zip(self.buckets, series.buckets)},
+                        "+Inf": series.buckets[-1],
+                    },
+                }
+            return {
+                "requests": sum(s["requests"] for s in endpoints.values()),
+                "errors": sum(s["errors"] for s in endpoints.values()),
+                "retries": sum(s["retries"] for s in endpoints.values()),
+                "endpoints": endpoints,
+            }
+
+    def to_json(self, indent: Optional[int] = 2) -> str:
+        return json.dumps(self.snapshot(), indent=indent)
+
+    def to_prometheus(self, prefix: str = "megaverse") -> str:
+        """Export the aggregates in the Prometheus text exposition format."""
+        with self._lock:
+            items = sorted(self._series.items())
+            lines = []
+
+            def metric(name, kind, help_text, samples):
+                lines.append(f"# HELP {prefix}_{name} {help_text}")
+                lines.append(f"# TYPE {prefix}_{name} {kind}")
+                lines.extend(f"{prefix}_{sample}" for sample in samples)
+
+            def labels(method, endpoint, **extra):
+                pairs = {"method": method, "endpoint": endpoint, **extra}
+                return "{" + ",".join(f'{key}="{value}"' for key, value in pairs.items()) + "}"
+
+            metric("requests_total", "counter", "API calls by final status.", [
+                f"requests_total{labels(m, e, status=status)} {count}"
+                for (m, e), s in items for status, count in sorted(s.statuses.items())
+            ])
+            metric("request_errors_total", "counter", "API calls that raised.", [
+                f"request_errors_total{labels(m, e)} {s.errors}" for (m, e), s in items
+            ])
+            metric("request_retries_total", "counter", "Retried attempts.", [
+                f"request_retries_total{labels(m, e)} {s.retries}" for (m, e), s in items
+            ])
+            metric("request_sent_bytes_total", "counter", "Request body bytes sent.", [
+                f"request_sent_bytes_total{labels(m, e)} {s.bytes_sent}" for (m, e), s in items
+            ])
+            metric("request_received_bytes_total", "counter", "Response body bytes received.", [
+                f"request_received_bytes_total{labels(m, e)} {s.bytes_received}" for (m, e), s in items
+            ])
+
+            samples = []
+            for (m, e), s in items:
+                cumulative = 0
+                for bound, count in zip(self.buckets, s.buckets):
+                    cumulative += count
+                    samples.append(f"request_duration_seconds_bucket{labels(m, e, le=f'{bound:g}')} {cumulative}")
+                samples.append(f"request_duration_seconds_bucket{labels(m, e, le='+Inf')} {s.count}")
+                samples.append(f"request_duration_seconds_sum{labels(m, e)} {s.duration_sum:.6f}")
+                samples.append(f"request_duration_seconds_count{labels(m, e)} {s.count}")
+            metric("request_duration_seconds", "histogram", "API call latency including retries.", samples)
+            return "\n".join(lines) + "\n"
+
+    def write(self, path: str) -> None:
+        """Write the metrics to `path`: Prometheus text for *.prom, JSON otherwise."""
+        content = self.to_prometheus() if path.endswith(".prom") else self.to_json()
+        with open(path, "w") as f:
+            f.write(content)
@@ -1,28 +1,45 @@
 from dataclasses import dataclass
-from typing import Optional, Literal
+from enum import Enum
+from typing import ClassVar, Optional
 
-@dataclass
+class Color(str, Enum):
+    BLUE = "blue"
+    RED = "red"
+    PURPLE = "purple"
+    WHITE = "white"
+
+    def __str__(self) -> str:
+        return self.value
+
+class Direction(str, Enum):
+    UP = "up"
+    DOWN = "down"
+    LEFT = "left"
+    RIGHT = "right"
+
+    def __str__(self) -> str:
+        return self.value
+
+@dataclass(frozen=True, slots=True, order=True)
 class Position:
     row: int
     column: int
 
-@dataclass
-class Polyanet:
-    position: Position
-
-@dataclass
-class Soloon:
-    position: Position
-    color: str
+# Astral objects are immutable value types: two objects are equal when they
+# have the same type, position and attributes, so they can be used as set
+# members and dict keys when diffing or deduplicating plans.
+#
+# Slotted dataclasses are re-created by the decorator, which breaks the
+# zero-argument form of super(); parent methods are called explicitly.
 
-@dataclass
-class Cometh:
+@dataclass(frozen=True, slots=True)
+class AstralObject:
     position: Position
-    direction: str
+    type: ClassVar[Optional[str]] = None
 
-class AstralObject:
-    def __init__(self, position: Position):
-        self.position = position
+    def to_dict(self) -> dict:
+        """Return the object in the dict format produced by `parse_goal_map`."""
+        return {"row": self.position.row, "column": self.position.column, "type": self.type}
 
     def to_api_payload(self, candidate_id: str) -> dict:
         return {
@@ -31,26 +48,50 @@ class AstralObject:
             "candidateId": candidate_id
         }
 
+@dataclass(frozen=True, slots=True)
 class PolyanetObject(AstralObject):
-    def to_api_payload(self, candidate_id: str) -> dict:
-        return super().to_api_payload(candidate_id)
+    type: ClassVar[str] = "POLYANET"
 
+@dataclass(frozen=True, slots=True)
 class SoloonObject(AstralObject):
-    def __init__(self, position: Position, color: Literal["blue", "red", "purple", "white"]):
-        super().__init__(position)
-        self.color = color
+    color: Color
+    type: ClassVar[str] = "SOLOON"
+
+    def __post_init__(self):
+        # Intern the color so every SOLoon shares one enum member
+        object.__setattr__(self, "color", Color(self.color))
 
     def to_api_payload(self, candidate_id: str) -> dict:
-        payload = super().to_api_payload(candidate_id)
-        payload["color"] = self.color
+        payload = AstralObject.to_api_payload(self, candidate_id)
+        payload["color"] = self.color.value
         return payload
 
+    def to_dict(self) -> dict:
+        obj = AstralObject.to_dict(self)
+        obj["color"] = self.color.value
+        return obj
+
+@dataclass(frozen=True, slots=True)
 class ComethObject(AstralObject):
-    def __init__(self, position: Position, direction: Literal["up", "down", "left", "right"]):
-        super().__init__(position)
-        self.direction = direction
+    direction: Direction
+    type: ClassVar[str] = "COMETH"
+
+    def __post_init__(self):
+        # Intern the direction so every ComETH shares one enum member
+        object.__setattr__(self, "direction", Direction(self.direction))
 
     def to_api_payload(self, candidate_id: str) -> dict:
-        payload = super().to_api_payload(candidate_id)
-        payload["direction"] = self.direction
-        return payload 
\ No newline at end of file
+        payload = AstralObject.to_api_payload(self, candidate_id)
+        payload["direction"] = self.direction.value
+        return payload
+
+    def to_dict(self) -> dict:
+        obj = AstralObject.to_dict(self)
+        obj["direction"] = self.direction.value
+        return obj
+
+def object_from_dict(obj: dict) -> AstralObject:
+    """Build a model object from the dict format produced by `parse_goal_map`."""
+    # The vocabulary imports this module, so it is imported on first use
+    from .vocabulary import VOCABULARY
+    return VOCABULARY.object_from_dict(obj)
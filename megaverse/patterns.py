@@ -1,5 +1,132 @@
-from typing import List, Dict, Tuple
-from .models import Position, PolyanetObject, SoloonObject, ComethObject, AstralObject
+"""
+Pattern generation.
+
+Shapes are boolean NumPy masks built by broadcasting row and column index
+vectors, so generating a pattern costs a few array operations however large
+the grid is. A `Pattern` paints masks onto a `Grid` layer by layer (later
+layers win) and hands back either the grid or a stream of model objects:
+
+    pattern = Pattern(101, 101)
+    pattern.add(border_mask(pattern.shape), "BLUE_SOLOON")
+    pattern.add(x_mask(pattern.shape, distances=range(5, 45)), "POLYANET")
+    grid = pattern.to_grid()
+"""
+
+import json
+import os
+import threading
+from typing import Iterable, Iterator, List, Dict, Optional, Sequence, Tuple, Union
+import numpy as np
+from . import snapshot
+from .api import MegaverseAPI
+from .grid import Grid, SPACE, TOKEN_CODES
+from .models import AstralObject
+
+Shape = Tuple[int, int]
+
+def _indices(shape: Shape) -> Tuple[np.ndarray, np.ndarray]:
+    rows, columns = shape
+    return np.arange(rows)[:, None], np.arange(columns)[None, :]
+
+def _center(shape: Shape, center: Optional[Tuple[int, int]]) -> Tuple[int, int]:
+    return center if center is not None else (shape[0] // 2, shape[1] // 2)
+
+def _within(distance: np.ndarray, distances: Optional[Iterable[int]]) -> np.ndarray:
+    if distances is None:
+        return np.ones(distance.shape, dtype=bool)
+    return np.isin(distance, np.fromiter(distances, dtype=np.int64))
+
+def x_mask(shape: Shape, distances: Optional[Iterable[int]] = None, center: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """Both diagonals through `center`, limited to the given distances from it (0 is the center)."""
+    rows, columns = _indices(shape)
+    center_row, center_column = _center(shape, center)
+    row_offset, column_offset = np.abs(rows - center_row), np.abs(columns - center_column)
+    return (row_offset == column_offset) & _within(row_offset, distances)
+
+def plus_mask(shape: Shape, distances: Optional[Iterable[int]] = None, center: Optional[Tuple[int, int]] = None) -> np.ndarray:
+    """The row and column through `center`, limited to the given distances from it."""
+    rows, columns = _indices(shape)
+    center_row, center_column = _center(shape, center)
+    row_offset, column_offset = np.abs(rows - center_row), np.abs(columns - center_column)
+    on_row = (row_offset == 0) & _within(column_offset, distances)
+    on_column = (column_offset == 0) & _within(row_offset, distances)
+    return on_row | on_column
+
+def border_mask(shape: Shape, width: int = 1) -> np.ndarray:
+    """The cells within `width` of the grid's edge."""
+    rows, columns = _indices(shape)
+    return (
+        (rows < width) | (rows >= shape[0] - width)
+        | (columns < width) | (columns >= shape[1] - width)
+    )
+
+def fill_mask(shape: Shape) -> np.ndarray:
+    return np.ones(shape, dtype=bool)
+
+def rect_mask(shape: Shape, top: int, left: int, bottom: int, right: int, filled: bool = True) -> np.ndarray:
+    """The rectangle from (top, left) to (bottom, right), inclusive; only its outline unless `filled`."""
+    rows, columns = _indices(shape)
+    inside = (rows >= top) & (rows <= bottom) & (columns >= left) & (columns <= right)
+    if filled:
+        return inside
+    return inside & ((rows == top) | (rows == bottom) | (columns == left) | (columns == right))
+
+def bitmap_mask(shape: Shape, stencil: Union[np.ndarray, Sequence[str]], top: int = 0, left: int = 0) -> np.ndarray:
+    """
+    Place a stencil with its top-left corner at (top, left), clipped to the grid.
+
+    The stencil is a 2D array of truthy cells or a list of strings where any
+    character other than " " and "." is set, e.g. ["#.#", ".#.", "#.#"].
+    """
+    if len(stencil) and isinstance(stencil[0], str):
+        stencil = np.array([[char not in " ." for char in line] for line in stencil], dtype=bool)
+    stencil = np.asarray(stencil, dtype=bool)
+    mask = np.zeros(shape, dtype=bool)
+    row_start, column_start = max(top, 0), max(left, 0)
+    row_stop = min(top + stencil.shape[0], shape[0])
+    column_stop = min(left + stencil.shape[1], shape[1])
+    if row_start < row_stop and column_start < column_stop:
+        mask[row_start:row_stop, column_start:column_stop] = stencil[
+            row_start - top:row_stop - top, column_start - left:column_stop - left
+        ]
+    return mask
+
+class Pattern:
+    """A grid built by painting shape masks with goal tokens, later layers on top."""
+
+    def __init__(self, rows: int, columns: int):
+        self.shape = (rows, columns)
+        self._grid = Grid.empty(rows, columns)
+
+    def add(self, mask: np.ndarray, token: str = "POLYANET") -> "Pattern":
+        """Paint the cells of `mask` with `token` (e.g. "POLYANET", "RED_SOLOON")."""
+        if token not in TOKEN_CODES:
+            raise ValueError(f"Unknown token: {token}")
+        self._grid.codes[self._check(mask)] = TOKEN_CODES[token]
+        return self
+
+    def erase(self, mask: np.ndarray) -> "Pattern":
+        """Clear the cells of `mask`."""
+        self._grid.codes[self._check(mask)] = SPACE
+        return self
+
+    def _check(self, mask: np.ndarray) -> np.ndarray:
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != self.shape:
+            raise ValueError(f"Mask shape {mask.shape} does not match pattern shape {self.shape}")
+        return mask
+
+    def to_grid(self) -> Grid:
+        return Grid(self._grid.codes.copy())
+
+    def iter_objects(self) -> Iterator[AstralObject]:
+        """Yield the pattern's objects in row-major order."""
+        return self._grid.iter_objects()
+
+LogoSource = Union[MegaverseAPI, str, os.PathLike, dict, Grid]
+
+_logo_cache: Dict[tuple, Grid] = {}
+_logo_lock = threading.Lock()
 
 class PatternGenerator:
     @staticmethod
@@ -12,54 +139,69 @@ class PatternGenerator:
         if size % 2 == 0:
             raise ValueError("Size must be odd to create a centered cross")
 
-        center = size // 2
-        objects = []
-
-        # Define the distances from center for each arm of the X
-        distances = [2, 3, 4]  # This creates the correct X pattern
-
-        # Create POLYanets for each distance
-        for dist in distances:
-            # Top-left to bottom-right diagonal
-            objects.append(PolyanetObject(Position(center - dist, center - dist)))  # Top-left
-            objects.append(PolyanetObject(Position(center + dist, center + dist)))  # Bottom-right
-
-            # Top-right to bottom-left diagonal
-            objects.append(PolyanetObject(Position(center - dist, center + dist)))  # Top-right
-            objects.append(PolyanetObject(Position(center + dist, center - dist)))  # Bottom-left
-
-        # Add the center point
-        objects.append(PolyanetObject(Position(center, center)))
-
-        return objects
+        # The center point plus these distances along each arm of the X
+        distances = [0, 2, 3, 4]  # This creates the correct X pattern
+        pattern = Pattern(size, size).add(x_mask((size, size), distances))
+        return list(pattern.iter_objects())
 
     @staticmethod
-    def generate_logo() -> List[AstralObject]:
+    def generate_logo(source: Optional[LogoSource] = None, refresh: bool = False) -> List[AstralObject]:
         """
         Generate the Crossmint logo pattern.
         This pattern includes POLYanets, SOLoons, and ComETHs.
+
+        Args:
+            source: Where the goal map comes from: a client with `get_goal_map`
+                (e.g. MegaverseAPI), the path of a saved goal map JSON, a goal
+                map dict or an already parsed Grid. Defaults to a MegaverseAPI
+                configured from the environment.
+            refresh: Ignore the memoized goal for this source
+
+        Goal maps fetched through a client are memoized per candidate and
+        saved files per path and modification time, so batch jobs only pay for
+        the first round trip.
         """
-        objects = []
-
-        # First, let's get the goal map to understand the pattern
-        api = MegaverseAPI()
-        goal_map = api.get_goal_map()
-
-        # Parse the goal map and create objects accordingly
-        for row_idx, row in enumerate(goal_map.get("goal", [])):
-            for col_idx, cell in enumerate(row):
-                if cell is None:
-                    continue
-
-                position = Position(row_idx, col_idx)
-                
-                if cell == "POLYANET":
-                    objects.append(PolyanetObject(position))
-                elif cell.startswith("SOLOON"):
-                    color = cell.split("_")[1].lower()
-                    objects.append(SoloonObject(position, color))
-                elif cell.startswith("COMETH"):
-                    direction = cell.split("_")[1].lower()
-                    objects.append(ComethObject(position, direction))
-
-        return objects 
\ No newline at end of file
+        return list(_logo_grid(source, refresh).iter_objects())
+
+    @staticmethod
+    def clear_logo_cache() -> None:
+        with _logo_lock:
+            _logo_cache.clear()
+
+def _logo_grid(source: Optional[LogoSource], refresh: bool) -> Grid:
+    """Resolve a logo source to a goal Grid, through the memo where it has a stable key."""
+    if isinstance(source, Grid):
+        return source
+    if isinstance(source, dict):
+        return Grid.from_goal_map(source)
+
+    if source is None:
+        # Same key as a client for the configured candidate; the client is only
+        # created, and closed again, when the memo has to be filled
+        key = ("candidate", os.getenv("CANDIDATE_ID"))
+
+        def load() -> Grid:
+            with MegaverseAPI() as api:
+                return Grid.from_goal_map(api.get_goal_map())
+    elif isinstance(source, (str, os.PathLike)):
+        path = os.path.abspath(source)
+        key = ("file", path, os.path.getmtime(path))
+
+        def load() -> Grid:
+            if path.endswith(snapshot.SUFFIX):
+                return snapshot.load(path).to_grid()
+            with open(path) as f:
+                return Grid.from_goal_map(json.load(f))
+    else:
+        key = ("candidate", source.candidate_id)
+
+        def load() -> Grid:
+            return Grid.from_goal_map(source.get_goal_map())
+
+    with _logo_lock:
+        grid = None if refresh else _logo_cache.get(key)
+    if grid is None:
+        grid = load()
+        with _logo_lock:
+            _logo_cache[key] = grid
+    return grid
@@ -0,0 +1,74 @@
+"""
+Planning stage between goal parsing and execution.
+
+Operations straight from the parser or the reconciler are in row-major order,
+interleave the three endpoints and may touch the same cell more than once.
+The planner turns them into an ordered list of batches:
+
+- duplicate operations on a cell collapse into one (the last create wins,
+  like a write to the map would)
+- every delete comes before every create, so a cell holding the wrong object
+  is cleared before its replacement is sent
+- within each phase, operations are grouped by endpoint and kept in
+  row-major order
+- each batch holds at most `batch_size` operations, normally the number of
+  calls the executor keeps in flight
+"""
+
+import sys
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Tuple
+from .api import CREATE, DELETE, ENDPOINTS
+from .models import Position
+from .reconcile import Operation
+
+@dataclass(frozen=True, slots=True)
+class Batch:
+    """Operations with the same action and endpoint that can run concurrently."""
+    action: str
+    endpoint: str
+    operations: Tuple[Operation, ...]
+
+    def __len__(self) -> int:
+        return len(self.operations)
+
+def dedupe(operations: Iterable[Operation]) -> Tuple[List[Operation], List[Operation]]:
+    """
+    Split operations into (deletes, creates) with at most one of each per cell.
+
+    A later create on a cell replaces an earlier one; a delete is kept once.
+    """
+    deletes: Dict[Position, Operation] = {}
+    creates: Dict[Position, Operation] = {}
+    for operation in operations:
+        if operation.action == DELETE:
+            deletes.setdefault(operation.position, operation)
+        elif operation.action == CREATE:
+            creates.pop(operation.position, None)
+            creates[operation.position] = operation
+        else:
+            raise ValueError(f"Unknown operation: {operation.action}")
+    return list(deletes.values()), list(creates.values())
+
+def _batches(action: str, operations: List[Operation], batch_size: int) -> Iterator[Batch]:
+    by_endpoint: Dict[str, List[Operation]] = {endpoint: [] for endpoint in ENDPOINTS.values()}
+    for operation in operations:
+        model = type(operation.object)
+        if model not in ENDPOINTS:
+            raise NotImplementedError(f"No endpoint for {model.__name__}")
+        by_endpoint[ENDPOINTS[model]].append(operation)
+    for endpoint, group in by_endpoint.items():
+        group.sort(key=lambda operation: operation.position)
+        for start in range(0, len(group), batch_size):
+            yield Batch(action, endpoint, tuple(group[start:start + batch_size]))
+
+def plan_batches(operations: Iterable[Operation], batch_size: int = 1) -> List[Batch]:
+    """Dedupe and order operations into batches of at most `batch_size`."""
+    if batch_size < 1:
+        raise ValueError("Batch size must be at least 1")
+    deletes, creates = dedupe(operations)
+    return list(_batches(DELETE, deletes, batch_size)) + list(_batches(CREATE, creates, batch_size))
+
+def plan_operations(operations: Iterable[Operation]) -> List[Operation]:
+    """The planned operations as one flat list, in execution order."""
+    return [operation for batch in plan_batches(operations, sys.maxsize) for operation in batch.operations]
@@ -0,0 +1,109 @@
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Convert a Retry-After header into a delay in seconds.
+
+    The header may hold either a number of seconds or an HTTP date.
+    Returns None when the header is missing or cannot be parsed.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class TokenBucket:
+    """
+    Thread-safe adaptive token bucket shared by every call of a client.
+
+    Tokens refill at `rate` per second up to `capacity`. Each sustained run of
+    `success_threshold` successful calls raises the rate by `increase_step`
+    (up to `max_rate`); an HTTP 429 multiplies it by `backoff_factor` (down to
+    `min_rate`), drains the bucket and, when the server sends Retry-After,
+    pauses all callers until that deadline has passed.
+    """
+
+    def __init__(
+        self,
+        rate: float = 2.0,
+        capacity: float = 5.0,
+        min_rate: float = 0.5,
+        max_rate: float = 20.0,
+        increase_step: float = 0.5,
+        success_threshold: int = 10,
+        backoff_factor: float = 0.5,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if not 0 < min_rate <= rate <= max_rate:
+            raise ValueError("Rates must satisfy 0 < min_rate <= rate <= max_rate")
+        if capacity < 1:
+            raise ValueError("Capacity must be at least one token")
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.increase_step = increase_step
+        self.success_threshold = success_threshold
+        self.backoff_factor = backoff_factor
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._tokens = capacity
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._successes = 0
+
+    def _refill(self, now: float) -> None:
+        elapsed = max(0.0, now - self._updated)
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def acquire(self) -> None:
+        """Block until a token is available, then consume it."""
+        while True:
+            with self._lock:
+                now = self._clock()
+                self._refill(now)
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                else:
+                    wait = (1 - self._tokens) / self.rate
+            self._sleep(wait)
+
+    def on_success(self) -> None:
+        """Record a successful call and speed up after a sustained run of them."""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.success_threshold:
+                self._refill(self._clock())
+                self.rate = min(self.max_rate, self.rate + self.increase_step)
+                self._successes = 0
+
+    def on_throttle(self, retry_after: Optional[float] = None) -> None:
+        """Record an HTTP 429: slow down and honor the server's Retry-After."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            self.rate = max(self.min_rate, self.rate * self.backoff_factor)
+            self._tokens = 0.0
+            self._successes = 0
+            if retry_after is not None:
+                self._paused_until = max(self._paused_until, now + retry_after)
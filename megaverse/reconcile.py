@@ -0,0 +1,101 @@
+"""
+Reconciliation between the goal map and the current megaverse.
+
+Rather than creating every object in the goal, the reconciler compares the
+goal with what is already on the map and plans only the calls needed to close
+the gap:
+- create for cells that are empty but should hold an object
+- delete for cells that hold an object the goal does not want
+- delete + create for cells whose object has the wrong type, color or direction
+
+Objects are the hashable model objects from `megaverse.models`, so a plan is
+the difference of two sets: goal - current are creates, current - goal are
+deletes, and a wrong object shows up in both.
+"""
+
+from dataclasses import dataclass
+from typing import Iterable, List
+from .api import CREATE, DELETE
+from .grid import Grid, make_object
+from .models import AstralObject, Position
+from .vocabulary import INVALID, SPACE, VOCABULARY
+
+@dataclass(frozen=True, slots=True)
+class Operation:
+    """A single planned API call: `action` is CREATE or DELETE."""
+    action: str
+    object: AstralObject
+
+    @property
+    def position(self) -> Position:
+        return self.object.position
+
+def parse_current_map(current_map: dict) -> List[AstralObject]:
+    """
+    Convert the response of `MegaverseAPI.get_current_map` into model objects.
+
+    The endpoint returns {"map": {"content": [[cell, ...], ...]}} where each
+    cell is null or {"type": 0|1|2, "color"?: str, "direction"?: str}.
+    """
+    objects = []
+    content = current_map.get("map", {}).get("content", [])
+    code_for = VOCABULARY.code_for_map_cell
+    for row_idx, row in enumerate(content):
+        for col_idx, cell in enumerate(row):
+            code = code_for(cell)
+            if code not in (SPACE, INVALID):
+                objects.append(make_object(code, row_idx, col_idx))
+    return objects
+
+def _sorted_by_position(objects: Iterable[AstralObject]) -> List[AstralObject]:
+    return sorted(objects, key=lambda obj: obj.position)
+
+def plan_reconciliation(goal_objects: Iterable[AstralObject], current_objects: Iterable[AstralObject]) -> List[Operation]:
+    """
+    Plan the minimal set of operations that turns the current map into the goal.
+
+    All deletes come first so that a cell holding a wrong object is cleared
+    before its replacement is created; each group is in row-major order.
+    Duplicate objects in either input collapse into a single operation.
+    """
+    goal = set(goal_objects)
+    current = set(current_objects)
+    return (
+        [Operation(DELETE, obj) for obj in _sorted_by_position(current - goal)]
+        + [Operation(CREATE, obj) for obj in _sorted_by_position(goal - current)]
+    )
+
+def plan_grid_reconciliation(goal: Grid, current: Grid) -> List[Operation]:
+    """
+    Vectorized equivalent of `plan_reconciliation` for two grids of the same shape.
+
+    The differing cells are found with a single `Grid.diff`; only those cells
+    are turned into operations, deletes first, each in row-major order.
+    """
+    diff = goal.diff(current)
+    replaced = diff.changed.tolist()
+
+    def operations(action: str, grid: Grid, positions: List[List[int]]) -> List[Operation]:
+        return [
+            Operation(action, make_object(int(grid.codes[row, column]), row, column))
+            for row, column in sorted(positions)
+        ]
+
+    return (
+        operations(DELETE, current, diff.extraneous.tolist() + replaced)
+        + operations(CREATE, goal, diff.missing.tolist() + replaced)
+    )
+
+def apply_operation(api, operation: Operation) -> None:
+    """
+    Execute one planned operation through the API client.
+
+    The client routes the model object by type through its dispatch table, so
+    no per-call branching or second model object is needed here.
+    """
+    if operation.action == CREATE:
+        api.create_astral_object(operation.object)
+    elif operation.action == DELETE:
+        api.delete_astral_object(operation.object)
+    else:
+        raise ValueError(f"Unknown operation: {operation.action}")
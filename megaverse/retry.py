@@ -0,0 +1,85 @@
+import random
+import time
+from typing import Callable, Iterable, Optional, TypeVar
+import requests
+
+T = TypeVar("T")
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+def status_code_of(error: BaseException) -> Optional[int]:
+    """Return the HTTP status code attached to a requests error, if any."""
+    response = getattr(error, "response", None)
+    return getattr(response, "status_code", None)
+
+def is_rate_limited(error: BaseException) -> bool:
+    """True when the error is an HTTP 429 Too Many Requests response."""
+    return status_code_of(error) == 429
+
+class RetryPolicy:
+    """
+    Decide whether a failed request is retried and how long to wait first.
+
+    Retries HTTP 429/5xx responses and connection failures with capped
+    exponential backoff and full jitter: before attempt n+1 the policy sleeps
+    a random delay in [0, min(max_delay, base_delay * 2 ** (n - 1))].
+
+    Retries are idempotency-aware. A 429 or a failed connect means the server
+    never acted on the request, so they are always retried. A 5xx, a read
+    timeout or a reset connection may have been applied already, so they are
+    only retried for idempotent requests.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 5,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+        rng: Callable[[], float] = random.random,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if max_attempts < 1:
+            raise ValueError("max_attempts must be at least 1")
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = frozenset(retry_statuses)
+        self._rng = rng
+        self._sleep = sleep
+
+    def is_retryable(self, error: BaseException, idempotent: bool) -> bool:
+        """Whether `error` is worth retrying for a request of this idempotency."""
+        status = status_code_of(error)
+        if status is not None:
+            if status == 429:
+                return True
+            return idempotent and status in self.retry_statuses
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return idempotent
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter delay to wait after failed attempt number `attempt` (1-based)."""
+        cap = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return self._rng() * cap
+
+    def call(self, func: Callable[[], T], idempotent: bool = True) -> T:
+        """
+        Run `func`, retrying retryable failures until `max_attempts` is reached.
+
+        The last error is re-raised once the attempts are exhausted or when
+        the error is not retryable.
+        """
+        attempt = 1
+        while True:
+            try:
+                return func()
+            except Exception as e:
+                if attempt >= self.max_attempts or not self.is_retryable(e, idempotent):
+                    raise
+                self._sleep(self.backoff(attempt))
+                attempt += 1
@@ -0,0 +1,275 @@
+"""
+Compact binary snapshots of goal and current maps.
+
+A snapshot file holds a fixed header, a JSON vocabulary, a JSON metadata
+document and the cell array:
+
+    magic  "MVSN"      4 bytes
+    version            u8
+    encoding           u8   0 = raw (one byte per cell), 1 = run-length
+    kind               u8   0 = goal map, 1 = current map
+    reserved           u8
+    rows, columns      u32, u32
+    vocabulary size    u32  bytes of the vocabulary JSON
+    metadata size      u32  bytes of the metadata JSON
+    payload size       u64
+    crc32              u32  over vocabulary, metadata and payload
+
+The vocabulary lists the distinct cell values exactly as they appear in the
+API JSON (goal tokens, null, or current-map cell objects) and the cells store
+indexes into it, so conversion to and from the API JSON is lossless, unknown
+tokens included. The metadata is the rest of the document with the grid left
+out (e.g. the `_id` and `candidateId` of a current map).
+
+Raw payloads are memory-mapped on load, so opening even a very large
+snapshot costs no more than reading its header.
+"""
+
+import argparse
+import json
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+from .grid import INVALID, TOKEN_CODES, Grid
+from .vocabulary import VOCABULARY
+
+MAGIC = b"MVSN"
+VERSION = 1
+HEADER = struct.Struct("<4sBBBBIIIIQI")
+
+RAW = 0
+RLE = 1
+ENCODINGS = {"raw": RAW, "rle": RLE}
+
+GOAL = 0
+CURRENT = 1
+SUFFIX = ".mvs"
+
+# Run lengths are stored as u32; longer runs are split
+MAX_RUN = 2**32 - 1
+
+@dataclass
+class Snapshot:
+    """
+    A decoded snapshot.
+
+    `cells` holds one vocabulary index per cell; for raw snapshots loaded from
+    disk it is a read-only view of the memory-mapped file.
+    """
+    kind: int
+    cells: np.ndarray
+    vocabulary: List[Any]
+    meta: Dict[str, Any]
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.cells.shape
+
+    def to_json(self) -> dict:
+        """Rebuild the API JSON document the snapshot was made from."""
+        values = np.empty(len(self.vocabulary), dtype=object)
+        values[:] = self.vocabulary
+        # Rows without columns are kept: a (1, 0) map is [[]], not []
+        content = values[self.cells].tolist() if self.cells.size else [[] for _ in range(self.shape[0])]
+        if self.kind == GOAL:
+            key = self.meta.get("grid_key", "goal")
+            return {**{k: v for k, v in self.meta.items() if k != "grid_key"}, key: content}
+        return {**self.meta, "map": {**self.meta.get("map", {}), "content": content}}
+
+    def to_grid(self) -> Grid:
+        """Convert the cells to Grid codes, one vectorized lookup for the whole map."""
+        return Grid(grid_codes(self.kind, self.vocabulary)[self.cells])
+
+def grid_codes(kind: int, vocabulary: List[Any]) -> np.ndarray:
+    """Lookup table from vocabulary index to Grid code."""
+    if kind == GOAL:
+        codes = [TOKEN_CODES.get(str(value), INVALID) for value in vocabulary]
+    else:
+        codes = [VOCABULARY.code_for_map_cell(value) for value in vocabulary]
+    return np.array(codes, dtype=np.uint8)
+
+def _encode_cells(rows: List[list]) -> Tuple[np.ndarray, List[Any]]:
+    """Index every cell into a vocabulary of distinct values, in first-seen order."""
+    index: Dict[str, int] = {}
+    vocabulary: List[Any] = []
+    width = len(rows[0]) if rows else 0
+    cells = np.zeros((len(rows), width), dtype=np.uint8)
+    for r, row in enumerate(rows):
+        if len(row) != width:
+            raise ValueError("Map rows must all have the same length")
+        codes = []
+        for value in row:
+            # Tokens are strings; current-map cells are small dicts or null
+            key = value if isinstance(value, str) else json.dumps(value, sort_keys=True)
+            code = index.get(key)
+            if code is None:
+                if len(vocabulary) == 256:
+                    raise ValueError("Snapshots support at most 256 distinct cell values")
+                code = index[key] = len(vocabulary)
+                vocabulary.append(value)
+            codes.append(code)
+        cells[r] = codes
+    return cells, vocabulary
+
+def from_json(document: dict) -> Snapshot:
+    """Build a snapshot from a goal map (`goal` or `classified`) or a current map response."""
+    if "map" in document:
+        current = document["map"]
+        meta = {**document, "map": {k: v for k, v in current.items() if k != "content"}}
+        cells, vocabulary = _encode_cells(current.get("content") or [])
+        return Snapshot(CURRENT, cells, vocabulary, meta)
+    key = "goal" if "goal" in document else "classified"
+    meta = {k: v for k, v in document.items() if k != key}
+    if key != "goal":
+        meta["grid_key"] = key
+    cells, vocabulary = _encode_cells(document.get(key) or [])
+    return Snapshot(GOAL, cells, vocabulary, meta)
+
+def from_grid(grid: Grid) -> Snapshot:
+    """Build a goal snapshot from a Grid; INVALID cells become "INVALID"."""
+    present = np.flatnonzero(np.bincount(grid.codes.ravel(), minlength=256))
+    tokens = {code: token for token, code in TOKEN_CODES.items() if token not in ("None", None)}
+    vocabulary = [tokens.get(int(code), "INVALID") for code in present]
+    # A uint8 lookup keeps the remap at one byte per cell
+    lookup = np.zeros(256, dtype=np.uint8)
+    lookup[present] = np.arange(len(present))
+    return Snapshot(GOAL, lookup[grid.codes], vocabulary, {})
+
+def _rle(cells: np.ndarray) -> bytes:
+    flat = cells.ravel()
+    if not flat.size:
+        return struct.pack("<Q", 0)
+    starts = np.concatenate(([0], np.flatnonzero(flat[1:] != flat[:-1]) + 1))
+    lengths = np.diff(np.append(starts, flat.size))
+    values = flat[starts]
+    if lengths.max() > MAX_RUN:
+        # Split every long run into full MAX_RUN pieces and a remainder
+        pieces = -(-lengths // MAX_RUN)
+        values = np.repeat(values, pieces)
+        split = np.full(int(pieces.sum()), MAX_RUN, dtype=np.int64)
+        split[np.cumsum(pieces) - 1] = lengths - (pieces - 1) * MAX_RUN
+        lengths = split
+    return struct.pack("<Q", len(values)) + lengths.astype("<u4").tobytes() + values.tobytes()
+
+def rle_runs(payload: memoryview) -> Tuple[np.ndarray, np.ndarray]:
+    """The (lengths, values) arrays of a run-length payload, as views of it."""
+    (runs,) = struct.unpack_from("<Q", payload)
+    lengths = np.frombuffer(payload, dtype="<u4", count=runs, offset=8)
+    values = np.frombuffer(payload, dtype=np.uint8, count=runs, offset=8 + 4 * runs)
+    return lengths, values
+
+def encode(snapshot: Snapshot, encoding: str = "auto") -> bytes:
+    """
+    Serialize a snapshot. `encoding` is "raw", "rle" or "auto" (the smaller one).
+
+    Goal maps are mostly SPACE, so run-length encoding usually wins by a wide
+    margin; "raw" keeps the payload memory-mappable.
+    """
+    raw = np.ascontiguousarray(snapshot.cells, dtype=np.uint8).tobytes()
+    if encoding == "auto":
+        rle = _rle(snapshot.cells)
+        code, payload = (RLE, rle) if len(rle) < len(raw) else (RAW, raw)
+    elif encoding in ENCODINGS:
+        code = ENCODINGS[encoding]
+        payload = raw if code == RAW else _rle(snapshot.cells)
+    else:
+        raise ValueError(f"Unknown encoding: {encoding}")
+    vocabulary = json.dumps(snapshot.vocabulary, separators=(",", ":")).encode()
+    meta = json.dumps(snapshot.meta, separators=(",", ":")).encode()
+    crc = zlib.crc32(payload, zlib.crc32(meta, zlib.crc32(vocabulary)))
+    rows, columns = snapshot.shape
+    header = HEADER.pack(MAGIC, VERSION, code, snapshot.kind, 0, rows, columns, len(vocabulary), len(meta), len(payload), crc)
+    return header + vocabulary + meta + payload
+
+@dataclass(frozen=True)
+class Layout:
+    """A parsed header: everything but the cells, which stay in `payload`."""
+    encoding: int
+    kind: int
+    shape: Tuple[int, int]
+    vocabulary: List[Any]
+    meta: Dict[str, Any]
+    payload: memoryview
+
+def read_layout(buffer, verify: bool = True) -> Layout:
+    """Parse the header and sections of a snapshot without decoding its cells."""
+    view = memoryview(buffer)
+    if len(view) < HEADER.size:
+        raise ValueError("Truncated snapshot header")
+    magic, version, encoding, kind, _, rows, columns, vocab_size, meta_size, payload_size, crc = HEADER.unpack_from(view)
+    if magic != MAGIC:
+        raise ValueError("Not a Megaverse snapshot")
+    if version != VERSION:
+        raise ValueError(f"Unsupported snapshot version {version}")
+    if encoding not in ENCODINGS.values():
+        raise ValueError(f"Unknown snapshot encoding {encoding}")
+    start = HEADER.size
+    payload_start = start + vocab_size + meta_size
+    if len(view) < payload_start + payload_size:
+        raise ValueError("Truncated snapshot")
+    if verify and zlib.crc32(view[start:payload_start + payload_size]) != crc:
+        raise ValueError("Snapshot checksum mismatch")
+    return Layout(
+        encoding=encoding,
+        kind=kind,
+        shape=(rows, columns),
+        vocabulary=json.loads(bytes(view[start:start + vocab_size])),
+        meta=json.loads(bytes(view[start + vocab_size:payload_start])),
+        payload=view[payload_start:payload_start + payload_size],
+    )
+
+def decode(buffer, verify: bool = True) -> Snapshot:
+    """Decode a snapshot from bytes or a memory map; raw cells are a view of `buffer`."""
+    layout = read_layout(buffer, verify)
+    if layout.encoding == RAW:
+        cells = np.frombuffer(layout.payload, dtype=np.uint8).reshape(layout.shape)
+    else:
+        lengths, values = rle_runs(layout.payload)
+        cells = np.repeat(values, lengths).reshape(layout.shape)
+    return Snapshot(layout.kind, cells, layout.vocabulary, layout.meta)
+
+def dump(snapshot: Snapshot, path: str, encoding: str = "auto") -> None:
+    """Write a snapshot atomically."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(encode(snapshot, encoding))
+    os.replace(tmp_path, path)
+
+def load(path: str, verify: bool = True) -> Snapshot:
+    """Memory-map and decode a snapshot file."""
+    # The arrays keep the map alive through their buffer; it is unmapped
+    # once the last view is garbage collected
+    return decode(map_file(path), verify)
+
+def map_file(path: str) -> mmap.mmap:
+    """Memory-map a snapshot file read-only."""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            raise ValueError("Empty snapshot file")
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Convert maps between API JSON and binary snapshots")
+    parser.add_argument('source', help='A .json map or a .mvs snapshot')
+    parser.add_argument('target', help='Output path; the format follows the extension')
+    parser.add_argument('--encoding', choices=["auto", *ENCODINGS], default="auto")
+    args = parser.parse_args(argv)
+
+    if args.source.endswith(SUFFIX):
+        snapshot = load(args.source)
+    else:
+        with open(args.source) as f:
+            snapshot = from_json(json.load(f))
+    if args.target.endswith(SUFFIX):
+        dump(snapshot, args.target, args.encoding)
+    else:
+        with open(args.target, "w") as f:
+            json.dump(snapshot.to_json(), f, indent=2)
+    print(f"Wrote {args.target} ({os.path.getsize(args.target)} bytes)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Registry of the cell vocabulary: goal tokens and the astral types behind them.
+
+Every goal token is described once, as a `CellType`: the model class it
+builds, the attributes passed to the model, the API endpoint that creates and
+deletes it, and its type code in current-map cells. The lookup tables the rest
+of the package uses are precomputed here when a type is registered:
+
+- token -> (model, constructor arguments), for the goal parsers: one dict
+  lookup and one call per cell
+- cell code <-> cell type and code -> constructor, for `megaverse.grid`
+- model class -> endpoint, for the API client and the planner
+- (current-map type, attribute value) -> cell code, for current maps
+
+The default vocabulary holds the three Challenge 2 types. A new astral type
+needs a model class (see `megaverse.models`) and one `register` call; the
+tables are shared objects that are updated in place, so the parser, grids,
+planner and API client pick it up, as long as it is registered before a
+client is created.
+"""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from .models import AstralObject, Color, ComethObject, Direction, PolyanetObject, Position, SoloonObject
+
+SPACE = 0
+INVALID = 255
+
+@dataclass(frozen=True, slots=True)
+class CellType:
+    """One goal token and how to build, send and recognize it."""
+    token: str
+    code: int
+    model: type
+    endpoint: str
+    map_type: int
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def constructor(self) -> Tuple[type, tuple]:
+        """(model, arguments after the position), in the model's field order."""
+        return self.model, tuple(self.attributes.values())
+
+    def make(self, position: Position) -> AstralObject:
+        model, args = self.constructor
+        return model(position, *args)
+
+@dataclass(frozen=True, slots=True)
+class EndpointSchema:
+    """What an endpoint accepts: its current-map type and required attribute."""
+    model: type
+    map_type: int
+    attribute: Optional[str]
+    values: Tuple[str, ...]
+
+class Vocabulary:
+    """Registered cell types and the lookup tables derived from them."""
+
+    def __init__(self):
+        # Index in `tokens` is the cell code; SPACE is always code 0
+        self.tokens: List[str] = ["SPACE"]
+        self.token_codes: Dict[Optional[str], int] = {"SPACE": SPACE, "None": SPACE, None: SPACE}
+        self.by_token: Dict[str, CellType] = {}
+        self.by_code: Dict[int, CellType] = {}
+        self.token_constructors: Dict[str, Tuple[type, tuple]] = {}
+        self.code_constructors: Dict[int, Tuple[type, tuple]] = {}
+        self.endpoints: Dict[type, str] = {}
+        self.schemas: Dict[str, EndpointSchema] = {}
+        self.map_codes: Dict[Tuple[int, Optional[str]], int] = {}
+        self.models: Dict[str, type] = {}
+        self._object_codes: Dict[Tuple[type, Any], int] = {}
+        self._attributes: Dict[type, Optional[str]] = {}
+        self._map_attributes: Dict[int, Optional[str]] = {}
+
+    def register(
+        self,
+        model: type,
+        endpoint: str,
+        map_type: int,
+        attribute: Optional[str] = None,
+        values: Iterable[Any] = (),
+    ) -> List[CellType]:
+        """
+        Register an astral type and return its cell types.
+
+        Without `attribute` the type has a single token, its `type` name.
+        Otherwise it has one token per value, "<VALUE>_<TYPE>", and the value
+        is passed to the model as `attribute`.
+        """
+        if model.type in self.models:
+            raise ValueError(f"{model.type} is already registered")
+        if endpoint in self.schemas:
+            raise ValueError(f"Endpoint {endpoint} is already registered")
+        if map_type in self._map_attributes:
+            raise ValueError(f"Current-map type {map_type} is already registered")
+        values = tuple(values)
+        if attribute is None:
+            variants = [(model.type, {}, None)]
+        elif values:
+            variants = [(f"{str(value).upper()}_{model.type}", {attribute: value}, value) for value in values]
+        else:
+            raise ValueError(f"{model.type} has an attribute but no values")
+        if len(self.tokens) + len(variants) > INVALID:
+            raise ValueError("The vocabulary is full")
+
+        registered = []
+        for token, attributes, value in variants:
+            cell_type = CellType(token, len(self.tokens), model, endpoint, map_type, attributes)
+            self.tokens.append(token)
+            self.token_codes[token] = cell_type.code
+            self.by_token[token] = cell_type
+            self.by_code[cell_type.code] = cell_type
+            self.token_constructors[token] = self.code_constructors[cell_type.code] = cell_type.constructor
+            self.map_codes[(map_type, None if value is None else str(value))] = cell_type.code
+            self._object_codes[(model, value)] = cell_type.code
+            registered.append(cell_type)
+        self.models[model.type] = model
+        self.endpoints[model] = endpoint
+        self.schemas[endpoint] = EndpointSchema(model, map_type, attribute, tuple(str(value) for value in values))
+        self._attributes[model] = attribute
+        self._map_attributes[map_type] = attribute
+        return registered
+
+    def code_for_object(self, obj: AstralObject) -> int:
+        """The cell code of a model object (INVALID for unregistered ones)."""
+        model = type(obj)
+        attribute = self._attributes.get(model)
+        value = getattr(obj, attribute) if attribute else None
+        return self._object_codes.get((model, value), INVALID)
+
+    def code_for_map_cell(self, cell: Optional[dict]) -> int:
+        """The cell code of a current-map cell: null or {"type": int, <attribute>: str}."""
+        if not cell:
+            return SPACE
+        map_type = cell.get("type")
+        attribute = self._map_attributes.get(map_type)
+        return self.map_codes.get((map_type, cell.get(attribute) if attribute else None), INVALID)
+
+    def object_from_dict(self, obj: dict) -> AstralObject:
+        """Build a model object from the dict format produced by `parse_goal_map`."""
+        model = self.models.get(obj["type"])
+        if model is None:
+            raise ValueError(f"Unknown object type: {obj['type']}")
+        attribute = self._attributes[model]
+        position = Position(obj["row"], obj["column"])
+        return model(position, obj[attribute]) if attribute else model(position)
+
+VOCABULARY = Vocabulary()
+VOCABULARY.register(PolyanetObject, "polyanets", map_type=0)
+VOCABULARY.register(SoloonObject, "soloons", map_type=1, attribute="color", values=Color)
+VOCABULARY.register(ComethObject, "comeths", map_type=2, attribute="direction", values=Direction)
+
+def register(model: type, endpoint: str, map_type: int, attribute: Optional[str] = None, values: Iterable[Any] = ()) -> List[CellType]:
+    """Register an astral type in the default vocabulary; see `Vocabulary.register`."""
+    return VOCABULARY.register(model, endpoint, map_type, attribute, values)
@@ -0,0 +1,166 @@
+"""
+Windowed access to memory-mapped snapshots.
+
+`WindowedGrid` reads row ranges and rectangular tiles of a `.mvs` snapshot
+(see `megaverse.snapshot`) without decoding the rest of the map. Only the
+pages of the file covering the requested cells are touched, so any number of
+workers, in threads or in separate processes, can open the same file and each
+work on its own regions of a map far larger than they could hold in memory.
+
+Regions are plain picklable values: a coordinator splits the map with
+`row_bands` or `tiles`, hands every worker its share with `shard`, and each
+worker opens the snapshot by path:
+
+    with WindowedGrid(path) as reader:
+        for region in shard(tiles(reader.shape, 1000, 1000), workers, index):
+            for obj in reader.iter_objects(region):
+                ...
+"""
+
+from dataclasses import dataclass
+from typing import Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from . import snapshot
+from .grid import Grid
+from .models import AstralObject
+
+@dataclass(frozen=True, slots=True)
+class Region:
+    """Half-open rectangle of cells: rows [top, bottom), columns [left, right)."""
+    top: int
+    left: int
+    bottom: int
+    right: int
+
+    @property
+    def origin(self) -> Tuple[int, int]:
+        return (self.top, self.left)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return (self.bottom - self.top, self.right - self.left)
+
+    @property
+    def cells(self) -> int:
+        rows, columns = self.shape
+        return rows * columns
+
+def row_bands(shape: Tuple[int, int], rows: int) -> List[Region]:
+    """Split a map into full-width bands of at most `rows` rows."""
+    if rows < 1:
+        raise ValueError("Bands must be at least one row high")
+    height, width = shape
+    return [Region(top, 0, min(top + rows, height), width) for top in range(0, height, rows)]
+
+def tiles(shape: Tuple[int, int], rows: int, columns: int) -> List[Region]:
+    """Split a map into tiles of at most `rows` x `columns`, in row-major order."""
+    if rows < 1 or columns < 1:
+        raise ValueError("Tiles must be at least one cell in each direction")
+    height, width = shape
+    return [
+        Region(top, left, min(top + rows, height), min(left + columns, width))
+        for top in range(0, height, rows)
+        for left in range(0, width, columns)
+    ]
+
+def shard(regions: Sequence[Region], count: int, index: int) -> List[Region]:
+    """The regions worker `index` of `count` is responsible for (round robin)."""
+    if not 0 <= index < count:
+        raise ValueError(f"Shard index {index} is out of range for {count} shards")
+    return list(regions[index::count])
+
+class WindowedGrid:
+    """
+    Read-only windowed view of a snapshot file.
+
+    Raw snapshots are sliced in place. For run-length snapshots the run
+    boundaries are indexed once (one integer per run) and a window decodes
+    only the runs that overlap its rows.
+
+    The checksum covers the whole file, so it is only verified with
+    `verify=True`, which reads every page once.
+    """
+
+    def __init__(self, path: str, verify: bool = False):
+        self.path = path
+        self._map = snapshot.map_file(path)
+        layout = snapshot.read_layout(self._map, verify)
+        self.kind = layout.kind
+        self.shape = layout.shape
+        self.vocabulary = layout.vocabulary
+        self.meta = layout.meta
+        self._lookup = snapshot.grid_codes(layout.kind, layout.vocabulary)
+        self._cells: Optional[np.ndarray] = None
+        self._runs: Optional[Tuple[np.ndarray, np.ndarray]] = None
+        self._run_ends: Optional[np.ndarray] = None
+        if layout.encoding == snapshot.RAW:
+            self._cells = np.frombuffer(layout.payload, dtype=np.uint8).reshape(self.shape)
+        else:
+            self._runs = snapshot.rle_runs(layout.payload)
+
+    def __enter__(self) -> "WindowedGrid":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Drop this reader's views; the file is unmapped once no window refers to it."""
+        self._map = self._cells = self._runs = self._run_ends = None
+
+    def _rows(self, top: int, bottom: int) -> np.ndarray:
+        """Vocabulary indexes of rows [top, bottom)."""
+        if self._cells is not None:
+            return self._cells[top:bottom]
+        if self._runs is None:
+            raise ValueError("Reader is closed")
+        lengths, values = self._runs
+        if self._run_ends is None:
+            self._run_ends = np.cumsum(lengths, dtype=np.int64)
+        columns = self.shape[1]
+        start, stop = top * columns, bottom * columns
+        if start == stop:
+            return np.zeros((0, columns), dtype=np.uint8)
+        ends = self._run_ends
+        first = int(np.searchsorted(ends, start, side="right"))
+        last = int(np.searchsorted(ends, stop - 1, side="right")) + 1
+        run_ends = ends[first:last]
+        run_starts = run_ends - lengths[first:last]
+        counts = np.minimum(run_ends, stop) - np.maximum(run_starts, start)
+        return np.repeat(values[first:last], counts).reshape(bottom - top, columns)
+
+    def _check(self, region: Region) -> None:
+        rows, columns = self.shape
+        if not (0 <= region.top <= region.bottom <= rows and 0 <= region.left <= region.right <= columns):
+            raise ValueError(f"{region} is outside a map of shape {self.shape}")
+
+    def window(self, region: Region) -> Grid:
+        """The cells of `region` as a Grid of its own shape."""
+        self._check(region)
+        cells = self._rows(region.top, region.bottom)[:, region.left:region.right]
+        return Grid(self._lookup[cells])
+
+    def rows(self, top: int, bottom: int) -> Grid:
+        """Rows [top, bottom) at full width."""
+        return self.window(Region(top, 0, bottom, self.shape[1]))
+
+    def iter_windows(self, regions: Sequence[Region]) -> Iterator[Tuple[Region, Grid]]:
+        """Yield (region, grid) for each region, decoding one at a time."""
+        for region in regions:
+            yield region, self.window(region)
+
+    def iter_row_bands(self, rows: int) -> Iterator[Tuple[Region, Grid]]:
+        return self.iter_windows(row_bands(self.shape, rows))
+
+    def iter_tiles(self, rows: int, columns: int) -> Iterator[Tuple[Region, Grid]]:
+        return self.iter_windows(tiles(self.shape, rows, columns))
+
+    def iter_objects(self, region: Optional[Region] = None, rows: int = 1024) -> Iterator[AstralObject]:
+        """
+        Objects in `region` (default: the whole map) with their positions in
+        the full map, decoded `rows` rows at a time.
+        """
+        region = region or Region(0, 0, *self.shape)
+        for top in range(region.top, region.bottom, rows):
+            band = Region(top, region.left, min(top + rows, region.bottom), region.right)
+            yield from self.window(band).iter_objects(band.origin)
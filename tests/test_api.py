@@ -0,0 +1,103 @@
+"""
+Test suite for the MegaverseAPI client.
+Tests session pooling, timeouts and request construction.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+from megaverse.api import MegaverseAPI
+from megaverse.models import Position, AstralObject, PolyanetObject, SoloonObject, ComethObject
+from megaverse.reconcile import CREATE, DELETE, Operation
+
+@pytest.fixture
+def session():
+    """Create a mock session that returns a successful response."""
+    session = Mock()
+    session.request.return_value = Mock(status_code=200)
+    return session
+
+def test_requests_reuse_the_same_session(session):
+    """All calls should go through the client's pooled session."""
+    api = MegaverseAPI(candidate_id="dummy", session=session)
+    api.create_polyanet(Position(1, 2))
+    api.delete_polyanet(Position(1, 2))
+
+    assert session.request.call_count == 2
+    method, url = session.request.call_args_list[0].args
+    assert method == "POST"
+    assert url == f"{MegaverseAPI.BASE_URL}/polyanets"
+    assert session.request.call_args_list[0].kwargs["json"] == {
+        "row": 1,
+        "column": 2,
+        "candidateId": "dummy",
+    }
+
+def test_timeout_is_applied_per_call(session):
+    """The configured timeout is used unless a call overrides it."""
+    api = MegaverseAPI(candidate_id="dummy", timeout=2.5, session=session)
+    api.create_soloon(Position(0, 0), "blue")
+    assert session.request.call_args.kwargs["timeout"] == 2.5
+
+    api._make_request("GET", "map/dummy/goal", timeout=30)
+    assert session.request.call_args.kwargs["timeout"] == 30
+
+def test_context_manager_closes_session(session):
+    """Leaving the `with` block should release the pooled connections."""
+    with MegaverseAPI(candidate_id="dummy", session=session) as api:
+        assert api.session is session
+    session.close.assert_called_once()
+
+def test_default_session_has_sized_pool():
+    """The default session mounts an adapter sized to `pool_size`."""
+    api = MegaverseAPI(candidate_id="dummy", pool_size=4)
+    adapter = api.session.get_adapter(MegaverseAPI.BASE_URL)
+    assert adapter._pool_maxsize == 4
+    assert api.session.headers["Connection"] == "keep-alive"
+    api.close()
+
+def test_missing_candidate_id(monkeypatch):
+    """A candidate ID is required."""
+    monkeypatch.delenv("CANDIDATE_ID", raising=False)
+    with pytest.raises(ValueError):
+        MegaverseAPI()
+
+def test_astral_objects_dispatch_through_route_table(session):
+    """create/delete_astral_object pick the endpoint and payload from the type."""
+    api = MegaverseAPI(candidate_id="dummy", session=session)
+    api.create_astral_object(ComethObject(Position(3, 4), "left"))
+    method, url = session.request.call_args.args
+    assert (method, url) == ("POST", f"{MegaverseAPI.BASE_URL}/comeths")
+    assert session.request.call_args.kwargs["json"] == {
+        "row": 3, "column": 4, "direction": "left", "candidateId": "dummy"
+    }
+
+    api.delete_astral_object(SoloonObject(Position(1, 1), "red"))
+    method, url = session.request.call_args.args
+    assert (method, url) == ("DELETE", f"{MegaverseAPI.BASE_URL}/soloons")
+    assert session.request.call_args.kwargs["json"] == {"row": 1, "column": 1, "candidateId": "dummy"}
+
+def test_unknown_object_type_is_rejected(session):
+    api = MegaverseAPI(candidate_id="dummy", session=session)
+    with pytest.raises(NotImplementedError):
+        api.create_astral_object(AstralObject(Position(0, 0)))
+    with pytest.raises(NotImplementedError):
+        api.delete_astral_object(AstralObject(Position(0, 0)))
+    assert not session.request.called
+
+def test_prepared_plan_sends_pre_encoded_bodies(session):
+    """A plan can be encoded up front and sent as raw JSON bytes."""
+    api = MegaverseAPI(candidate_id="dummy", session=session)
+    plan = [
+        Operation(DELETE, PolyanetObject(Position(0, 0))),
+        Operation(CREATE, SoloonObject(Position(0, 1), "white")),
+    ]
+    prepared = api.prepare_plan(plan)
+
+    assert [(p.method, p.endpoint) for p in prepared] == [("DELETE", "polyanets"), ("POST", "soloons")]
+    assert json.loads(prepared[1].body) == {"row": 0, "column": 1, "color": "white", "candidateId": "dummy"}
+    assert not session.request.called
+
+    api.send_prepared(prepared[1])
+    assert session.request.call_args.kwargs["data"] == prepared[1].body
+    assert session.request.call_args.kwargs["headers"]["Content-Type"] == "application/json"
@@ -0,0 +1,141 @@
+"""
+Test suite for the asyncio Megaverse client.
+Runs the client against a local stub HTTP server.
+"""
+
+import json
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from unittest.mock import Mock
+from megaverse.async_api import AsyncMegaverseAPI
+from megaverse.ratelimit import TokenBucket
+from megaverse.retry import RetryPolicy
+from megaverse.models import Position, PolyanetObject, SoloonObject, ComethObject
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Records every request and tracks how many are in flight at once."""
+
+    def _handle(self):
+        server = self.server
+        with server.lock:
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+        time.sleep(server.delay)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length)) if length else None
+        with server.lock:
+            server.in_flight -= 1
+            server.calls.append((self.command, self.path, body))
+        status = 500 if body and body.get("row") == server.fail_row else 200
+        payload = json.dumps({"goal": [["POLYANET"]]} if self.command == "GET" else {}).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    do_GET = do_POST = do_DELETE = _handle
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stub_server():
+    """Start a threaded stub server on a free local port."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.lock = threading.Lock()
+    server.in_flight = 0
+    server.max_in_flight = 0
+    server.calls = []
+    server.delay = 0.05
+    server.fail_row = None
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+def make_client(server, concurrency):
+    limiter = TokenBucket(rate=1000, capacity=1000, max_rate=1000)
+    client = AsyncMegaverseAPI(
+        candidate_id="dummy",
+        concurrency=concurrency,
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+    client.api.BASE_URL = f"http://127.0.0.1:{server.server_address[1]}/api"
+    return client
+
+def test_create_many_respects_concurrency(stub_server):
+    """No more than `concurrency` requests should be in flight."""
+    objects = [PolyanetObject(Position(row, 0)) for row in range(12)]
+
+    async def run():
+        async with make_client(stub_server, concurrency=3) as client:
+            return await client.create_many(objects)
+
+    results = asyncio.run(run())
+
+    assert results == [None] * 12
+    assert len(stub_server.calls) == 12
+    assert 1 < stub_server.max_in_flight <= 3
+    assert {body["row"] for _, _, body in stub_server.calls} == set(range(12))
+
+def test_delete_many_routes_to_endpoints(stub_server):
+    """Each object type is deleted through its own endpoint."""
+    objects = [
+        PolyanetObject(Position(0, 0)),
+        SoloonObject(Position(0, 1), "red"),
+        ComethObject(Position(0, 2), "up"),
+    ]
+
+    async def run():
+        async with make_client(stub_server, concurrency=2) as client:
+            return await client.delete_many(objects)
+
+    assert asyncio.run(run()) == [None, None, None]
+    assert sorted((method, path) for method, path, _ in stub_server.calls) == [
+        ("DELETE", "/api/comeths"),
+        ("DELETE", "/api/polyanets"),
+        ("DELETE", "/api/soloons"),
+    ]
+
+def test_failures_are_returned_in_order(stub_server):
+    """A failed call is reported in place without cancelling the others."""
+    stub_server.fail_row = 1
+    objects = [PolyanetObject(Position(row, 0)) for row in range(3)]
+
+    async def run():
+        async with make_client(stub_server, concurrency=3) as client:
+            return await client.create_many(objects)
+
+    results = asyncio.run(run())
+    assert results[0] is None and results[2] is None
+    assert isinstance(results[1], Exception)
+
+def test_get_goal_map(stub_server):
+    """The goal map is fetched through the shared session."""
+    async def run():
+        async with make_client(stub_server, concurrency=1) as client:
+            return await client.get_goal_map()
+
+    assert asyncio.run(run()) == {"goal": [["POLYANET"]]}
+    assert stub_server.calls == [("GET", "/api/map/dummy/goal", None)]
+
+def test_close_leaves_an_injected_client_open():
+    """Only a MegaverseAPI the async client created itself is closed with it."""
+    api = Mock(candidate_id="dummy")
+
+    async def run():
+        async with AsyncMegaverseAPI(api=api) as client:
+            pass
+        async with AsyncMegaverseAPI("dummy", session=Mock()) as owned:
+            pass
+        return owned
+
+    owned = asyncio.run(run())
+    assert not api.close.called
+    assert owned.api.session.close.called
@@ -0,0 +1,54 @@
+"""
+Smoke tests for the benchmark suite.
+"""
+
+import json
+from benchmarks.common import latency_summary, percentile
+from benchmarks.e2e import main, run_scenario
+
+def test_percentiles():
+    samples = [i / 100 for i in range(1, 101)]
+    assert percentile(samples, 0.5) == 0.5
+    assert percentile(samples, 0.99) == 0.99
+    assert percentile([], 0.5) is None
+    assert latency_summary([0.002, 0.004])["p50_ms"] == 2.0
+
+def test_scenario_reports_both_phases():
+    goal = [["POLYANET", "SPACE"], ["RED_SOLOON", "UP_COMETH"]]
+    build, cleanup = run_scenario("tiny", goal, "threaded", workers=2, latency=0, throttle_rate=0, client_rate=1000)
+    assert (build["phase"], cleanup["phase"]) == ("build", "cleanup")
+    assert build["objects"] == 3 and build["failed"] == 0
+    assert build["latency"]["calls"] == 3
+    assert build["server_statuses"] == {"200": 3}
+
+def test_results_are_written_as_json(tmp_path):
+    output = tmp_path / "e2e.json"
+    main(["--workloads", "cross", "--modes", "sync", "async", "--latency", "0", "--throttle-rate", "0", "--output", str(output)])
+    document = json.loads(output.read_text())
+    assert document["benchmark"] == "e2e"
+    assert len(document["results"]) == 4
+
+def test_micro_benchmarks_measure_time_and_memory():
+    from benchmarks.micro import run, synthetic_codes
+    codes = synthetic_codes(50, density=0.2)
+    assert codes.shape == (50, 50)
+    assert 0.1 < (codes > 0).mean() < 0.3
+
+    results = run(sizes=[30, 40], stages=["parse_goal_map", "grid_diff"], repeat=1, max_python_cells=1000)
+    by_key = {(r["stage"], r["size"]): r for r in results}
+    assert by_key[("parse_goal_map", 30)]["peak_bytes"] > 0
+    assert by_key[("grid_diff", 40)]["seconds"] >= 0
+    assert "skipped" in by_key[("parse_goal_map", 40)]
+
+def test_micro_benchmarks_skip_stages_over_budget():
+    from benchmarks.micro import run
+    results = run(sizes=[10, 20], stages=["grid_validate"], repeat=1, budget=0)
+    assert "skipped" not in results[0]
+    assert "skipped" in results[1]
+
+def test_grid_from_tokens_stays_within_memory_budget():
+    from benchmarks.micro import MEMORY_BUDGETS, over_memory_budget, run
+    results = run(sizes=[300], stages=list(MEMORY_BUDGETS), repeat=1)
+    assert [r["stage"] for r in results if r["over_memory_budget"]] == []
+    # A string array of the tokens alone would blow the budget
+    assert over_memory_budget("grid_from_tokens", 300 * 300, 300 * 300 * 44)
@@ -0,0 +1,93 @@
+"""
+Test suite for the on-disk goal map cache.
+Tests TTL expiry, conditional revalidation and offline mode.
+"""
+
+import json
+import pytest
+from unittest.mock import Mock
+from megaverse.api import MegaverseAPI
+from megaverse.cache import GoalMapCache
+
+GOAL = {"goal": [["SPACE", "POLYANET"]]}
+
+class FakeClock:
+    def __init__(self, now=1_700_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+def response(status, body=None, headers=None):
+    resp = Mock(status_code=status, headers=headers or {})
+    resp.json.return_value = body
+    return resp
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def make_api(tmp_path, clock, session, offline=False):
+    cache = GoalMapCache(directory=str(tmp_path), ttl=60, offline=offline, clock=clock)
+    return MegaverseAPI(candidate_id="cand", session=session, goal_cache=cache)
+
+def test_fresh_entry_is_served_from_disk(tmp_path, clock):
+    session = Mock()
+    session.request.return_value = response(200, GOAL, {"ETag": '"v1"'})
+    api = make_api(tmp_path, clock, session)
+
+    assert api.get_goal_map() == GOAL
+    clock.now += 30
+    assert api.get_goal_map() == GOAL
+    assert session.request.call_count == 1
+
+    snapshots = api.goal_cache.snapshots("cand")
+    assert len(snapshots) == 1
+    assert snapshots[0].endswith("cand_20231114T221320Z.json")
+
+def test_stale_entry_is_revalidated(tmp_path, clock):
+    """After the TTL a conditional GET is sent and a 304 reuses the snapshot."""
+    session = Mock()
+    session.request.return_value = response(200, GOAL, {"ETag": '"v1"', "Last-Modified": "Tue, 14 Nov 2023 22:00:00 GMT"})
+    api = make_api(tmp_path, clock, session)
+    api.get_goal_map()
+
+    clock.now += 120
+    session.request.return_value = response(304)
+    assert api.get_goal_map() == GOAL
+    headers = session.request.call_args.kwargs["headers"]
+    assert headers == {"If-None-Match": '"v1"', "If-Modified-Since": "Tue, 14 Nov 2023 22:00:00 GMT"}
+
+    # The 304 refreshed the entry, so the next call stays local
+    clock.now += 30
+    assert api.get_goal_map() == GOAL
+    assert session.request.call_count == 2
+    assert len(api.goal_cache.snapshots("cand")) == 1
+
+def test_changed_goal_is_stored_as_new_snapshot(tmp_path, clock):
+    session = Mock()
+    session.request.return_value = response(200, GOAL, {"ETag": '"v1"'})
+    api = make_api(tmp_path, clock, session)
+    api.get_goal_map()
+
+    clock.now += 120
+    new_goal = {"goal": [["POLYANET", "SPACE"]]}
+    session.request.return_value = response(200, new_goal, {"ETag": '"v2"'})
+    assert api.get_goal_map() == new_goal
+    assert len(api.goal_cache.snapshots("cand")) == 2
+    assert api.goal_cache.load("cand").etag == '"v2"'
+
+def test_offline_mode_serves_newest_snapshot(tmp_path, clock):
+    """Offline mode never hits the network and reads existing snapshots."""
+    (tmp_path / "cand_20250101T000000Z.json").write_text(json.dumps({"classified": [["SPACE"]]}))
+    (tmp_path / "cand_20250102T000000Z.json").write_text(json.dumps({"classified": [["POLYANET"]]}))
+    session = Mock()
+    api = make_api(tmp_path, clock, session, offline=True)
+
+    assert api.get_goal_map() == {"goal": [["POLYANET"]]}
+    assert not session.request.called
+
+def test_offline_mode_without_snapshot(tmp_path, clock):
+    api = make_api(tmp_path, clock, Mock(), offline=True)
+    with pytest.raises(FileNotFoundError):
+        api.get_goal_map()
@@ -6,6 +6,7 @@ Tests the creation of objects from the goal map and error handling.
 import pytest
 from unittest.mock import Mock, patch
 from challenge2 import create_objects_from_goal
+from megaverse.models import PolyanetObject, Position, SoloonObject
 
 def test_create_objects_from_goal():
     # Mock API and its methods
@@ -22,32 +23,24 @@ def test_create_objects_from_goal():
     create_objects_from_goal(mock_api, dry_run=True)
     
     # Verify API was not called for creation
-    assert not mock_api.create_polyanet.called
-    assert not mock_api.create_soloon.called
-    assert not mock_api.create_cometh.called
+    assert not mock_api.create_astral_object.called
     
     # Test actual creation
     create_objects_from_goal(mock_api, dry_run=False)
     
-    # Verify API was called correctly
-    assert mock_api.create_polyanet.call_count == 1
-    assert mock_api.create_soloon.call_count == 1
-    assert mock_api.create_cometh.call_count == 1
-    
-    # Verify the correct positions were used
-    polyanet_call = mock_api.create_polyanet.call_args[0][0]
-    assert polyanet_call.row == 0
-    assert polyanet_call.column == 1
-    
-    soloon_call = mock_api.create_soloon.call_args
-    assert soloon_call[0][0].row == 1
-    assert soloon_call[0][0].column == 0
-    assert soloon_call[0][1] == "red"  # color is the second positional argument
-    
-    cometh_call = mock_api.create_cometh.call_args
-    assert cometh_call[0][0].row == 1
-    assert cometh_call[0][0].column == 2
-    assert cometh_call[0][1] == "up"  # direction is the second positional argument
+    # Verify API was called once per object, with the correct positions
+    created = [call.args[0] for call in mock_api.create_astral_object.call_args_list]
+    assert len(created) == 3
+    
+    polyanet, soloon, cometh = sorted(created, key=lambda obj: obj.type != "POLYANET")
+    assert isinstance(polyanet, PolyanetObject)
+    assert (polyanet.position.row, polyanet.position.column) == (0, 1)
+    
+    assert (soloon.position.row, soloon.position.column) == (1, 0)
+    assert soloon.color.value == "red"
+    
+    assert (cometh.position.row, cometh.position.column) == (1, 2)
+    assert cometh.direction.value == "up"
 
 def test_error_handling():
     # Mock API that raises an exception
@@ -56,4 +49,18 @@ def test_error_handling():
     
     # Test that the function handles the error gracefully
     create_objects_from_goal(mock_api)
-    # If we get here without an exception, the error was handled correctly 
\ No newline at end of file
+    # If we get here without an exception, the error was handled correctly 
+
+def test_create_objects_from_goal_file(tmp_path, monkeypatch):
+    """A saved goal map is streamed from disk instead of fetched."""
+    import json
+    monkeypatch.chdir(tmp_path)
+    goal_file = tmp_path / "goal.json"
+    goal_file.write_text(json.dumps({"goal": [["POLYANET", "SPACE"], ["SPACE", "WHITE_SOLOON"]]}))
+    mock_api = Mock()
+
+    create_objects_from_goal(mock_api, goal_file=str(goal_file))
+
+    assert not mock_api.get_goal_map.called
+    created = [call.args[0] for call in mock_api.create_astral_object.call_args_list]
+    assert created == [PolyanetObject(Position(0, 0)), SoloonObject(Position(1, 1), "white")]
@@ -1,19 +1,31 @@
 import os
 import json
 from unittest.mock import Mock
-from challenge2_cleanup import cleanup_from_log
+import requests
+from challenge2_cleanup import cleanup_from_log, cleanup_from_map, delete_objects
+from megaverse.api import MegaverseAPI
+from megaverse.journal import Journal
+from megaverse.models import ComethObject, PolyanetObject, Position, SoloonObject
+from megaverse.ratelimit import TokenBucket
+from megaverse.retry import RetryPolicy
+
+def too_many_requests():
+    """Build the HTTPError raised by the client for a 429 response."""
+    response = requests.Response()
+    response.status_code = 429
+    return requests.HTTPError("429 Client Error: Too Many Requests", response=response)
 
 def test_cleanup_from_log(tmp_path):
     """
-    Test the basic cleanup functionality with retry logic.
+    Test the basic cleanup functionality with a throttled deletion.
     
     This test:
     1. Creates a fake log file with three objects (POLYANET, SOLOON, COMETH)
-    2. Mocks the API to fail the SOLOON deletion once then succeed
+    2. Mocks the session to throttle the SOLOON deletion once, then succeed
     3. Verifies that:
-       - All objects are attempted to be deleted
-       - The SOLOON is retried and eventually succeeds
-       - The correct API methods are called with correct positions
+       - All objects are deleted with the correct positions
+       - The SOLOON is retried by the client's retry policy, not by cleanup
+       - The log file is cleared
     """
     # Prepare a fake log file with test data
     log_entries = [
@@ -26,29 +38,28 @@ def test_cleanup_from_log(tmp_path):
         for entry in log_entries:
             f.write(json.dumps(entry) + '\n')
 
-    # Mock API with specific behavior for SOLOON deletion
-    mock_api = Mock()
-    # Make the second deletion fail with a 429 error, then succeed
-    mock_api.delete_soloon.side_effect = [
-        Exception("429 Client Error: Too Many Requests"),
-        None  # Second attempt succeeds
-    ]
-
-    # Run cleanup with shorter retry delay for testing
-    cleanup_from_log(mock_api, log_file=str(log_file), max_retries=2, retry_delay=0.1)
+    # Mock session that throttles the first SOLOON deletion
+    throttled = Mock(status_code=429, headers={})
+    throttled.raise_for_status.side_effect = too_many_requests()
+    responses = {"soloons": [throttled]}
+    session = Mock()
+    session.request.side_effect = lambda method, url, **kwargs: (
+        (responses.get(url.rsplit("/", 1)[1]) or [Mock(status_code=200)]).pop()
+    )
+    api = MegaverseAPI(
+        candidate_id="dummy",
+        session=session,
+        rate_limiter=TokenBucket(rate=1000, capacity=1000, max_rate=1000),
+        retry_policy=RetryPolicy(sleep=lambda seconds: None),
+    )
 
-    # Verify API calls
-    assert mock_api.delete_polyanet.call_count == 1
-    assert mock_api.delete_soloon.call_count == 2  # Called twice due to retry
-    assert mock_api.delete_cometh.call_count == 1
+    cleanup_from_log(api, log_file=str(log_file))
 
-    # Verify correct positions were used
-    polyanet_call = mock_api.delete_polyanet.call_args[0][0]
-    assert polyanet_call.row == 0 and polyanet_call.column == 1
-    soloon_call = mock_api.delete_soloon.call_args[0][0]
-    assert soloon_call.row == 1 and soloon_call.column == 0
-    cometh_call = mock_api.delete_cometh.call_args[0][0]
-    assert cometh_call.row == 1 and cometh_call.column == 2
+    # Verify API calls; the client sent the SOLOON twice
+    calls = [(call.args[1].rsplit("/", 1)[1], call.kwargs["json"]["row"], call.kwargs["json"]["column"])
+             for call in session.request.call_args_list]
+    assert sorted(calls) == [("comeths", 1, 2), ("polyanets", 0, 1), ("soloons", 1, 0), ("soloons", 1, 0)]
+    assert Journal.replay(str(log_file)).cleanup_targets() == []
 
 def test_cleanup_with_failed_deletions(tmp_path):
     """
@@ -73,10 +84,14 @@ def test_cleanup_with_failed_deletions(tmp_path):
 
     # Mock API that always fails for SOLOON
     mock_api = Mock()
-    mock_api.delete_soloon.side_effect = Exception("429 Client Error: Too Many Requests")
+
+    def delete(obj):
+        if isinstance(obj, SoloonObject):
+            raise too_many_requests()
+    mock_api.delete_astral_object.side_effect = delete
 
     # Run cleanup
-    cleanup_from_log(mock_api, log_file=str(log_file), max_retries=2, retry_delay=0.1)
+    cleanup_from_log(mock_api, log_file=str(log_file))
 
     # Verify log file only contains the failed deletion
     with open(log_file, 'r') as f:
@@ -85,4 +100,43 @@ def test_cleanup_with_failed_deletions(tmp_path):
     assert len(remaining_entries) == 1
     assert remaining_entries[0]["type"] == "SOLOON"
     assert remaining_entries[0]["row"] == 1
-    assert remaining_entries[0]["column"] == 0 
\ No newline at end of file
+    assert remaining_entries[0]["column"] == 0 
+
+def test_cleanup_checkpoints_progress(tmp_path):
+    """Deletions are journaled as they happen, newest object first."""
+    log_file = str(tmp_path / "challenge2_created.log")
+    with open(log_file, 'w') as f:
+        for column in range(4):
+            f.write(json.dumps({"row": 0, "column": column, "type": "POLYANET"}) + '\n')
+
+    deleted = []
+    mock_api = Mock()
+    mock_api.delete_astral_object.side_effect = lambda obj: deleted.append(obj.position.column)
+
+    # Delete half of the objects, as an interrupted cleanup would have
+    state = Journal.replay(log_file)
+    with Journal(log_file) as journal:
+        failed = delete_objects(mock_api, state.cleanup_targets()[:2], journal, workers=2)
+    assert failed == []
+    assert [obj["column"] for obj in Journal.replay(log_file).cleanup_targets()] == [2, 3]
+
+    cleanup_from_log(mock_api, log_file=log_file, workers=3)
+    assert sorted(deleted[2:]) == [2, 3]
+    assert Journal.replay(log_file).cleanup_targets() == []
+
+def test_cleanup_from_map(tmp_path):
+    """Objects on the live map are deleted even when no log mentions them."""
+    mock_api = Mock()
+    mock_api.get_current_map.return_value = {"map": {"content": [
+        [None, {"type": 0}],
+        [{"type": 1, "color": "red"}, {"type": 2, "direction": "up"}],
+    ]}}
+
+    cleanup_from_map(mock_api, log_file=str(tmp_path / "challenge2_created.log"))
+
+    deleted = [call.args[0] for call in mock_api.delete_astral_object.call_args_list]
+    assert deleted == [
+        ComethObject(Position(1, 1), "up"),
+        SoloonObject(Position(1, 0), "red"),
+        PolyanetObject(Position(0, 1)),
+    ]
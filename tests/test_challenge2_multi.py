@@ -0,0 +1,110 @@
+"""
+Test suite for the multi-candidate builder.
+Tests manifest loading, per-candidate reports and the shared in-flight cap.
+"""
+
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from challenge2_multi import CandidateJob, _rate_limiter, build_candidate, load_manifest, main, run_manifest, summarize
+from megaverse.api import MegaverseAPI
+from megaverse.fake_server import FakeMegaverseServer, cross_goal
+from megaverse.grid import Grid
+from megaverse.models import PolyanetObject, Position
+from megaverse.ratelimit import TokenBucket
+
+def write_manifest(tmp_path, manifest):
+    path = tmp_path / "manifest.json"
+    path.write_text(json.dumps(manifest))
+    return str(path)
+
+def test_load_manifest_applies_defaults(tmp_path):
+    path = write_manifest(tmp_path, {
+        "defaults": {"workers": 3},
+        "candidates": ["a", {"candidate_id": "b", "goal_file": "goal.json", "workers": 1, "reconcile": True}],
+    })
+    assert load_manifest(path) == [
+        CandidateJob("a", workers=3),
+        CandidateJob("b", goal_file=str(tmp_path / "goal.json"), workers=1, reconcile=True),
+    ]
+
+@pytest.mark.parametrize("candidates", [
+    ["a", "a"],
+    [{"goal_file": "goal.json"}],
+    [{"candidate_id": "a", "colour": "red"}],
+    [{"candidate_id": "a", "workers": 0}],
+    [{"candidate_id": "a", "rate": 0}],
+])
+def test_load_manifest_rejects_bad_entries(tmp_path, candidates):
+    with pytest.raises(ValueError):
+        load_manifest(write_manifest(tmp_path, candidates))
+
+def test_build_candidate_reports_errors(tmp_path):
+    result = build_candidate(CandidateJob("a", goal_file=str(tmp_path / "missing.json")), log_dir=str(tmp_path))
+    assert result["status"] == "error"
+    assert "FileNotFoundError" in result["error"]
+
+def test_build_candidate_reports_offline_cache_miss(tmp_path):
+    job = CandidateJob("nobody", offline=True)
+    result = build_candidate(job, log_dir=str(tmp_path), cache_dir=str(tmp_path / "cache"))
+    assert result["status"] == "error"
+    assert result["requests"] == 0
+    assert "Error fetching goal map" in (tmp_path / "nobody.log").read_text()
+
+def test_fractional_rate_builds(tmp_path):
+    assert _rate_limiter(0.5).capacity == 1.0
+    with FakeMegaverseServer(goal=[["POLYANET"]]) as server:
+        job = CandidateJob("slow", base_url=server.base_url, rate=0.5)
+        result = build_candidate(job, log_dir=str(tmp_path), cache_dir=str(tmp_path / "cache"))
+        assert result["status"] == "ok"
+        assert len(server.cells("slow")) == 1
+
+def test_run_manifest_builds_every_candidate(tmp_path):
+    goal = cross_goal()
+    expected = len(Grid.from_goal_map({"goal": goal}).to_objects())
+    with FakeMegaverseServer(goal=goal) as server:
+        jobs = [CandidateJob(candidate, workers=4, base_url=server.base_url, rate=1000) for candidate in ("a", "b", "c")]
+        results = run_manifest(jobs, processes=2, max_in_flight=3, log_dir=str(tmp_path), cache_dir=str(tmp_path / "cache"))
+        assert [result["candidate_id"] for result in results] == ["a", "b", "c"]
+        assert all(result["status"] == "ok" and result["unconfirmed"] == 0 for result in results)
+        assert all(len(server.cells(candidate)) == expected for candidate in ("a", "b", "c"))
+    report = summarize(results, 1.0)
+    assert report["ok"] == 3 and report["requests"] == 3 * (expected + 1)
+
+def test_main_exits_non_zero_on_failure(tmp_path, capsys):
+    path = write_manifest(tmp_path, [{"candidate_id": "a", "goal_file": "missing.json"}])
+    report = tmp_path / "report.json"
+    assert main([path, "--log-dir", str(tmp_path / "runs"), "--report", str(report)]) == 1
+    assert json.loads(report.read_text())["error"] == 1
+    assert "a: error" in capsys.readouterr().out
+
+class CountingSlots:
+    """Semaphore that records how many holders it had at once."""
+
+    def __init__(self, slots):
+        self._semaphore = threading.BoundedSemaphore(slots)
+        self._lock = threading.Lock()
+        self.active = self.peak = self.total = 0
+
+    def __enter__(self):
+        self._semaphore.acquire()
+        with self._lock:
+            self.active += 1
+            self.total += 1
+            self.peak = max(self.peak, self.active)
+
+    def __exit__(self, *exc):
+        with self._lock:
+            self.active -= 1
+        self._semaphore.release()
+
+def test_in_flight_semaphore_caps_concurrent_calls():
+    slots = CountingSlots(2)
+    with FakeMegaverseServer(latency=0.02) as server:
+        limiter = TokenBucket(rate=1000, capacity=1000, max_rate=1000)
+        with MegaverseAPI("a", base_url=server.base_url, rate_limiter=limiter, in_flight=slots) as api:
+            with ThreadPoolExecutor(6) as pool:
+                list(pool.map(api.create_astral_object, [PolyanetObject(Position(0, column)) for column in range(11)]))
+    assert slots.total == 11
+    assert slots.peak == 2
@@ -151,4 +151,59 @@ def test_parse_none_values():
     expected_positions = {(0, 2), (1, 1), (2, 1)}
     for obj in objects:
         position = (obj["row"], obj["column"])
-        assert position in expected_positions 
\ No newline at end of file
+        assert position in expected_positions 
+def test_iter_goal_objects_yields_typed_objects():
+    """The streaming parser yields model objects instead of dicts."""
+    from megaverse.models import PolyanetObject, SoloonObject, ComethObject
+    from challenge2_goal_parser import iter_goal_objects
+
+    goal_map = {
+        "goal": [
+            ["SPACE", "POLYANET", "BLUE_SOLOON"],
+            ["UNKNOWN_SOLOON", "LEFT_COMETH", None],
+        ]
+    }
+    objects = list(iter_goal_objects(goal_map))
+    assert [type(obj) for obj in objects] == [PolyanetObject, SoloonObject, ComethObject]
+    assert (objects[1].position.row, objects[1].position.column, objects[1].color) == (0, 2, "blue")
+    assert objects[2].direction == "left"
+
+@pytest.mark.parametrize("chunk_size", [1, 3, 16, 65536])
+def test_parse_goal_map_from_stream(chunk_size):
+    """Parsing from a byte stream matches parse_goal_map for any chunk size."""
+    import io
+    import json
+    from challenge2_goal_parser import iter_goal_objects_from_stream
+
+    goal_map = {
+        "other": {"nested": [1, 2.5, True, "x\"y"]},
+        "goal": [
+            ["SPACE", "POLYANET", "PURPLE_SOLOON"],
+            [None, "DOWN_COMETH", "WRONG_COMETH"],
+        ],
+        "after": None,
+    }
+    stream = io.BytesIO(json.dumps(goal_map, indent=2).encode())
+    objects = [obj.to_dict() for obj in iter_goal_objects_from_stream(stream, chunk_size)]
+    assert objects == parse_goal_map(goal_map)
+
+def test_parse_saved_snapshot_from_text_stream():
+    """Saved snapshots use the "classified" key and can be read as text."""
+    import io
+    from challenge2_goal_parser import iter_goal_objects_from_stream
+
+    stream = io.StringIO('{"classified": [["SPACE", "RED_SOLOON"], ["POLYANET", "SPACE"]]}')
+    objects = [obj.to_dict() for obj in iter_goal_objects_from_stream(stream)]
+    assert objects == [
+        {"row": 0, "column": 1, "type": "SOLOON", "color": "red"},
+        {"row": 1, "column": 0, "type": "POLYANET"},
+    ]
+
+def test_stream_rejects_malformed_documents():
+    import io
+    from challenge2_goal_parser import iter_goal_objects_from_stream
+
+    with pytest.raises(ValueError):
+        list(iter_goal_objects_from_stream(io.StringIO('["POLYANET"]')))
+    with pytest.raises(ValueError):
+        list(iter_goal_objects_from_stream(io.StringIO('{"goal": [["POLYANET", {}]]}')))
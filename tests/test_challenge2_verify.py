@@ -0,0 +1,74 @@
+"""
+Test suite for the verify command.
+Tests drift detection against the fake server, repairs and exit codes.
+"""
+
+import json
+import pytest
+from challenge2_verify import fetch_grids, main, repair, verify
+from megaverse import snapshot
+from megaverse.api import MegaverseAPI
+from megaverse.fake_server import FakeMegaverseServer, cross_goal
+from megaverse.grid import Grid
+from megaverse.journal import Journal
+from megaverse.models import Position, SoloonObject
+from megaverse.ratelimit import TokenBucket
+
+@pytest.fixture
+def server():
+    with FakeMegaverseServer(goal=cross_goal()) as server:
+        yield server
+
+@pytest.fixture
+def api(server):
+    limiter = TokenBucket(rate=1000, capacity=1000, max_rate=1000)
+    with MegaverseAPI("cand", base_url=server.base_url, rate_limiter=limiter) as api:
+        yield api
+
+def build_with_drift(api):
+    """Build the goal, then drop one object and add a stray one."""
+    objects = Grid.from_goal_map({"goal": cross_goal()}).to_objects()
+    for obj in objects[1:]:
+        api.create_astral_object(obj)
+    api.create_astral_object(SoloonObject(Position(0, 1), "red"))
+    return objects
+
+def test_verify_reports_drift(api):
+    objects = build_with_drift(api)
+    report = verify(api)
+    assert report.missing == {"POLYANET": 1}
+    assert report.extraneous == {"RED_SOLOON": 1}
+    assert report.goal_objects == len(objects)
+
+def test_repair_fixes_only_the_drift(api, server, tmp_path):
+    build_with_drift(api)
+    goal, current = fetch_grids(api)
+    server.stats.clear()
+    with Journal(str(tmp_path / "journal.log")) as journal:
+        repair(api, goal, current, journal=journal, workers=2)
+    # One delete for the stray object and one create for the missing one
+    assert sum(server.stats.values()) == 2
+    assert verify(api).is_clean
+
+def test_verify_repair_reverifies(api, monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    build_with_drift(api)
+    assert verify(api, repair_drift=True, dry_run=True).total == 2
+    assert verify(api, repair_drift=True).is_clean
+
+def test_main_uses_saved_maps_offline(tmp_path, capsys):
+    goal = {"goal": cross_goal()}
+    (tmp_path / "goal.json").write_text(json.dumps(goal))
+    snapshot.dump(snapshot.from_json(goal), str(tmp_path / "current.mvs"))
+    args = ["--goal-file", str(tmp_path / "goal.json"), "--current-file"]
+    assert main(args + [str(tmp_path / "current.mvs")]) == 0
+
+    empty = {"map": {"content": [[None] * 11 for _ in range(11)]}}
+    (tmp_path / "empty.json").write_text(json.dumps(empty))
+    report = tmp_path / "report.json"
+    assert main(args + [str(tmp_path / "empty.json"), "--report", str(report)]) == 1
+    assert json.loads(report.read_text())["drift"] == len(Grid.from_goal_map(goal).to_objects())
+
+    (tmp_path / "small.json").write_text(json.dumps({"map": {"content": [[None]]}}))
+    assert main(args + [str(tmp_path / "small.json")]) == 2
+    assert "cells differ from the goal" in capsys.readouterr().out
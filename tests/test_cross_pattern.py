@@ -78,4 +78,14 @@ def test_error_handling(mock_api):
     create_cross_pattern(mock_api)
     
     # Verify the API was called
-    assert mock_api.create_astral_object.call_count == 13 
\ No newline at end of file
+    assert mock_api.create_astral_object.call_count == 13 
+
+def test_create_cross_pattern_with_workers(mock_api, capsys):
+    """A thread pool creates every POLYanet and keeps progress output ordered."""
+    from challenge1_cross import create_cross_pattern
+
+    create_cross_pattern(mock_api, workers=4)
+
+    assert mock_api.create_astral_object.call_count == 13
+    progress = [line.split()[2] for line in capsys.readouterr().out.splitlines() if line.startswith("Created")]
+    assert progress == [f"{i}/13" for i in range(1, 14)]
@@ -0,0 +1,39 @@
+"""
+Test suite for drift reports.
+Tests counts by object type and by region.
+"""
+
+import pytest
+from megaverse.drift import drift_report
+from megaverse.grid import Grid
+
+GOAL = Grid.from_tokens([
+    ["POLYANET", "SPACE", "SPACE", "RED_SOLOON"],
+    ["SPACE", "POLYANET", "SPACE", "SPACE"],
+    ["SPACE", "SPACE", "UP_COMETH", "SPACE"],
+])
+
+def test_matching_maps_are_clean():
+    report = drift_report(GOAL, GOAL)
+    assert report.is_clean
+    assert report.regions == []
+    assert report.goal_objects == report.current_objects == 4
+
+def test_drift_by_type_and_region():
+    current = Grid.from_tokens([
+        ["POLYANET", "SPACE", "POLYANET", "BLUE_SOLOON"],
+        ["SPACE", "SPACE", "SPACE", "SPACE"],
+        ["SPACE", "SPACE", "DOWN_COMETH", "POLYANET"],
+    ])
+    report = drift_report(GOAL, current, region_size=2)
+    assert report.missing == {"POLYANET": 1}
+    assert report.extraneous == {"POLYANET": 2}
+    assert report.changed == {"RED_SOLOON->BLUE_SOLOON": 1, "UP_COMETH->DOWN_COMETH": 1}
+    assert report.total == 5
+    assert report.regions[0] == {"top": 0, "left": 2, "bottom": 2, "right": 4, "missing": 0, "extraneous": 1, "changed": 1, "total": 2}
+    assert sum(region["total"] for region in report.regions) == 5
+    assert report.to_dict()["drift"] == 5
+
+def test_shape_mismatch_is_rejected():
+    with pytest.raises(ValueError):
+        drift_report(GOAL, Grid.empty(2, 2))
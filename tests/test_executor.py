@@ -0,0 +1,58 @@
+"""
+Test suite for the thread-pool executor used by the synchronous scripts.
+"""
+
+import random
+import threading
+import time
+from unittest.mock import Mock
+from megaverse.executor import run_ordered
+from challenge2 import execute_operations
+from megaverse.models import Position, PolyanetObject
+from megaverse.reconcile import CREATE, DELETE, Operation
+
+def test_results_come_back_in_input_order():
+    def slow_square(n):
+        time.sleep(random.random() / 100)
+        if n == 3:
+            raise ValueError("three")
+        return n * n
+
+    outcomes = list(run_ordered(slow_square, range(8), workers=4))
+    assert [item for item, _ in outcomes] == list(range(8))
+    assert [item for item, error in outcomes if error is not None] == [3]
+
+def test_in_flight_calls_are_bounded():
+    """No more than `workers` calls run at once, and a generator is consumed lazily."""
+    lock = threading.Lock()
+    running, peak = 0, 0
+
+    def track(_):
+        nonlocal running, peak
+        with lock:
+            running += 1
+            peak = max(peak, running)
+        time.sleep(0.005)
+        with lock:
+            running -= 1
+
+    pulled = []
+    items = (pulled.append(n) or n for n in range(50))
+    first = next(run_ordered(track, items, workers=3))
+    assert first == (0, None)
+    assert len(pulled) <= 6
+    assert list(run_ordered(track, range(20), workers=3))
+    assert peak <= 3
+
+def test_deletes_finish_before_creates_start():
+    """A cell is cleared before its replacement is created, even with workers."""
+    events = []
+    api = Mock()
+    api.delete_astral_object.side_effect = lambda obj: (time.sleep(0.01), events.append("delete"))
+    api.create_astral_object.side_effect = lambda obj: events.append("create")
+    operations = [Operation(DELETE, PolyanetObject(Position(0, c))) for c in range(3)]
+    operations += [Operation(CREATE, PolyanetObject(Position(0, c))) for c in range(3)]
+
+    execute_operations(api, operations, total=len(operations), workers=4)
+
+    assert events == ["delete"] * 3 + ["create"] * 3
@@ -0,0 +1,66 @@
+"""
+Test suite for the local fake Megaverse server.
+Runs the real client over HTTP against it.
+"""
+
+import pytest
+import requests
+from megaverse.api import MegaverseAPI
+from megaverse.fake_server import FakeMegaverseServer
+from megaverse.grid import Grid
+from megaverse.models import Position, PolyanetObject, SoloonObject, ComethObject
+from megaverse.ratelimit import TokenBucket
+from megaverse.retry import RetryPolicy
+
+def make_api(server, **kwargs):
+    kwargs.setdefault("rate_limiter", TokenBucket(rate=1000, capacity=1000, max_rate=1000))
+    kwargs.setdefault("retry_policy", RetryPolicy(max_attempts=1))
+    return MegaverseAPI(candidate_id="dummy", base_url=server.base_url, **kwargs)
+
+def test_objects_round_trip_through_current_map():
+    """Creates and deletes are reflected in the current map."""
+    with FakeMegaverseServer(goal=[["SPACE"] * 3] * 2) as server, make_api(server) as api:
+        api.create_astral_object(PolyanetObject(Position(0, 0)))
+        api.create_astral_object(SoloonObject(Position(0, 1), "red"))
+        api.create_astral_object(ComethObject(Position(1, 2), "up"))
+        api.delete_polyanet(Position(0, 0))
+
+        grid = Grid.from_current_map(api.get_current_map())
+        assert grid.shape == (2, 3)
+        assert set(grid.to_objects()) == {SoloonObject(Position(0, 1), "red"), ComethObject(Position(1, 2), "up")}
+
+def test_goal_map_is_served():
+    with FakeMegaverseServer() as server, make_api(server) as api:
+        goal = Grid.from_goal_map(api.get_goal_map())
+    assert goal.shape == (11, 11)
+    assert goal.count() == 13
+
+def test_invalid_requests_are_rejected():
+    with FakeMegaverseServer(goal=[["SPACE"]]) as server, make_api(server) as api:
+        with pytest.raises(requests.HTTPError):
+            api._make_request("POST", "soloons", {"row": 0, "column": 0, "color": "green", "candidateId": "dummy"})
+        with pytest.raises(requests.HTTPError):
+            api.create_polyanet(Position(5, 5))
+        assert server.stats[400] == 2
+
+def test_injected_throttling_is_retried():
+    """Injected 429s carry Retry-After and the client's retry policy absorbs them."""
+    retry = RetryPolicy(max_attempts=20, base_delay=0.001, max_delay=0.001)
+    with FakeMegaverseServer(throttle_rate=0.5, retry_after=0, seed=1) as server, make_api(server, retry_policy=retry) as api:
+        for column in range(5):
+            api.create_polyanet(Position(0, column))
+        assert len(server.cells("dummy")) == 5
+        assert server.stats[429] > 0
+
+def test_server_side_rate_limit():
+    with FakeMegaverseServer(rate_limit=3) as server, make_api(server) as api:
+        for _ in range(3):
+            api.get_goal_map()
+        with pytest.raises(requests.HTTPError) as error:
+            api.get_goal_map()
+    assert error.value.response.status_code == 429
+    assert float(error.value.response.headers["Retry-After"]) > 0
+
+def test_base_url_from_environment(monkeypatch):
+    monkeypatch.setenv("MEGAVERSE_BASE_URL", "http://localhost:9999/api/")
+    assert MegaverseAPI(candidate_id="dummy").BASE_URL == "http://localhost:9999/api"
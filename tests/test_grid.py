@@ -0,0 +1,76 @@
+"""
+Test suite for the NumPy-backed Grid.
+Tests vectorized parsing, validation, diffing and object iteration.
+"""
+
+import numpy as np
+import pytest
+from challenge2_goal_parser import iter_goal_objects
+from megaverse.grid import Grid, INVALID, SPACE, TOKEN_CODES
+
+GOAL_MAP = {
+    "goal": [
+        ["SPACE", "POLYANET", "BLUE_SOLOON"],
+        ["RED_SOLOON", "UP_COMETH", None],
+        ["POLYANET", "INVALID_OBJECT", "RIGHT_COMETH"],
+    ]
+}
+
+def test_from_goal_map_encodes_tokens():
+    grid = Grid.from_goal_map(GOAL_MAP)
+    assert grid.shape == (3, 3)
+    assert grid.codes.dtype == np.uint8
+    assert grid.codes[0, 0] == SPACE
+    assert grid.codes[0, 1] == TOKEN_CODES["POLYANET"]
+    assert grid.codes[1, 2] == SPACE
+    assert grid.codes[2, 1] == INVALID
+
+def test_iter_objects_matches_parse_goal_map():
+    """The grid yields the same objects, in the same order, as the goal parser."""
+    assert Grid.from_goal_map(GOAL_MAP).to_objects() == list(iter_goal_objects(GOAL_MAP))
+
+def test_classified_snapshot_and_round_trip():
+    grid = Grid.from_goal_map({"classified": [["POLYANET", "SPACE"], ["SPACE", "WHITE_SOLOON"]]})
+    assert grid.to_tokens() == [["POLYANET", "SPACE"], ["SPACE", "WHITE_SOLOON"]]
+    assert Grid.from_tokens(grid.to_tokens()) == grid
+
+def test_validate_reports_unknown_tokens():
+    grid = Grid.from_goal_map(GOAL_MAP)
+    assert not grid.is_valid
+    assert grid.validate().tolist() == [[2, 1]]
+    assert Grid.from_tokens([["POLYANET"]]).is_valid
+
+def test_ragged_rows_are_rejected():
+    with pytest.raises(ValueError):
+        Grid.from_tokens([["SPACE", "POLYANET"], ["SPACE"]])
+
+def test_empty_goal():
+    grid = Grid.from_goal_map({"goal": []})
+    assert grid.shape == (0, 0)
+    assert grid.to_objects() == []
+
+def test_from_current_map():
+    current = {
+        "map": {
+            "content": [
+                [None, {"type": 0}],
+                [{"type": 1, "color": "purple"}, {"type": 2, "direction": "down"}],
+            ]
+        }
+    }
+    grid = Grid.from_current_map(current)
+    assert grid.to_tokens() == [["SPACE", "POLYANET"], ["PURPLE_SOLOON", "DOWN_COMETH"]]
+
+def test_diff():
+    goal = Grid.from_tokens([["POLYANET", "RED_SOLOON", "SPACE"]])
+    current = Grid.from_tokens([["SPACE", "BLUE_SOLOON", "UP_COMETH"]])
+    diff = goal.diff(current)
+    assert diff.missing.tolist() == [[0, 0]]
+    assert diff.changed.tolist() == [[0, 1]]
+    assert diff.extraneous.tolist() == [[0, 2]]
+    assert len(diff) == 3
+    assert goal.diff(goal).is_empty
+
+def test_diff_requires_same_shape():
+    with pytest.raises(ValueError):
+        Grid.empty(2, 2).diff(Grid.empty(3, 3))
@@ -0,0 +1,98 @@
+"""
+Test suite for the crash-safe execution journal.
+Tests checksums, replay of interrupted runs, compaction and resuming.
+"""
+
+import json
+from unittest.mock import Mock
+from challenge2 import create_objects_from_goal, resume_from_journal
+from megaverse.journal import DONE, INTENDED, Journal, decode_record, encode_record
+from megaverse.models import Position, SoloonObject
+
+POLYANET = {"row": 0, "column": 1, "type": "POLYANET"}
+SOLOON = {"row": 1, "column": 0, "type": "SOLOON", "color": "red"}
+
+def test_records_round_trip_with_checksum():
+    line = encode_record({**SOLOON, "op": "create", "state": DONE})
+    assert decode_record(line) == {**SOLOON, "op": "create", "state": DONE}
+
+def test_corrupted_and_torn_lines_are_rejected():
+    line = encode_record({**SOLOON, "op": "create", "state": DONE})
+    assert decode_record(line.replace("red", "blue")) is None
+    assert decode_record(line[:20]) is None
+
+def test_legacy_lines_are_completed_creates():
+    """Logs written before the journal existed are still readable."""
+    assert decode_record(json.dumps(POLYANET)) == {**POLYANET, "op": "create", "state": DONE}
+
+def test_replay_tracks_live_and_pending_objects(tmp_path):
+    """An intended create without a matching done record is pending."""
+    path = str(tmp_path / "journal.log")
+    with Journal(path) as journal:
+        journal.intend("create", POLYANET, "plan")
+        journal.complete("create", POLYANET, "plan")
+        journal.intend("create", SOLOON, "plan")
+    with open(path, "a") as f:
+        f.write('{"row": 9, "column"')  # torn write from a crash
+
+    state = Journal.replay(path)
+    assert list(state.live) == [(0, 1)]
+    assert [r["type"] for r in state.pending_for_plan("plan")] == ["SOLOON"]
+    assert state.last_plan == "plan"
+    assert state.corrupt == 1
+    assert state.cleanup_targets() == [POLYANET, SOLOON]
+
+def test_completed_delete_removes_object(tmp_path):
+    path = str(tmp_path / "journal.log")
+    with Journal(path) as journal:
+        journal.complete("create", POLYANET)
+        journal.intend("create", SOLOON)
+        journal.complete("delete", SOLOON)
+        journal.complete("delete", POLYANET)
+    assert Journal.replay(path).cleanup_targets() == []
+
+def test_fsync_policy(tmp_path, monkeypatch):
+    """Records are fsynced in batches rather than one by one."""
+    syncs = []
+    monkeypatch.setattr("megaverse.journal.os.fsync", syncs.append)
+    journal = Journal(str(tmp_path / "journal.log"), fsync_every=3, fsync_interval=60, clock=lambda: 0.0)
+    for _ in range(7):
+        journal.complete("create", POLYANET)
+    assert len(syncs) == 2
+    journal.close()
+    assert len(syncs) == 3
+
+def test_compact_rewrites_journal(tmp_path):
+    path = str(tmp_path / "journal.log")
+    with Journal(path) as journal:
+        journal.intend("create", SOLOON)
+        journal.complete("create", SOLOON)
+    Journal.compact(path, [SOLOON])
+
+    with open(path) as f:
+        lines = f.readlines()
+    assert len(lines) == 1
+    assert Journal.replay(path).cleanup_targets() == [SOLOON]
+
+def test_run_is_journaled_and_resumable(tmp_path):
+    """A failed call stays pending and --resume re-sends only that call."""
+    path = str(tmp_path / "journal.log")
+    api = Mock()
+    api.get_goal_map.return_value = {"goal": [["POLYANET", "RED_SOLOON"]]}
+
+    def create(obj):
+        if obj.type == "SOLOON":
+            raise Exception("connection reset")
+    api.create_astral_object.side_effect = create
+
+    with Journal(path) as journal:
+        create_objects_from_goal(api, journal=journal)
+    state = Journal.replay(path)
+    assert list(state.live) == [(0, 0)]
+    assert [r["state"] for r in state.pending.values()] == [INTENDED]
+
+    api.reset_mock()
+    api.create_astral_object.side_effect = None
+    resume_from_journal(api, journal_path=path)
+    api.create_astral_object.assert_called_once_with(SoloonObject(Position(0, 1), "red"))
+    assert not Journal.replay(path).pending
@@ -0,0 +1,91 @@
+"""
+Test suite for request instrumentation.
+Tests the observer hook on MegaverseAPI and the metrics aggregator.
+"""
+
+import json
+import pytest
+import requests
+from unittest.mock import Mock
+from megaverse.api import MegaverseAPI
+from megaverse.fake_server import FakeMegaverseServer
+from megaverse.metrics import MetricsCollector, RequestEvent
+from megaverse.models import Position
+from megaverse.ratelimit import TokenBucket
+from megaverse.retry import RetryPolicy
+
+def event(duration=0.02, status=200, attempts=1, error=None):
+    return RequestEvent("POST", "polyanets", status, duration, attempts, 40, 2, error)
+
+def test_observer_sees_every_call_over_http():
+    """Events carry status, retry count, byte counts and a templated endpoint."""
+    events = []
+    observer = Mock(on_request=events.append)
+    retry = RetryPolicy(max_attempts=10, base_delay=0.001, max_delay=0.001)
+    with FakeMegaverseServer(throttle_rate=0.5, retry_after=0, seed=3) as server:
+        api = MegaverseAPI(
+            candidate_id="dummy",
+            base_url=server.base_url,
+            rate_limiter=TokenBucket(rate=1000, capacity=1000, max_rate=1000),
+            retry_policy=retry,
+            observers=[observer],
+        )
+        for column in range(4):
+            api.create_polyanet(Position(0, column))
+        api.get_goal_map()
+        api.close()
+
+    assert [e.endpoint for e in events] == ["polyanets"] * 4 + ["map/{candidate}/goal"]
+    assert all(e.status == 200 and e.error is None for e in events)
+    assert sum(e.retries for e in events) == server.stats[429]
+    assert events[0].bytes_sent == len(json.dumps({"row": 0, "column": 0, "candidateId": "dummy"}))
+    assert events[-1].bytes_received > 100
+
+def test_failed_call_is_reported():
+    session = Mock()
+    response = requests.Response()
+    response.status_code = 400
+    response._content = b'{"error": true}'
+    session.request.return_value = response
+    collector = MetricsCollector()
+    api = MegaverseAPI(candidate_id="dummy", session=session, retry_policy=RetryPolicy(max_attempts=1), observers=[collector])
+
+    with pytest.raises(requests.HTTPError):
+        api.create_polyanet(Position(0, 0))
+
+    stats = collector.snapshot()["endpoints"]["POST polyanets"]
+    assert stats["errors"] == 1
+    assert stats["statuses"] == {"400": 1}
+    assert stats["bytes_received"] == len(b'{"error": true}')
+
+def test_collector_histograms_and_quantiles():
+    collector = MetricsCollector(buckets=(0.01, 0.1, 1.0))
+    for duration in (0.005, 0.05, 0.05, 0.5):
+        collector.on_request(event(duration))
+    collector.on_request(event(5.0, status=None, attempts=3, error="ConnectTimeout"))
+
+    stats = collector.snapshot()["endpoints"]["POST polyanets"]
+    assert stats["histogram"] == {"0.01": 1, "0.1": 2, "1": 1, "+Inf": 1}
+    assert stats["duration_p50_le"] == 0.1
+    assert stats["duration_p99_le"] is None
+    assert stats["retries"] == 2
+    assert stats["statuses"] == {"200": 4, "none": 1}
+
+def test_prometheus_export():
+    collector = MetricsCollector(buckets=(0.01, 0.1))
+    collector.on_request(event(0.05))
+    text = collector.to_prometheus()
+
+    assert "# TYPE megaverse_request_duration_seconds histogram" in text
+    assert 'megaverse_requests_total{method="POST",endpoint="polyanets",status="200"} 1' in text
+    assert 'megaverse_request_duration_seconds_bucket{method="POST",endpoint="polyanets",le="0.01"} 0' in text
+    assert 'megaverse_request_duration_seconds_bucket{method="POST",endpoint="polyanets",le="+Inf"} 1' in text
+    assert 'megaverse_request_sent_bytes_total{method="POST",endpoint="polyanets"} 40' in text
+
+def test_write_picks_format_from_extension(tmp_path):
+    collector = MetricsCollector()
+    collector.on_request(event())
+    collector.write(str(tmp_path / "metrics.prom"))
+    collector.write(str(tmp_path / "metrics.json"))
+    assert (tmp_path / "metrics.prom").read_text().startswith("# HELP")
+    assert json.loads((tmp_path / "metrics.json").read_text())["requests"] == 1
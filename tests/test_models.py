@@ -0,0 +1,65 @@
+"""
+Test suite for the astral object models.
+Tests immutability, hashing and attribute interning.
+"""
+
+import dataclasses
+import pytest
+from megaverse.models import (
+    Color,
+    Direction,
+    Position,
+    PolyanetObject,
+    SoloonObject,
+    ComethObject,
+    object_from_dict,
+)
+
+def test_objects_are_hashable_values():
+    """Equal objects collapse in sets and can be used as dict keys."""
+    objects = {
+        PolyanetObject(Position(0, 0)),
+        PolyanetObject(Position(0, 0)),
+        SoloonObject(Position(0, 0), "red"),
+        SoloonObject(Position(0, 0), Color.RED),
+        ComethObject(Position(0, 0), "up"),
+    }
+    assert len(objects) == 3
+    assert {PolyanetObject(Position(1, 2)): "x"}[PolyanetObject(Position(1, 2))] == "x"
+
+def test_different_types_are_not_equal():
+    assert PolyanetObject(Position(0, 0)) != SoloonObject(Position(0, 0), "blue")
+    assert SoloonObject(Position(0, 0), "blue") != SoloonObject(Position(0, 0), "white")
+
+def test_objects_are_immutable_and_slotted():
+    obj = SoloonObject(Position(1, 1), "purple")
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        obj.color = "red"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        obj.position.row = 2
+    assert not hasattr(obj, "__dict__")
+    assert not hasattr(obj.position, "__dict__")
+
+def test_attributes_are_interned_enums():
+    soloon = SoloonObject(Position(0, 0), "white")
+    cometh = ComethObject(Position(0, 0), "left")
+    assert soloon.color is Color.WHITE
+    assert cometh.direction is Direction.LEFT
+    assert soloon.color == "white"
+    with pytest.raises(ValueError):
+        SoloonObject(Position(0, 0), "green")
+    with pytest.raises(ValueError):
+        ComethObject(Position(0, 0), "sideways")
+
+def test_positions_sort_row_major():
+    assert sorted([Position(1, 0), Position(0, 5), Position(0, 1)]) == [
+        Position(0, 1), Position(0, 5), Position(1, 0)
+    ]
+
+def test_dict_and_payload_round_trip():
+    obj = ComethObject(Position(3, 4), "down")
+    assert obj.to_dict() == {"row": 3, "column": 4, "type": "COMETH", "direction": "down"}
+    assert object_from_dict(obj.to_dict()) == obj
+    assert obj.to_api_payload("abc") == {"row": 3, "column": 4, "candidateId": "abc", "direction": "down"}
+    with pytest.raises(ValueError):
+        object_from_dict({"row": 0, "column": 0, "type": "UNKNOWN"})
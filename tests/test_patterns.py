@@ -0,0 +1,110 @@
+"""
+Test suite for the vectorized pattern engine.
+"""
+
+import json
+import numpy as np
+import pytest
+from unittest.mock import MagicMock, Mock
+from megaverse import snapshot
+from megaverse.grid import Grid, TOKEN_CODES
+from megaverse.models import Position, PolyanetObject, SoloonObject, ComethObject
+from megaverse.patterns import (
+    Pattern, PatternGenerator, bitmap_mask, border_mask, fill_mask, plus_mask, rect_mask, x_mask,
+)
+
+def cells(mask):
+    return {tuple(cell) for cell in np.argwhere(mask).tolist()}
+
+def test_x_and_plus_masks():
+    assert cells(x_mask((5, 5), distances=[1])) == {(1, 1), (1, 3), (3, 1), (3, 3)}
+    assert cells(plus_mask((5, 5), distances=[0, 2])) == {(2, 2), (0, 2), (4, 2), (2, 0), (2, 4)}
+    assert x_mask((7, 7)).sum() == 13
+
+def test_border_rect_and_fill_masks():
+    assert border_mask((4, 5)).sum() == 14
+    assert border_mask((5, 5), width=2).sum() == 24
+    assert cells(rect_mask((5, 5), 1, 1, 2, 3)) == {(1, 1), (1, 2), (1, 3), (2, 1), (2, 2), (2, 3)}
+    assert rect_mask((6, 6), 1, 1, 4, 4, filled=False).sum() == 12
+    assert fill_mask((3, 2)).all()
+
+def test_bitmap_mask_is_placed_and_clipped():
+    stencil = ["#.#", ".#.", "#.#"]
+    assert cells(bitmap_mask((4, 4), stencil, top=1, left=1)) == {(1, 1), (1, 3), (2, 2), (3, 1), (3, 3)}
+    assert cells(bitmap_mask((2, 2), stencil, top=-1, left=-1)) == {(0, 0), (1, 1)}
+
+def test_pattern_layers_and_outputs():
+    """Later layers paint over earlier ones; the grid and object stream agree."""
+    pattern = Pattern(5, 5)
+    pattern.add(border_mask(pattern.shape), "RED_SOLOON").add(x_mask(pattern.shape), "POLYANET")
+    pattern.erase(rect_mask(pattern.shape, 2, 2, 2, 2))
+
+    grid = pattern.to_grid()
+    assert grid.codes[0, 0] == TOKEN_CODES["POLYANET"]
+    assert grid.codes[0, 1] == TOKEN_CODES["RED_SOLOON"]
+    assert grid.codes[2, 2] == 0
+    objects = list(pattern.iter_objects())
+    assert objects[:2] == [PolyanetObject(Position(0, 0)), SoloonObject(Position(0, 1), "red")]
+    assert len(objects) == grid.count()
+
+def test_pattern_rejects_bad_input():
+    pattern = Pattern(3, 3)
+    with pytest.raises(ValueError):
+        pattern.add(fill_mask((3, 3)), "GREEN_SOLOON")
+    with pytest.raises(ValueError):
+        pattern.add(fill_mask((2, 3)))
+
+def test_generate_cross_scales_without_leaving_the_grid():
+    objects = PatternGenerator.generate_cross(5)
+    assert all(0 <= obj.position.row < 5 and 0 <= obj.position.column < 5 for obj in objects)
+    assert len(PatternGenerator.generate_cross(1001)) == 13
+
+LOGO = {"goal": [["SPACE", "POLYANET"], ["RED_SOLOON", "LEFT_COMETH"]]}
+LOGO_OBJECTS = [
+    PolyanetObject(Position(0, 1)),
+    SoloonObject(Position(1, 0), "red"),
+    ComethObject(Position(1, 1), "left"),
+]
+
+@pytest.fixture(autouse=True)
+def clear_logo_cache():
+    PatternGenerator.clear_logo_cache()
+
+def test_generate_logo_parses_color_and_direction_tokens():
+    """COLOR_SOLOON and DIRECTION_COMETH tokens are parsed like parse_goal_map does."""
+    assert PatternGenerator.generate_logo(LOGO) == LOGO_OBJECTS
+    assert PatternGenerator.generate_logo(Grid.from_goal_map(LOGO)) == LOGO_OBJECTS
+
+def test_generate_logo_is_memoized_per_candidate():
+    api = Mock(candidate_id="dummy")
+    api.get_goal_map.return_value = LOGO
+    assert PatternGenerator.generate_logo(api) == LOGO_OBJECTS
+    assert PatternGenerator.generate_logo(api) == LOGO_OBJECTS
+    assert api.get_goal_map.call_count == 1
+
+    PatternGenerator.generate_logo(api, refresh=True)
+    assert api.get_goal_map.call_count == 2
+    other = Mock(candidate_id="other")
+    other.get_goal_map.return_value = {"goal": [["POLYANET"]]}
+    assert len(PatternGenerator.generate_logo(other)) == 1
+
+def test_generate_logo_creates_a_client_only_on_a_miss(monkeypatch):
+    monkeypatch.setenv("CANDIDATE_ID", "dummy")
+    client = MagicMock()
+    client.__enter__.return_value.get_goal_map.return_value = LOGO
+    factory = Mock(return_value=client)
+    monkeypatch.setattr("megaverse.patterns.MegaverseAPI", factory)
+
+    assert PatternGenerator.generate_logo() == LOGO_OBJECTS
+    assert PatternGenerator.generate_logo() == LOGO_OBJECTS
+    assert factory.call_count == 1
+    assert client.__exit__.called
+
+def test_generate_logo_from_saved_file(tmp_path):
+    path = tmp_path / "goal.json"
+    path.write_text(json.dumps({"classified": LOGO["goal"]}))
+    assert PatternGenerator.generate_logo(str(path)) == LOGO_OBJECTS
+
+    snapshot_path = tmp_path / "goal.mvs"
+    snapshot.dump(snapshot.from_json(LOGO), str(snapshot_path))
+    assert PatternGenerator.generate_logo(str(snapshot_path)) == LOGO_OBJECTS
@@ -0,0 +1,80 @@
+"""
+Test suite for the batch placement planner.
+"""
+
+import threading
+import time
+import pytest
+from unittest.mock import Mock
+from challenge2 import create_objects_from_goal, execute_batches
+from megaverse.journal import Journal
+from megaverse.models import Position, PolyanetObject, SoloonObject, ComethObject
+from megaverse.planner import plan_batches, plan_operations
+from megaverse.reconcile import CREATE, DELETE, Operation
+
+def test_deletes_come_first_and_endpoints_are_grouped():
+    operations = [
+        Operation(CREATE, SoloonObject(Position(0, 0), "red")),
+        Operation(CREATE, PolyanetObject(Position(0, 1))),
+        Operation(CREATE, SoloonObject(Position(0, 2), "blue")),
+        Operation(DELETE, ComethObject(Position(0, 0), "up")),
+    ]
+    planned = plan_operations(operations)
+    assert [(op.action, op.object.type, op.position.column) for op in planned] == [
+        (DELETE, "COMETH", 0),
+        (CREATE, "POLYANET", 1),
+        (CREATE, "SOLOON", 0),
+        (CREATE, "SOLOON", 2),
+    ]
+
+def test_duplicate_cells_are_collapsed():
+    """Repeated operations on a cell are sent once; the last create wins."""
+    operations = [
+        Operation(CREATE, SoloonObject(Position(1, 1), "red")),
+        Operation(DELETE, PolyanetObject(Position(2, 2))),
+        Operation(CREATE, SoloonObject(Position(1, 1), "white")),
+        Operation(DELETE, PolyanetObject(Position(2, 2))),
+    ]
+    planned = plan_operations(operations)
+    assert [op.action for op in planned] == [DELETE, CREATE]
+    assert planned[1].object.color.value == "white"
+
+def test_batches_are_sized_for_concurrency():
+    operations = [Operation(CREATE, PolyanetObject(Position(0, c))) for c in range(7)]
+    operations.append(Operation(CREATE, ComethObject(Position(1, 0), "left")))
+    batches = plan_batches(operations, batch_size=3)
+    assert [(b.endpoint, len(b)) for b in batches] == [("polyanets", 3), ("polyanets", 3), ("polyanets", 1), ("comeths", 1)]
+
+    with pytest.raises(ValueError):
+        plan_batches(operations, batch_size=0)
+
+def test_build_runs_through_the_planner(tmp_path):
+    """create_objects_from_goal issues one call per endpoint group, in order."""
+    api = Mock()
+    api.get_goal_map.return_value = {"goal": [["RED_SOLOON", "POLYANET"], ["POLYANET", "RED_SOLOON"]]}
+    with Journal(str(tmp_path / "journal.log")) as journal:
+        create_objects_from_goal(api, journal=journal)
+    calls = [args[0].type for name, args, _ in api.method_calls if name == "create_astral_object"]
+    assert calls == ["POLYANET", "POLYANET", "SOLOON", "SOLOON"]
+
+def test_batches_run_one_at_a_time():
+    """A batch's calls are in flight together; the next batch waits for all of them."""
+    lock = threading.Lock()
+    active, peak, finished = [0], [0], []
+
+    def create(obj):
+        with lock:
+            assert len(finished) >= obj.position.column // 3 * 3
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+            finished.append(obj.position.column)
+
+    api = Mock()
+    api.create_astral_object.side_effect = create
+    batches = plan_batches((Operation(CREATE, PolyanetObject(Position(0, c))) for c in range(7)), batch_size=3)
+    execute_batches(api, batches, workers=3)
+    assert sorted(finished) == list(range(7))
+    assert peak[0] == 3
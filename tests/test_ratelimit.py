@@ -0,0 +1,93 @@
+"""
+Test suite for the adaptive token-bucket rate limiter.
+Uses a fake clock so no test actually sleeps.
+"""
+
+import pytest
+from unittest.mock import Mock
+from megaverse.api import MegaverseAPI
+from megaverse.models import Position
+from megaverse.ratelimit import TokenBucket, parse_retry_after
+
+class FakeClock:
+    """Monotonic clock that only advances when the limiter sleeps."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def make_bucket(clock, **kwargs):
+    return TokenBucket(clock=clock, sleep=clock.sleep, **kwargs)
+
+def test_burst_then_steady_rate(clock):
+    """The bucket allows a burst of `capacity` calls, then paces at `rate`."""
+    bucket = make_bucket(clock, rate=2.0, capacity=2)
+    for _ in range(4):
+        bucket.acquire()
+    assert clock.sleeps == [pytest.approx(0.5), pytest.approx(0.5)]
+    assert clock.now == pytest.approx(1.0)
+
+def test_rate_increases_on_sustained_success(clock):
+    """Every `success_threshold` successes raise the rate by one step."""
+    bucket = make_bucket(clock, rate=2.0, max_rate=3.0, increase_step=0.5, success_threshold=3)
+    for _ in range(3):
+        bucket.on_success()
+    assert bucket.rate == 2.5
+    for _ in range(9):
+        bucket.on_success()
+    assert bucket.rate == 3.0
+
+def test_throttle_backs_off_and_honors_retry_after(clock):
+    """A 429 halves the rate, drains the bucket and pauses until Retry-After."""
+    bucket = make_bucket(clock, rate=4.0, capacity=5, min_rate=1.0)
+    bucket.on_throttle(retry_after=3.0)
+    assert bucket.rate == 2.0
+
+    bucket.acquire()
+    assert clock.now >= 3.0
+
+    bucket.on_throttle()
+    bucket.on_throttle()
+    assert bucket.rate == 1.0
+
+def test_invalid_configuration():
+    with pytest.raises(ValueError):
+        TokenBucket(rate=50.0, max_rate=10.0)
+    with pytest.raises(ValueError):
+        TokenBucket(capacity=0)
+
+def test_parse_retry_after():
+    assert parse_retry_after("2") == 2.0
+    assert parse_retry_after("1.5") == 1.5
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("not a date") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+def test_api_reports_responses_to_limiter():
+    """MegaverseAPI feeds successes and 429s (with Retry-After) to its limiter."""
+    limiter = Mock()
+    session = Mock()
+    session.request.return_value = Mock(status_code=200)
+    api = MegaverseAPI(candidate_id="dummy", session=session, rate_limiter=limiter)
+
+    api.create_polyanet(Position(0, 0))
+    limiter.acquire.assert_called_once()
+    limiter.on_success.assert_called_once()
+
+    throttled = Mock(status_code=429, headers={"Retry-After": "4"})
+    throttled.raise_for_status.side_effect = Exception("429 Client Error")
+    session.request.return_value = throttled
+    with pytest.raises(Exception):
+        api.create_polyanet(Position(0, 0))
+    limiter.on_throttle.assert_called_once_with(4.0)
@@ -0,0 +1,111 @@
+"""
+Test suite for the goal/current map reconciler.
+Tests current-map parsing, plan generation and reconciled builds.
+"""
+
+import pytest
+from unittest.mock import Mock
+from challenge2 import create_objects_from_goal
+from megaverse.grid import Grid
+from megaverse.models import Position, PolyanetObject, SoloonObject, ComethObject
+from megaverse.reconcile import (
+    CREATE,
+    DELETE,
+    Operation,
+    apply_operation,
+    parse_current_map,
+    plan_grid_reconciliation,
+    plan_reconciliation,
+)
+
+def test_parse_current_map():
+    current_map = {
+        "map": {
+            "content": [
+                [None, {"type": 0}, None],
+                [{"type": 1, "color": "red"}, None, {"type": 2, "direction": "up"}],
+            ]
+        }
+    }
+    assert parse_current_map(current_map) == [
+        PolyanetObject(Position(0, 1)),
+        SoloonObject(Position(1, 0), "red"),
+        ComethObject(Position(1, 2), "up"),
+    ]
+
+def test_plan_is_empty_when_map_matches_goal():
+    goal = [PolyanetObject(Position(0, 1)), SoloonObject(Position(1, 0), "red")]
+    current = [SoloonObject(Position(1, 0), "red"), PolyanetObject(Position(0, 1))]
+    assert plan_reconciliation(goal, current) == []
+
+def test_plan_creates_deletes_and_replaces():
+    """Missing cells are created, extra ones deleted, wrong ones replaced."""
+    goal = [
+        PolyanetObject(Position(0, 0)),
+        SoloonObject(Position(0, 1), "red"),
+        ComethObject(Position(0, 2), "up"),
+    ]
+    current = [
+        PolyanetObject(Position(5, 5)),
+        SoloonObject(Position(0, 1), "blue"),
+        ComethObject(Position(0, 2), "up"),
+    ]
+    plan = plan_reconciliation(goal, current)
+
+    assert plan == [
+        Operation(DELETE, SoloonObject(Position(0, 1), "blue")),
+        Operation(DELETE, PolyanetObject(Position(5, 5))),
+        Operation(CREATE, PolyanetObject(Position(0, 0))),
+        Operation(CREATE, SoloonObject(Position(0, 1), "red")),
+    ]
+
+def test_plan_deduplicates_objects():
+    """Duplicate goal entries collapse into a single create."""
+    goal = [PolyanetObject(Position(1, 1)), PolyanetObject(Position(1, 1))]
+    assert plan_reconciliation(goal, []) == [Operation(CREATE, PolyanetObject(Position(1, 1)))]
+
+def test_apply_operation_dispatches_by_action():
+    api = Mock()
+    apply_operation(api, Operation(CREATE, ComethObject(Position(1, 2), "left")))
+    apply_operation(api, Operation(DELETE, SoloonObject(Position(3, 4), "white")))
+
+    api.create_astral_object.assert_called_once_with(ComethObject(Position(1, 2), "left"))
+    api.delete_astral_object.assert_called_once_with(SoloonObject(Position(3, 4), "white"))
+    with pytest.raises(ValueError):
+        apply_operation(api, Operation("move", ComethObject(Position(1, 2), "left")))
+
+def test_create_objects_from_goal_reconciles(monkeypatch, tmp_path):
+    """With reconcile=True only the differing cells are touched."""
+    monkeypatch.chdir(tmp_path)
+    mock_api = Mock()
+    mock_api.get_goal_map.return_value = {
+        "goal": [
+            ["POLYANET", "RED_SOLOON"],
+            ["SPACE", "UP_COMETH"],
+        ]
+    }
+    mock_api.get_current_map.return_value = {
+        "map": {
+            "content": [
+                [{"type": 0}, {"type": 1, "color": "blue"}],
+                [{"type": 0}, {"type": 2, "direction": "up"}],
+            ]
+        }
+    }
+
+    create_objects_from_goal(mock_api, reconcile=True)
+
+    deleted = [call.args[0] for call in mock_api.delete_astral_object.call_args_list]
+    created = [call.args[0] for call in mock_api.create_astral_object.call_args_list]
+    assert deleted == [PolyanetObject(Position(1, 0)), SoloonObject(Position(0, 1), "blue")]
+    assert created == [SoloonObject(Position(0, 1), "red")]
+
+def test_grid_plan_matches_dict_plan():
+    """The vectorized plan issues the same operations as the dict-based one."""
+    goal = Grid.from_tokens([["POLYANET", "RED_SOLOON", "UP_COMETH"], ["SPACE", "SPACE", "SPACE"]])
+    current = Grid.from_tokens([["SPACE", "BLUE_SOLOON", "UP_COMETH"], ["SPACE", "SPACE", "POLYANET"]])
+
+    plan = plan_grid_reconciliation(goal, current)
+
+    assert plan == plan_reconciliation(goal.to_objects(), current.to_objects())
+    assert [op.action for op in plan] == [DELETE, DELETE, CREATE, CREATE]
@@ -0,0 +1,89 @@
+"""
+Test suite for the client retry policy.
+Verifies which failures are retried and the backoff schedule.
+"""
+
+import pytest
+import requests
+from unittest.mock import Mock
+from megaverse.api import MegaverseAPI
+from megaverse.models import Position
+from megaverse.ratelimit import TokenBucket
+from megaverse.retry import RetryPolicy, status_code_of, is_rate_limited
+
+def http_error(status):
+    response = requests.Response()
+    response.status_code = status
+    return requests.HTTPError(f"{status} Error", response=response)
+
+def make_policy(**kwargs):
+    sleeps = []
+    policy = RetryPolicy(rng=lambda: 1.0, sleep=sleeps.append, **kwargs)
+    return policy, sleeps
+
+def test_status_helpers():
+    assert status_code_of(http_error(503)) == 503
+    assert status_code_of(Exception("429")) is None
+    assert is_rate_limited(http_error(429))
+    assert not is_rate_limited(Exception("429 Client Error"))
+
+@pytest.mark.parametrize("error, idempotent, expected", [
+    (http_error(429), False, True),
+    (http_error(503), True, True),
+    (http_error(503), False, False),
+    (http_error(404), True, False),
+    (requests.exceptions.ConnectTimeout(), False, True),
+    (requests.exceptions.ConnectionError(), True, True),
+    (requests.exceptions.ConnectionError(), False, False),
+    (requests.exceptions.ReadTimeout(), True, True),
+    (ValueError("bad payload"), True, False),
+])
+def test_is_retryable(error, idempotent, expected):
+    policy, _ = make_policy()
+    assert policy.is_retryable(error, idempotent) is expected
+
+def test_backoff_is_capped_exponential():
+    policy, _ = make_policy(base_delay=0.5, max_delay=3.0)
+    assert [policy.backoff(n) for n in range(1, 6)] == [0.5, 1.0, 2.0, 3.0, 3.0]
+
+def test_call_retries_until_success():
+    policy, sleeps = make_policy(base_delay=1.0)
+    func = Mock(side_effect=[http_error(502), http_error(429), "ok"])
+    assert policy.call(func) == "ok"
+    assert func.call_count == 3
+    assert sleeps == [1.0, 2.0]
+
+def test_call_gives_up_after_max_attempts():
+    policy, sleeps = make_policy(max_attempts=3)
+    func = Mock(side_effect=http_error(500))
+    with pytest.raises(requests.HTTPError):
+        policy.call(func)
+    assert func.call_count == 3
+    assert len(sleeps) == 2
+
+def test_non_retryable_error_is_raised_immediately():
+    policy, sleeps = make_policy()
+    func = Mock(side_effect=http_error(400))
+    with pytest.raises(requests.HTTPError):
+        policy.call(func)
+    assert func.call_count == 1
+    assert sleeps == []
+
+def test_api_retries_transient_failures():
+    """Create and delete calls both go through the client's retry policy."""
+    failing = Mock(status_code=503, headers={})
+    failing.raise_for_status.side_effect = http_error(503)
+    ok = Mock(status_code=200)
+    session = Mock()
+    session.request.side_effect = [failing, ok, failing, ok]
+    policy, _ = make_policy(base_delay=0.0)
+    api = MegaverseAPI(
+        candidate_id="dummy",
+        session=session,
+        rate_limiter=TokenBucket(rate=100, capacity=100, max_rate=100),
+        retry_policy=policy,
+    )
+
+    api.create_soloon(Position(0, 0), "red")
+    api.delete_soloon(Position(0, 0))
+    assert session.request.call_count == 4
@@ -0,0 +1,104 @@
+"""
+Test suite for the binary snapshot format.
+Tests lossless JSON round trips, encodings, checksums and memory-mapped loading.
+"""
+
+import json
+import numpy as np
+import pytest
+from megaverse import snapshot
+from megaverse.cache import GoalMapCache
+from megaverse.grid import Grid, INVALID, TOKEN_CODES
+
+GOAL_MAP = {
+    "goal": [
+        ["SPACE", "POLYANET", "BLUE_SOLOON"],
+        ["RED_SOLOON", "UP_COMETH", None],
+        ["POLYANET", "INVALID_OBJECT", "SPACE"],
+    ]
+}
+
+CURRENT_MAP = {
+    "map": {
+        "_id": "abc",
+        "candidateId": "cand",
+        "phase": 2,
+        "content": [
+            [None, {"type": 0}],
+            [{"type": 1, "color": "purple"}, {"type": 2, "direction": "down"}],
+        ],
+    }
+}
+
+@pytest.mark.parametrize("document", [
+    GOAL_MAP,
+    CURRENT_MAP,
+    {"classified": [["POLYANET"]], "extra": 1},
+    {"goal": []},
+    {"goal": [[]]},
+    {"goal": [[], [], []]},
+    {"map": {"content": [[]]}},
+])
+@pytest.mark.parametrize("encoding", ["raw", "rle"])
+def test_json_round_trip_is_lossless(document, encoding):
+    data = snapshot.encode(snapshot.from_json(document), encoding)
+    assert snapshot.decode(data).to_json() == document
+
+def test_empty_rows_survive_save_and_load(tmp_path):
+    path = str(tmp_path / "empty.mvs")
+    snapshot.dump(snapshot.from_json({"goal": [[], []]}), path)
+    loaded = snapshot.load(path)
+    assert loaded.shape == (2, 0)
+    assert loaded.to_json() == {"goal": [[], []]}
+
+def test_to_grid_matches_json_parsing():
+    assert snapshot.from_json(GOAL_MAP).to_grid() == Grid.from_goal_map(GOAL_MAP)
+    assert snapshot.from_json(CURRENT_MAP).to_grid() == Grid.from_current_map(CURRENT_MAP)
+
+def test_from_grid_keeps_codes():
+    grid = Grid.from_goal_map(GOAL_MAP)
+    restored = snapshot.decode(snapshot.encode(snapshot.from_grid(grid))).to_grid()
+    assert restored == grid
+    assert restored.codes[2, 1] == INVALID
+
+def test_auto_encoding_compresses_sparse_maps():
+    codes = np.zeros((300, 300), dtype=np.uint8)
+    codes[150, :] = TOKEN_CODES["POLYANET"]
+    document = {"goal": Grid(codes).to_tokens()}
+    data = snapshot.encode(snapshot.from_json(document))
+    assert len(data) < 1000 < len(json.dumps(document))
+    assert snapshot.decode(data).to_json() == document
+
+def test_long_runs_are_split(monkeypatch):
+    monkeypatch.setattr(snapshot, "MAX_RUN", 4)
+    cells = np.zeros((3, 5), dtype=np.uint8)
+    cells[1, 2] = 1
+    data = snapshot.encode(snapshot.Snapshot(snapshot.GOAL, cells, ["SPACE", "POLYANET"], {}), "rle")
+    lengths, values = snapshot.rle_runs(snapshot.read_layout(data).payload)
+    assert lengths.tolist() == [4, 3, 1, 4, 3]
+    assert values.tolist() == [0, 0, 1, 0, 0]
+    assert (snapshot.decode(data).cells == cells).all()
+
+def test_corruption_is_detected():
+    data = bytearray(snapshot.encode(snapshot.from_json(GOAL_MAP), "raw"))
+    data[-1] ^= 0xFF
+    with pytest.raises(ValueError, match="checksum"):
+        snapshot.decode(bytes(data))
+    with pytest.raises(ValueError, match="Truncated"):
+        snapshot.decode(bytes(data[:-2]))
+    with pytest.raises(ValueError, match="Not a Megaverse snapshot"):
+        snapshot.decode(b"X" * 64)
+
+def test_load_memory_maps_raw_cells(tmp_path):
+    path = str(tmp_path / "goal.mvs")
+    snapshot.dump(snapshot.from_json(GOAL_MAP), path, "raw")
+    loaded = snapshot.load(path)
+    assert not loaded.cells.flags.owndata
+    assert not loaded.cells.flags.writeable
+    assert loaded.to_json() == GOAL_MAP
+
+def test_goal_cache_writes_and_reads_binary_snapshots(tmp_path):
+    cache = GoalMapCache(directory=str(tmp_path), binary=True)
+    entry = cache.store("cand", GOAL_MAP)
+    assert entry.path.endswith(snapshot.SUFFIX)
+    assert cache.load("cand").goal_map == GOAL_MAP
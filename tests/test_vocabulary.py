@@ -0,0 +1,87 @@
+"""
+Test suite for the cell-vocabulary registry.
+Tests the default tables and a new type reaching the parser, grid, planner,
+API client and fake server through one registration.
+"""
+
+import copy
+from dataclasses import dataclass
+from typing import ClassVar
+from unittest.mock import Mock
+import pytest
+from challenge2_cleanup import delete_object
+from challenge2_goal_parser import parse_goal_map
+from megaverse.api import MegaverseAPI
+from megaverse.fake_server import FakeMegaverseServer
+from megaverse.grid import INVALID, TOKENS, Grid
+from megaverse.models import AstralObject, ComethObject, Position, SoloonObject, object_from_dict
+from megaverse.planner import plan_batches
+from megaverse.ratelimit import TokenBucket
+from megaverse.reconcile import CREATE, Operation, parse_current_map
+from megaverse.vocabulary import VOCABULARY, Vocabulary, register
+
+@dataclass(frozen=True, slots=True)
+class AsteroidObject(AstralObject):
+    size: str
+    type: ClassVar[str] = "ASTEROID"
+
+    def to_api_payload(self, candidate_id: str) -> dict:
+        payload = AstralObject.to_api_payload(self, candidate_id)
+        payload["size"] = self.size
+        return payload
+
+    def to_dict(self) -> dict:
+        obj = AstralObject.to_dict(self)
+        obj["size"] = self.size
+        return obj
+
+@pytest.fixture
+def asteroids():
+    """Register ASTEROID in the default vocabulary, restoring it afterwards."""
+    saved = {name: copy.copy(table) for name, table in vars(VOCABULARY).items()}
+    yield register(AsteroidObject, "asteroids", map_type=3, attribute="size", values=("small", "large"))
+    for name, table in saved.items():
+        current = getattr(VOCABULARY, name)
+        current.clear()
+        current.extend(table) if isinstance(current, list) else current.update(table)
+
+def test_default_codes():
+    assert TOKENS[:3] == ["SPACE", "POLYANET", "BLUE_SOLOON"]
+    assert len(TOKENS) == 10
+    assert VOCABULARY.code_for_object(ComethObject(Position(0, 0), "left")) == TOKENS.index("LEFT_COMETH")
+    assert VOCABULARY.code_for_map_cell({"type": 1, "color": "white"}) == TOKENS.index("WHITE_SOLOON")
+    assert VOCABULARY.code_for_map_cell({"type": 1, "color": "green"}) == INVALID
+    assert VOCABULARY.code_for_map_cell(None) == 0
+
+def test_register_rejects_conflicts():
+    vocabulary = Vocabulary()
+    vocabulary.register(SoloonObject, "soloons", map_type=1, attribute="color", values=("red",))
+    with pytest.raises(ValueError):
+        vocabulary.register(SoloonObject, "soloons", map_type=1, attribute="color", values=("red",))
+    with pytest.raises(ValueError):
+        vocabulary.register(AsteroidObject, "asteroids", map_type=3, attribute="size")
+
+def test_registered_type_is_available_everywhere(asteroids):
+    assert [cell_type.token for cell_type in asteroids] == ["SMALL_ASTEROID", "LARGE_ASTEROID"]
+    goal = {"goal": [["SPACE", "LARGE_ASTEROID"], ["POLYANET", "MEDIUM_ASTEROID"]]}
+    large = AsteroidObject(Position(0, 1), "large")
+
+    assert parse_goal_map(goal)[0] == large.to_dict()
+    assert object_from_dict(large.to_dict()) == large
+    grid = Grid.from_goal_map(goal)
+    assert grid.to_objects()[0] == large
+    assert grid.validate().tolist() == [[1, 1]]
+    assert [batch.endpoint for batch in plan_batches([Operation(CREATE, large)])] == ["asteroids"]
+
+    limiter = TokenBucket(rate=1000, capacity=1000, max_rate=1000)
+    with FakeMegaverseServer(goal=[["SPACE", "SPACE"], ["SPACE", "SPACE"]]) as server:
+        with MegaverseAPI("cand", base_url=server.base_url, rate_limiter=limiter) as api:
+            api.create_astral_object(large)
+            current = api.get_current_map()
+            delete_object(api, large.to_dict())
+            assert server.cells("cand") == {}
+    assert current["map"]["content"][0][1] == {"type": 3, "size": "large"}
+    assert parse_current_map(current) == [large]
+    assert Grid.from_current_map(current).to_objects() == [large]
+    with pytest.raises(ValueError):
+        delete_object(Mock(), {"type": "COMET", "row": 0, "column": 0})
@@ -0,0 +1,64 @@
+"""
+Test suite for windowed snapshot access.
+Tests row ranges and tiles over raw and run-length snapshots, and sharding
+regions across processes.
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import pytest
+from benchmarks.micro import synthetic_codes
+from megaverse import snapshot
+from megaverse.grid import Grid
+from megaverse.window import Region, WindowedGrid, row_bands, shard, tiles
+
+@pytest.fixture
+def grid():
+    return Grid(synthetic_codes(37, density=0.2))
+
+@pytest.fixture(params=["raw", "rle"])
+def path(request, tmp_path, grid):
+    path = str(tmp_path / f"goal-{request.param}.mvs")
+    snapshot.dump(snapshot.from_grid(grid), path, request.param)
+    return path
+
+def test_windows_match_the_full_grid(path, grid):
+    with WindowedGrid(path, verify=True) as reader:
+        assert reader.shape == grid.shape
+        assert reader.rows(5, 9).codes.tolist() == grid.codes[5:9].tolist()
+        assert reader.rows(0, 0).shape == (0, 37)
+        assert reader.window(Region(3, 10, 20, 11)).codes.tolist() == grid.codes[3:20, 10:11].tolist()
+        for region, window in reader.iter_tiles(8, 10):
+            assert window.codes.tolist() == grid.codes[region.top:region.bottom, region.left:region.right].tolist()
+
+def test_iter_objects_keeps_map_positions(path, grid):
+    with WindowedGrid(path) as reader:
+        assert list(reader.iter_objects(rows=5)) == grid.to_objects()
+        region = Region(10, 4, 12, 30)
+        expected = [obj for obj in grid.to_objects() if 10 <= obj.position.row < 12 and 4 <= obj.position.column < 30]
+        assert list(reader.iter_objects(region)) == expected
+
+def test_regions_outside_the_map_are_rejected(path):
+    with WindowedGrid(path) as reader:
+        with pytest.raises(ValueError):
+            reader.window(Region(0, 0, 38, 1))
+
+def test_partitions_cover_the_map_once():
+    shape = (25, 17)
+    for regions in (row_bands(shape, 7), tiles(shape, 7, 5)):
+        assert sum(region.cells for region in regions) == 25 * 17
+    assert tiles(shape, 7, 5)[-1] == Region(21, 15, 25, 17)
+    shards = [shard(tiles(shape, 7, 5), 3, index) for index in range(3)]
+    assert sorted(sum(shards, []), key=lambda r: r.origin) == tiles(shape, 7, 5)
+    with pytest.raises(ValueError):
+        shard([], 3, 3)
+
+def _count_objects(path, regions):
+    with WindowedGrid(path) as reader:
+        return sum(1 for region in regions for _ in reader.iter_objects(region))
+
+def test_processes_share_a_snapshot_by_path(path, grid):
+    """Workers given only the path and their regions together see every object."""
+    regions = tiles(grid.shape, 10, 10)
+    with ProcessPoolExecutor(max_workers=2) as pool:
+        counts = pool.map(_count_objects, [path, path], [shard(regions, 2, 0), shard(regions, 2, 1)])
+        assert sum(counts) == grid.count()